@@ -0,0 +1,133 @@
+"""
+Per-row cost of serializing product responses through FastAPI's ``response_model``
+path versus ``src.utils.json_response``.
+
+Both variants are routes of the same in-process app driven through ASGI, so
+the difference is the serialization alone. Rows are built in memory; no
+database is needed. Run from ``backend/``:
+
+    PYTHONPATH=. python benchmarks/serialization.py --rows 100 --image-bytes 20000
+"""
+import argparse
+import asyncio
+import base64
+import os
+import time
+from datetime import datetime, timezone
+
+# The models module builds an engine at import; nothing connects to it
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/benchmark")
+
+from fastapi import FastAPI  # noqa: E402
+from src.core.db.models import ProductTable  # noqa: E402
+from src.schemas import ProductInDB, ProductPartial  # noqa: E402
+from src.utils import json_response  # noqa: E402
+
+
+def make_rows(count: int, image_bytes: int) -> list[ProductTable]:
+    image_url = "data:image/png;base64," + base64.b64encode(os.urandom(image_bytes)).decode("ascii")
+    now = datetime.now(timezone.utc)
+    return [
+        ProductTable(
+            id=index,
+            name=f"Product {index}",
+            description="A product description of typical length for the catalog. " * 3,
+            quantity=index % 100,
+            price=index * 1.25,
+            is_active=index % 3 != 0,
+            image_url=image_url,
+            created_at=now,
+            updated_at=now,
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def make_app(orm_rows: list[ProductTable], partial_rows: list[ProductPartial]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/orm/response_model", response_model=list[ProductInDB])
+    async def orm_response_model():
+        return orm_rows
+
+    @app.get("/orm/json_response", response_model=list[ProductInDB])
+    async def orm_json_response():
+        return json_response(list[ProductInDB], orm_rows)
+
+    @app.get("/partial/response_model", response_model=list[ProductPartial], response_model_exclude_unset=True)
+    async def partial_response_model():
+        return partial_rows
+
+    @app.get("/partial/json_response", response_model=list[ProductPartial], response_model_exclude_unset=True)
+    async def partial_json_response():
+        return json_response(list[ProductPartial], partial_rows, exclude_unset=True)
+
+    return app
+
+
+async def request(app: FastAPI, path: str) -> bytes:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 1),
+        "server": ("127.0.0.1", 80),
+    }
+    chunks = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(chunks)
+
+
+async def measure(app: FastAPI, path: str, iterations: int) -> tuple[float, int]:
+    body = await request(app, path)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await request(app, path)
+    return (time.perf_counter() - started) / iterations, len(body)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100, help="rows per response")
+    parser.add_argument("--image-bytes", type=int, default=20000, help="decoded size of each image_url")
+    parser.add_argument("--iterations", type=int, default=200, help="requests per variant")
+    args = parser.parse_args()
+
+    orm_rows = make_rows(args.rows, args.image_bytes)
+    # What the product list routes serialize: validated models without image_url
+    partial_rows = [
+        ProductPartial(**{name: getattr(row, name) for name in ProductPartial.model_fields if name != "image_url"})
+        for row in orm_rows
+    ]
+    app = make_app(orm_rows, partial_rows)
+
+    print(f"{args.rows} rows, image_url {len(orm_rows[0].image_url)} chars, {args.iterations} iterations")
+    for source in ("orm", "partial"):
+        results = {}
+        for variant in ("response_model", "json_response"):
+            path = f"/{source}/{variant}"
+            results[variant], size = await measure(app, path, args.iterations)
+            print(
+                f"{path:<26} {results[variant] * 1000:9.3f} ms/response "
+                f"{results[variant] / args.rows * 1e6:9.2f} us/row {size:>12} bytes"
+            )
+        print(f"{'':<26} {results['response_model'] / results['json_response']:9.2f}x faster")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
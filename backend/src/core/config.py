@@ -15,6 +15,62 @@ class BackendConfig:
     ACCESS_TOKEN_EXPIRE_MINUTES = 60  # 1 week
     REFRESH_TOKEN_EXPIRE_MINUTES = 1440  # 1 day
 
+    MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 1000))
+    BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 50000))
+    BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", 1000))  # rows per statement and commit
+    EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 1000))  # rows fetched and encoded per step
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", 5000))  # rows per COPY and commit
+    IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", 1000))  # row errors listed in the response
+
+    PRODUCT_CACHE_SIZE = int(os.getenv("PRODUCT_CACHE_SIZE", 10000))  # 0 disables the product cache
+    PRODUCT_CACHE_MAX_BYTES = int(os.getenv("PRODUCT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+    PRODUCT_CACHE_TTL = float(os.getenv("PRODUCT_CACHE_TTL", 60)) or None  # seconds, None: no expiry
+    # Shared tier behind the local LRU: "" for none, "memory" for the in-process stand-in
+    PRODUCT_CACHE_SHARED_BACKEND = os.getenv("PRODUCT_CACHE_SHARED_BACKEND", "")
+    PRODUCT_CACHE_SHARED_TTL = float(os.getenv("PRODUCT_CACHE_SHARED_TTL", 300)) or None
+
+    PRICE_ANALYTICS_BUCKETS = int(os.getenv("PRICE_ANALYTICS_BUCKETS", 20))  # default histogram buckets
+    # Serve /products/analytics/prices from materialized views refreshed after writes
+    PRICE_ANALYTICS_MATERIALIZED = os.getenv("PRICE_ANALYTICS_MATERIALIZED", "TRUE") == "TRUE"
+    PRICE_ANALYTICS_REFRESH_INTERVAL = float(os.getenv("PRICE_ANALYTICS_REFRESH_INTERVAL", 30))  # min seconds
+
+    ML_TRAIN_DATA = os.getenv("ML_TRAIN_DATA", "./src/ml/train_data/mock_products.csv")
+    ML_ARTIFACTS_DIR = os.getenv("ML_ARTIFACTS_DIR", "./src/ml/artifacts")
+    # "compiled" serves the NumPy export of the price model without sklearn/xgboost
+    ML_PRICE_SERVING_FORMAT = os.getenv("ML_PRICE_SERVING_FORMAT", "native")
+    ML_CV_FOLDS = int(os.getenv("ML_CV_FOLDS", 5))
+    ML_TRAIN_TIME_BUDGET = float(os.getenv("ML_TRAIN_TIME_BUDGET", 0)) or None  # soft cutoff in seconds, None: no limit
+    ML_TRAIN_JOBS = int(os.getenv("ML_TRAIN_JOBS", 0)) or None  # None: all cores
+    ML_MAX_BATCH_SIZE = int(os.getenv("ML_MAX_BATCH_SIZE", 10000))
+    ML_RETRAIN_CHUNK_SIZE = int(os.getenv("ML_RETRAIN_CHUNK_SIZE", 1000))
+    ML_INCREMENTAL_BOOST_ROUNDS = int(os.getenv("ML_INCREMENTAL_BOOST_ROUNDS", 10))
+    ML_INCREMENTAL_TREES = int(os.getenv("ML_INCREMENTAL_TREES", 10))
+    ML_RETRAIN_HOLDOUT_EVERY = int(os.getenv("ML_RETRAIN_HOLDOUT_EVERY", 5))  # every Nth new product scores the update
+
+    ML_PREDICTION_CACHE_SIZE = int(os.getenv("ML_PREDICTION_CACHE_SIZE", 10000))
+    ML_PREDICTION_CACHE_TTL = float(os.getenv("ML_PREDICTION_CACHE_TTL", 3600)) or None  # seconds, None: no expiry
+    # Off keeps pandas/scikit-learn out of workers serving compiled price models only
+    ML_POTD_ENABLED = os.getenv("ML_POTD_ENABLED", "TRUE") == "TRUE"
+    ML_POTD_REFRESH_HOUR = int(os.getenv("ML_POTD_REFRESH_HOUR", 0))  # UTC hour of the daily snapshot refresh
+    ML_POTD_RESCORE_INTERVAL = float(os.getenv("ML_POTD_RESCORE_INTERVAL", 60))  # seconds between dirty rescores
+    ML_POTD_THRESHOLD_TOLERANCE = float(os.getenv("ML_POTD_THRESHOLD_TOLERANCE", 0.1))  # relative median drift
+    ML_POTD_PAGE_SIZE = int(os.getenv("ML_POTD_PAGE_SIZE", 50))
+    ML_POTD_MAX_PAGE_SIZE = int(os.getenv("ML_POTD_MAX_PAGE_SIZE", 500))
+    ML_POTD_BASELINE_SIZE = int(os.getenv("ML_POTD_BASELINE_SIZE", 100))  # ranked when the model predicts none
+    ML_REGISTRY_KEEP_VERSIONS = int(os.getenv("ML_REGISTRY_KEEP_VERSIONS", 3))
+    ML_PROMOTION_TOLERANCE = float(os.getenv("ML_PROMOTION_TOLERANCE", 0.0))
+
+    ML_EXECUTOR_KIND = os.getenv("ML_EXECUTOR_KIND", "thread")  # thread or process
+    ML_EXECUTOR_WORKERS = int(os.getenv("ML_EXECUTOR_WORKERS", 0)) or None  # None: pool default
+    ML_EXECUTOR_MAX_QUEUE = int(os.getenv("ML_EXECUTOR_MAX_QUEUE", 64))
+    ML_MICROBATCH_MAX_SIZE = int(os.getenv("ML_MICROBATCH_MAX_SIZE", 64))
+    ML_MICROBATCH_WAIT_MS = float(os.getenv("ML_MICROBATCH_WAIT_MS", 2))
+
+    ENGAGEMENT_FLUSH_INTERVAL = float(os.getenv("ENGAGEMENT_FLUSH_INTERVAL", 5))  # seconds
+    ENGAGEMENT_FLUSH_EVENTS = int(os.getenv("ENGAGEMENT_FLUSH_EVENTS", 50000))  # flush early past this many events
+    ENGAGEMENT_MAX_PENDING_EVENTS = int(os.getenv("ENGAGEMENT_MAX_PENDING_EVENTS", 1000000))
+    ENGAGEMENT_MAX_BATCH_SIZE = int(os.getenv("ENGAGEMENT_MAX_BATCH_SIZE", 10000))
+
 
 def get_backend_config() -> BackendConfig:
     """
@@ -37,8 +37,10 @@ async def init_db():
     """
     try:
         async with engine.begin() as conn:
+            await conn.execute(text('DROP TABLE IF EXISTS product_engagement'))
             await conn.execute(text('DROP TABLE "user"'))
-            await conn.execute(text('DROP TABLE product'))
+            # CASCADE drops the price statistics views, recreated at startup
+            await conn.execute(text('DROP TABLE product CASCADE'))
             await conn.run_sync(Base.metadata.create_all)
             logger.info("Database tables created successfully.")
 
@@ -50,6 +52,10 @@ async def init_db():
                 for statement in sql_statements.strip().split(";\n"):
                     if statement.strip():
                         await conn.execute(text(statement))  # <-- FIX: wrap in text()
+                # The mock rows carry explicit ids, so move the sequence past them
+                await conn.execute(text(
+                    "SELECT setval(pg_get_serial_sequence('product', 'id'), COALESCE(MAX(id), 0) + 1, false) FROM product"
+                ))
                 logger.info("Default product data loaded successfully.")
             else:
                 logger.warning("mock_products.sql file not found.")
@@ -1,2 +1,3 @@
 from .user import UserTable  # noqa: F401
 from .product import ProductTable  # noqa: F401
+from .engagement import ProductEngagementTable  # noqa: F401
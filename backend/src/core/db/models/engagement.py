@@ -0,0 +1,17 @@
+from sqlalchemy import TIMESTAMP, BigInteger, Column, Float, ForeignKey, Integer, func
+
+from ..database import Base
+
+
+class ProductEngagementTable(Base):
+    """
+    Running engagement counters per product, maintained by write-behind upserts.
+    """
+    __tablename__ = "product_engagement"
+
+    product_id = Column(Integer, ForeignKey("product.id", ondelete="CASCADE"), primary_key=True)
+    views = Column(BigInteger, nullable=False, server_default="0")
+    purchases = Column(BigInteger, nullable=False, server_default="0")
+    rating_sum = Column(Float, nullable=False, server_default="0")
+    rating_count = Column(BigInteger, nullable=False, server_default="0")
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
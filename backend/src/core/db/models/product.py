@@ -1,10 +1,23 @@
 from .base import TableBase
 
-from sqlalchemy import Boolean, Column, String, Float, Integer, TEXT
+from sqlalchemy import DDL, TIMESTAMP, Boolean, Column, Index, String, Float, Integer, TEXT, event, func
 
 
 class ProductTable(TableBase):
     __tablename__ = "product"
+    __table_args__ = (
+        # Keyset pagination and incremental retraining read in (created_at, id) order;
+        # updated_at is included so page version checks are index-only scans
+        Index("ix_product_created_at_id", "created_at", "id", postgresql_include=["updated_at"]),
+        # Filtered and sorted lists (GET /products/?sort=price&is_active=true&min_price=...):
+        # an equality on is_active plus a price range or keyset is one range scan
+        # already in page order; quantity serves low-stock filters and sorts
+        Index("ix_product_is_active_price_id", "is_active", "price", "id"),
+        Index("ix_product_price_id", "price", "id"),
+        Index("ix_product_quantity_id", "quantity", "id"),
+    )
+    # Fetch updated_at with RETURNING after UPDATEs too, not only INSERTs
+    __mapper_args__ = {"eager_defaults": True}
 
     name = Column(String(50), index=True)
     description = Column(TEXT)
@@ -12,3 +25,22 @@ class ProductTable(TableBase):
     quantity = Column(Integer)
     is_active = Column(Boolean, default=True)
     image_url = Column(TEXT)
+    # Set on insert and on every ORM or Core UPDATE; drives ETag/Last-Modified
+    updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+# Weighted document searched by /products/search. It is a stored generated column
+# added with DDL rather than mapped, so it is never loaded, serialized or exported.
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+)
+
+event.listen(ProductTable.__table__, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+for statement in (
+    f"ALTER TABLE product ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED",
+    "CREATE INDEX ix_product_search_vector ON product USING gin (search_vector)",
+    # Typo-tolerant name matching with the pg_trgm % operator
+    "CREATE INDEX ix_product_name_trgm ON product USING gin (name gin_trgm_ops)",
+):
+    event.listen(ProductTable.__table__, "after_create", DDL(statement))
@@ -0,0 +1,19 @@
+from src.core.config import get_backend_config
+from src.core.db.database import SessionLocal
+from src.repositories import PriceAnalyticsRepository
+from src.services import PriceAnalyticsService
+
+
+config = get_backend_config()
+
+_price_analytics = PriceAnalyticsService(
+    repository=PriceAnalyticsRepository(),
+    session_factory=SessionLocal,
+    buckets=config.PRICE_ANALYTICS_BUCKETS,
+    materialized=config.PRICE_ANALYTICS_MATERIALIZED,
+    refresh_interval=config.PRICE_ANALYTICS_REFRESH_INTERVAL,
+)
+
+
+def get_price_analytics() -> PriceAnalyticsService:
+    return _price_analytics
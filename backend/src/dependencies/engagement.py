@@ -0,0 +1,23 @@
+from src.core.config import get_backend_config
+from src.core.db.database import SessionLocal
+from src.repositories import EngagementRepository
+from src.services import EngagementAggregator
+
+
+config = get_backend_config()
+
+_aggregator = EngagementAggregator(
+    repository=EngagementRepository(),
+    session_factory=SessionLocal,
+    flush_interval=config.ENGAGEMENT_FLUSH_INTERVAL,
+    flush_events=config.ENGAGEMENT_FLUSH_EVENTS,
+    max_pending_events=config.ENGAGEMENT_MAX_PENDING_EVENTS,
+)
+
+
+def get_engagement_aggregator() -> EngagementAggregator:
+    return _aggregator
+
+
+def get_engagement_repository() -> EngagementRepository:
+    return _aggregator.repository
@@ -0,0 +1,17 @@
+from src.core.config import get_backend_config
+from src.ml.executor import InferenceExecutor
+from src.ml.price_worker import init_worker
+
+
+config = get_backend_config()
+
+_executor = InferenceExecutor(
+    kind=config.ML_EXECUTOR_KIND,
+    max_workers=config.ML_EXECUTOR_WORKERS,
+    max_queue=config.ML_EXECUTOR_MAX_QUEUE,
+    initializer=init_worker if config.ML_EXECUTOR_KIND == "process" else None,
+)
+
+
+def get_inference_executor() -> InferenceExecutor:
+    return _executor
@@ -1,7 +1,187 @@
-from src.ml.potd import ProductsOfTheDayClassifier
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Optional
 
-_classifier = ProductsOfTheDayClassifier('./src/ml/train_data/mock_products.csv')
+from fastapi import HTTPException, status
+from src.core.config import get_backend_config
+from src.core.db.database import SessionLocal
+from src.core.logger import get_logger
+from src.ml.potd_snapshot import ProductsOfTheDaySnapshot
+from src.ml.registry import ModelRegistry
+from src.services import ProductChangeListener
 
+from .engagement import get_engagement_aggregator
 
-def get_products_of_the_day_classifier() -> ProductsOfTheDayClassifier:
-    return _classifier
+if TYPE_CHECKING:
+    from src.ml.potd import ProductsOfTheDayClassifier
+
+
+config = get_backend_config()
+
+logger = get_logger(__name__)
+
+
+async def _load_engagement(classifier: Optional["ProductsOfTheDayClassifier"] = None) -> Optional[list[dict]]:
+    """
+    Flush buffered events and read the per-product engagement counters.
+
+    With ``classifier``, the deltas it has queued are included in the counters and
+    are dropped just before the read, with flushes held off in between; deltas
+    flushed afterwards stay queued. If the read fails they are queued again and
+    ``None`` is returned, so the classifier keeps its counters.
+    """
+    aggregator = get_engagement_aggregator()
+    deltas: dict[int, list] = {}
+    try:
+        async with aggregator.flushed(), SessionLocal() as db:
+            if classifier is not None:
+                deltas = classifier.take_pending_engagement()
+            return await aggregator.repository.get_all(db)
+    except Exception as e:
+        if classifier is not None:
+            logger.warning(f"Could not read engagement counters, keeping the current ones: {e}")
+            classifier.apply_engagement(deltas)
+            return None
+        logger.warning(f"Could not read engagement counters, using empty ones: {e}")
+        return []
+
+
+async def _train_classifier() -> "ProductsOfTheDayClassifier":
+    # Imported lazily: pulls in pandas and scikit-learn
+    from src.ml.potd import ProductsOfTheDayClassifier
+
+    engagement = await _load_engagement()
+    return await asyncio.to_thread(
+        ProductsOfTheDayClassifier,
+        config.ML_TRAIN_DATA,
+        engagement,
+        config.ML_POTD_THRESHOLD_TOLERANCE,
+        config.ML_POTD_BASELINE_SIZE,
+    )
+
+
+_registry = ModelRegistry(
+    "potd",
+    trainer=_train_classifier,
+    score=lambda classifier: classifier.f1_score,
+    keep_versions=config.ML_REGISTRY_KEEP_VERSIONS,
+    tolerance=config.ML_PROMOTION_TOLERANCE,
+)
+
+
+class ProductsOfTheDayListener(ProductChangeListener):
+    """
+    Marks products written through ProductService dirty on every retained classifier.
+    """
+
+    def product_saved(self, product: dict) -> None:
+        for classifier in _registry.models():
+            classifier.mark_product_saved(product)
+
+    def product_deleted(self, product_id: int) -> None:
+        for classifier in _registry.models():
+            classifier.mark_product_deleted(product_id)
+
+
+_product_listener = ProductsOfTheDayListener()
+
+
+@get_engagement_aggregator().on_flush
+def _on_engagement_flushed(deltas: dict[int, list]) -> None:
+    for classifier in _registry.models():
+        classifier.apply_engagement(deltas)
+
+
+_tasks: list[asyncio.Task] = []
+# Keeps a rescore from taking queued deltas between a snapshot refresh's counter read and the refresh
+_scoring_lock = asyncio.Lock()
+
+
+def _seconds_until_refresh(now: datetime) -> float:
+    next_refresh = now.replace(hour=config.ML_POTD_REFRESH_HOUR, minute=0, second=0, microsecond=0)
+    if next_refresh <= now:
+        next_refresh += timedelta(days=1)
+    return (next_refresh - now).total_seconds()
+
+
+async def _refresh_snapshots_daily() -> None:
+    while True:
+        await asyncio.sleep(_seconds_until_refresh(datetime.now(timezone.utc)))
+        classifier = _registry.current()
+        if classifier is None:
+            continue
+        try:
+            async with _scoring_lock:
+                engagement = await _load_engagement(classifier)
+                snapshot = await asyncio.to_thread(classifier.refresh_snapshot, engagement)
+            logger.info(
+                f"Products of the day snapshot for {snapshot.day} has {snapshot.count} products"
+                f" (model {snapshot.model_version})"
+            )
+        except Exception as e:
+            logger.error(f"Products of the day snapshot refresh failed: {e}")
+
+
+async def _rescore_dirty_products() -> None:
+    while True:
+        await asyncio.sleep(config.ML_POTD_RESCORE_INTERVAL)
+        classifier = _registry.current()
+        if classifier is None or not classifier.has_pending_changes:
+            continue
+        try:
+            async with _scoring_lock:
+                await asyncio.to_thread(classifier.rescore_dirty)
+        except Exception as e:
+            logger.error(f"Products of the day rescore failed: {e}")
+            continue
+        if classifier.needs_retrain and _registry.retrain_in_background():
+            logger.info("Products of the day label thresholds shifted, retraining the classifier")
+
+
+async def init_classifier_registry() -> None:
+    if not config.ML_POTD_ENABLED:
+        logger.info("Products of the day are disabled")
+        return
+    _registry.retrain_in_background()
+    if not _tasks:
+        _tasks.append(asyncio.create_task(_refresh_snapshots_daily()))
+        _tasks.append(asyncio.create_task(_rescore_dirty_products()))
+
+
+def stop_classifier_registry() -> None:
+    for task in _tasks:
+        task.cancel()
+    _tasks.clear()
+
+
+def get_classifier_registry() -> ModelRegistry:
+    return _registry
+
+
+def get_potd_product_listener() -> ProductsOfTheDayListener:
+    return _product_listener
+
+
+def get_products_of_the_day_classifier() -> "ProductsOfTheDayClassifier":
+    if not config.ML_POTD_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Products of the day are disabled",
+        )
+    classifier = _registry.current()
+    if classifier is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Products of the day model is not ready yet",
+        )
+    return classifier
+
+
+def get_products_of_the_day_snapshot() -> ProductsOfTheDaySnapshot:
+    snapshot = get_products_of_the_day_classifier().snapshot
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Products of the day are not ready yet",
+        )
+    return snapshot
@@ -1,8 +1,182 @@
-from src.ml.optimalprice import PricePredictor
+import asyncio
+from typing import Any, Optional
 
+from fastapi import HTTPException, status
+from src.core.config import get_backend_config
+from src.core.db.database import SessionLocal
+from src.core.logger import get_logger
+from src.ml.artifacts import ModelArtifactStore
+from src.ml.batching import MicroBatcher
+from src.ml.cache import PredictionCache
+from src.ml.feature_store import EXCLUDED_FIELDS
+from src.ml.price_base import BasePricePredictor
+from src.ml.registry import ModelRegistry
+from src.repositories import ProductRepository
+from src.services import ProductChangeListener
 
-_predictor = PricePredictor('./src/ml/train_data/mock_products.csv')
+from .executor import get_inference_executor
 
 
-def get_price_predictor() -> PricePredictor:
-    return _predictor
+config = get_backend_config()
+logger = get_logger(__name__)
+
+_artifact_store = ModelArtifactStore(config.ML_ARTIFACTS_DIR)
+_cache = PredictionCache(
+    max_entries=config.ML_PREDICTION_CACHE_SIZE,
+    ttl=config.ML_PREDICTION_CACHE_TTL,
+)
+
+_batcher = MicroBatcher(
+    get_inference_executor(),
+    max_batch=config.ML_MICROBATCH_MAX_SIZE,
+    max_wait=config.ML_MICROBATCH_WAIT_MS / 1000,
+)
+
+
+async def _load_features(predictor: BasePricePredictor) -> None:
+    """
+    Rebuild the predictor's feature store from the product table, keeping the
+    training CSV it was loaded with if the table cannot be read. Writes notified
+    while the table is read are applied on top, since the predictor is not
+    registered yet and the listener does not reach it.
+    """
+    repository = ProductRepository()
+    columns = [column.name for column in repository.model.__table__.columns if column.name not in EXCLUDED_FIELDS]
+    writes: list[tuple[str, Any]] = []
+    _product_listener.pending.append(writes)
+    try:
+        products = []
+        async with SessionLocal() as db:
+            async for chunk in repository.stream_after(db, chunk_size=config.ML_RETRAIN_CHUNK_SIZE, columns=columns):
+                products += chunk
+        await asyncio.to_thread(predictor.refresh_features, products)
+    except Exception as e:
+        logger.warning(f"Could not read products for the price feature store, keeping the training CSV: {e}")
+        return
+    finally:
+        _product_listener.pending.remove(writes)
+    for kind, value in writes:
+        if kind == "saved":
+            predictor.upsert_product(value)
+        else:
+            predictor.remove_product(value)
+
+
+async def _load_price_model(version: Optional[str] = None) -> BasePricePredictor:
+    if config.ML_PRICE_SERVING_FORMAT == "compiled":
+        from src.ml.compiled import CompiledPricePredictor
+        predictor = await asyncio.to_thread(CompiledPricePredictor, config.ML_TRAIN_DATA, _artifact_store, version)
+    else:
+        # Imported lazily: pulls in pandas, scikit-learn and xgboost
+        from src.ml.optimalprice import PricePredictor
+        predictor = await asyncio.to_thread(PricePredictor, config.ML_TRAIN_DATA, _artifact_store, version)
+    await _load_features(predictor)
+    return predictor
+
+
+async def _train_price_model() -> Optional[BasePricePredictor]:
+    from src.ml.optimalprice import PricePredictor
+    from src.ml.retrain import retrain, update_from_database
+
+    if _artifact_store.exists(BasePricePredictor.ARTIFACT_NAME):
+        # Start from the live version and fold in only the products added since it was trained;
+        # LATEST only moves once the registry accepts the new version
+        predictor = await retrain(
+            config.ML_ARTIFACTS_DIR, config.ML_TRAIN_DATA, config.ML_RETRAIN_CHUNK_SIZE, set_latest=False
+        )
+        if predictor is None:
+            return None
+    else:
+        predictor = await asyncio.to_thread(
+            PricePredictor,
+            config.ML_TRAIN_DATA,
+            cv_folds=config.ML_CV_FOLDS,
+            time_budget=config.ML_TRAIN_TIME_BUDGET,
+            n_jobs=config.ML_TRAIN_JOBS,
+        )
+        try:
+            await update_from_database(predictor)
+        except Exception as e:
+            logger.warning(f"Training price model without live products: {e}")
+        await asyncio.to_thread(predictor.save, _artifact_store, False)
+    if config.ML_PRICE_SERVING_FORMAT == "compiled":
+        return await _load_price_model(predictor.version)
+    await _load_features(predictor)
+    return predictor
+
+
+_registry = ModelRegistry(
+    "price",
+    trainer=_train_price_model,
+    loader=_load_price_model,
+    score=lambda predictor: predictor.r2_score,
+    baseline=lambda predictor: predictor.baseline_r2_score,
+    keep_versions=config.ML_REGISTRY_KEEP_VERSIONS,
+    tolerance=config.ML_PROMOTION_TOLERANCE,
+)
+
+
+@_registry.on_swap
+def _on_price_model_swap(predictor: BasePricePredictor) -> None:
+    _artifact_store.set_latest(BasePricePredictor.ARTIFACT_NAME, predictor.version)
+    predictor.cache = _cache
+    _cache.clear()
+
+
+class PriceProductListener(ProductChangeListener):
+    """
+    Applies product writes to the feature stores of every retained price model
+    and drops the affected cached predictions. Writes are also recorded in each
+    list of ``pending``, for models whose feature store is still being loaded.
+    """
+
+    def __init__(self):
+        self.pending: list[list[tuple[str, Any]]] = []
+
+    def product_saved(self, product: dict) -> None:
+        for predictor in _registry.models():
+            predictor.upsert_product(product)
+        for writes in self.pending:
+            writes.append(("saved", product))
+
+    def product_deleted(self, product_id: int) -> None:
+        for predictor in _registry.models():
+            predictor.remove_product(product_id)
+        for writes in self.pending:
+            writes.append(("deleted", product_id))
+
+
+_product_listener = PriceProductListener()
+
+
+async def init_price_registry() -> None:
+    """
+    Load the latest artifact, or train the first version in the background if none exists.
+    """
+    if _artifact_store.exists(BasePricePredictor.ARTIFACT_NAME):
+        await _registry.load()
+    else:
+        _registry.retrain_in_background()
+
+
+def get_price_registry() -> ModelRegistry:
+    return _registry
+
+
+def get_price_predictor() -> BasePricePredictor:
+    predictor = _registry.current()
+    if predictor is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Price model is not ready yet")
+    return predictor
+
+
+def get_prediction_cache() -> PredictionCache:
+    return _cache
+
+
+def get_price_product_listener() -> PriceProductListener:
+    return _product_listener
+
+
+def get_price_batcher() -> MicroBatcher:
+    return _batcher
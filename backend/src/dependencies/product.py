@@ -1,6 +1,47 @@
+from typing import Optional
+
+from src.core.config import get_backend_config
 from src.repositories import ProductRepository
-from src.services import ProductService
+from src.services import CacheBackend, InMemoryCacheBackend, LRUCache, ProductCache, ProductService
+
+from .analytics import get_price_analytics
+from .potd import get_potd_product_listener
+from .price import get_price_product_listener
+
+config = get_backend_config()
+
+SHARED_CACHE_BACKENDS = {
+    "memory": InMemoryCacheBackend,
+}
+
+
+def _shared_cache_backend() -> Optional[CacheBackend]:
+    if not config.PRODUCT_CACHE_SHARED_BACKEND:
+        return None
+    try:
+        return SHARED_CACHE_BACKENDS[config.PRODUCT_CACHE_SHARED_BACKEND]()
+    except KeyError:
+        raise ValueError(f"Unknown product cache backend: {config.PRODUCT_CACHE_SHARED_BACKEND}")
+
+
+_cache = ProductCache(
+    local=LRUCache(
+        max_entries=config.PRODUCT_CACHE_SIZE,
+        max_bytes=config.PRODUCT_CACHE_MAX_BYTES,
+        ttl=config.PRODUCT_CACHE_TTL,
+    ),
+    shared=_shared_cache_backend(),
+    shared_ttl=config.PRODUCT_CACHE_SHARED_TTL,
+) if config.PRODUCT_CACHE_SIZE > 0 else None
+
+
+def get_product_cache() -> Optional[ProductCache]:
+    return _cache
 
 
 def get_product_service() -> ProductService:
-    return ProductService(product_repository=ProductRepository())
+    return ProductService(
+        product_repository=ProductRepository(),
+        listeners=[get_price_product_listener(), get_potd_product_listener(), get_price_analytics()],
+        cache=_cache,
+    )
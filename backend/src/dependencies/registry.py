@@ -0,0 +1,15 @@
+from fastapi import HTTPException
+from src.ml.registry import ModelRegistry
+
+from .potd import get_classifier_registry
+from .price import get_price_registry
+
+
+def get_model_registry(name: str) -> ModelRegistry:
+    registries = {
+        "price": get_price_registry(),
+        "potd": get_classifier_registry(),
+    }
+    if name not in registries:
+        raise HTTPException(status_code=404, detail=f"Unknown model '{name}'")
+    return registries[name]
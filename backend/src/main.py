@@ -4,6 +4,11 @@ from src.core.db.database import engine, init_db
 from src.core.logger import get_logger
 from src.routers.router import router as api_router
 from src.core.config import get_backend_config
+from src.dependencies.analytics import get_price_analytics
+from src.dependencies.engagement import get_engagement_aggregator
+from src.dependencies.executor import get_inference_executor
+from src.dependencies.potd import init_classifier_registry, stop_classifier_registry
+from src.dependencies.price import init_price_registry
 
 config = get_backend_config()
 
@@ -24,6 +29,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified"],
 )
 
 
@@ -31,6 +37,11 @@ app.add_middleware(
 async def startup():
     await init_db()
     logger.info("Database initialized")
+    await get_price_analytics().init()
+    get_price_analytics().start()
+    get_engagement_aggregator().start()
+    await init_price_registry()
+    await init_classifier_registry()
 
 
 @app.on_event("shutdown")
@@ -39,6 +50,10 @@ async def shutdown():
     Shutdown event handler.
     """
     # Add any shutdown tasks here
+    stop_classifier_registry()
+    await get_engagement_aggregator().stop()
+    await get_price_analytics().stop()
+    get_inference_executor().shutdown()
     engine.dispose()
     logger.info("Database connection closed")
 
@@ -0,0 +1,139 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from src.core.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class ModelArtifactStore:
+    """
+    Versioned on-disk storage for fitted models.
+
+    Layout::
+
+        <root>/<name>/<version>/model.joblib
+        <root>/<name>/<version>/metadata.json
+        <root>/<name>/<version>/compiled.npz   (optional, NumPy-only serving format)
+        <root>/<name>/LATEST
+    """
+
+    FORMAT_VERSION = 1
+    MODEL_FILE = "model.joblib"
+    METADATA_FILE = "metadata.json"
+    COMPILED_FILE = "compiled.npz"
+    LATEST_FILE = "LATEST"
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _model_dir(self, name: str) -> Path:
+        return self.root / name
+
+    def path(self, name: str, version: str) -> Path:
+        return self._model_dir(name) / version
+
+    def latest_version(self, name: str) -> Optional[str]:
+        latest = self._model_dir(name) / self.LATEST_FILE
+        if not latest.exists():
+            return None
+        version = latest.read_text(encoding="utf-8").strip()
+        return version or None
+
+    def list_versions(self, name: str) -> list[str]:
+        model_dir = self._model_dir(name)
+        if not model_dir.exists():
+            return []
+        return sorted(
+            path.name for path in model_dir.iterdir()
+            if path.is_dir() and (path / self.METADATA_FILE).exists()
+        )
+
+    def exists(self, name: str, version: Optional[str] = None) -> bool:
+        version = version or self.latest_version(name)
+        if version is None:
+            return False
+        return (self._model_dir(name) / version / self.METADATA_FILE).exists()
+
+    def save(
+        self,
+        name: str,
+        payload: Any,
+        metadata: dict,
+        set_latest: bool = True,
+        files: Optional[dict[str, Callable[[str], None]]] = None,
+    ) -> str:
+        """
+        Write a new artifact version and return its identifier.
+
+        ``files`` maps extra file names to writers called with the target path.
+        The version directory is assembled in a temporary location and moved into
+        place, so readers never observe a partially written artifact.
+        """
+        version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        model_dir = self._model_dir(name)
+        model_dir.mkdir(parents=True, exist_ok=True)
+
+        metadata = {
+            **metadata,
+            "name": name,
+            "version": version,
+            "format_version": self.FORMAT_VERSION,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        # Imported here so workers serving compiled artifacts never load joblib
+        import joblib
+
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=model_dir))
+        try:
+            joblib.dump(payload, tmp_dir / self.MODEL_FILE)
+            for filename, writer in (files or {}).items():
+                writer(str(tmp_dir / filename))
+            (tmp_dir / self.METADATA_FILE).write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+            os.replace(tmp_dir, model_dir / version)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        if set_latest:
+            self.set_latest(name, version)
+
+        logger.info(f"Saved {name} artifact version {version}")
+        return version
+
+    def set_latest(self, name: str, version: str) -> None:
+        latest = self._model_dir(name) / self.LATEST_FILE
+        tmp_latest = latest.with_suffix(".tmp")
+        tmp_latest.write_text(version, encoding="utf-8")
+        os.replace(tmp_latest, latest)
+
+    def load_metadata(self, name: str, version: Optional[str] = None) -> dict:
+        version = version or self.latest_version(name)
+        if version is None:
+            raise FileNotFoundError(f"No artifact found for model '{name}'")
+        metadata_path = self._model_dir(name) / version / self.METADATA_FILE
+        if not metadata_path.exists():
+            raise FileNotFoundError(f"Artifact {name}/{version} not found")
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        if metadata.get("format_version") != self.FORMAT_VERSION:
+            raise ValueError(
+                f"Artifact {name}/{version} has unsupported format version {metadata.get('format_version')}"
+            )
+        return metadata
+
+    def load(self, name: str, version: Optional[str] = None) -> tuple[Any, dict]:
+        """
+        Load an artifact payload and its metadata, defaulting to the latest version.
+        """
+        import joblib
+
+        metadata = self.load_metadata(name, version)
+        payload = joblib.load(self._model_dir(name) / metadata["version"] / self.MODEL_FILE)
+        return payload, metadata
@@ -0,0 +1,99 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Optional
+
+from src.ml.executor import InferenceExecutor, summarize_timings
+from src.ml.price_worker import recommend_prices_mixed
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-product price requests into batched predictions.
+
+    The first request opens a window of ``max_wait`` seconds; everything that
+    arrives before it closes, or until ``max_batch`` requests are waiting, is priced
+    with one ``recommend_prices_mixed`` call per model on the inference executor
+    and the results are handed back to each waiting request.
+    """
+
+    def __init__(
+        self,
+        executor: InferenceExecutor,
+        max_batch: int = 64,
+        max_wait: float = 0.002,
+        timing_window: int = 1000,
+    ):
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending: list[tuple[Any, int, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+        self._latency_ms: deque[float] = deque(maxlen=timing_window)
+        self._batch_sizes: deque[int] = deque(maxlen=timing_window)
+        self._batches = 0
+
+    async def predict(self, predictor: Any, product_id: int) -> float:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((predictor, product_id, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        started = time.monotonic()
+        try:
+            return await future
+        finally:
+            self._latency_ms.append((time.monotonic() - started) * 1000)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[Any, int, asyncio.Future]]) -> None:
+        # Requests that raced a model swap may reference different versions
+        groups: dict[int, tuple[Any, list[tuple[int, asyncio.Future]]]] = {}
+        for predictor, product_id, future in batch:
+            groups.setdefault(id(predictor), (predictor, []))[1].append((product_id, future))
+
+        for predictor, waiters in groups.values():
+            self._batches += 1
+            self._batch_sizes.append(len(waiters))
+            product_ids = list(dict.fromkeys(product_id for product_id, _ in waiters))
+            try:
+                found, _ = await recommend_prices_mixed(self.executor, predictor, product_ids, [])
+            except Exception as e:
+                for _, future in waiters:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for product_id, future in waiters:
+                if future.done():
+                    continue
+                if product_id in found:
+                    future.set_result(found[product_id])
+                else:
+                    future.set_exception(ValueError(f"Product with ID {product_id} not found"))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000,
+            "pending": len(self._pending),
+            "batches": self._batches,
+            "mean_batch_size": (
+                round(sum(self._batch_sizes) / len(self._batch_sizes), 2) if self._batch_sizes else None
+            ),
+            "latency_ms": summarize_timings(self._latency_ms),
+        }
@@ -0,0 +1,104 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import numpy as np
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of model outputs with a per-entry TTL.
+
+    Entries are keyed on (model version, hash of the feature row), so a product
+    whose features did not change keeps hitting while any edit or model swap
+    naturally misses. Product ids are tracked on the side so writes can drop the
+    entries a product produced; entries that expire or are evicted leave that
+    index too. Safe to use from executor threads.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: Optional[float] = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # key -> (value, expires_at, product_id)
+        self._entries: OrderedDict[tuple, tuple[Any, float, Optional[int]]] = OrderedDict()
+        self._product_keys: dict[int, set[tuple]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(version: Optional[str], features: np.ndarray) -> tuple:
+        digest = hashlib.blake2b(np.ascontiguousarray(features, dtype=np.float64).tobytes(), digest_size=16)
+        return version, digest.digest()
+
+    def get(self, key: tuple) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at, _ = entry
+            if expires_at < time.monotonic():
+                self._pop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple, value: Any, product_id: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else float("inf")
+        with self._lock:
+            # A key is owned by the product that stored it last
+            self._pop(key)
+            self._entries[key] = (value, expires_at, product_id)
+            if product_id is not None:
+                self._product_keys.setdefault(product_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _pop(self, key: tuple) -> bool:
+        # Caller holds the lock
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        product_id = entry[2]
+        keys = self._product_keys.get(product_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._product_keys[product_id]
+        return True
+
+    def invalidate_product(self, product_id: int) -> None:
+        with self._lock:
+            for key in list(self._product_keys.get(product_id, ())):
+                if self._pop(key):
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._product_keys.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
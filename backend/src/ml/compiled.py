@@ -0,0 +1,131 @@
+"""
+NumPy-only evaluation of compiled price models.
+
+Serving workers that load a compiled artifact import this module instead of
+``src.ml.optimalprice``, so the price model never imports pandas, scikit-learn
+or xgboost. The products of the day classifier still trains with pandas and
+scikit-learn; set ``ML_POTD_ENABLED=FALSE`` for workers that should load NumPy only.
+"""
+import json
+import os
+from typing import Optional
+
+import numpy as np
+
+from src.core.logger import get_logger
+from src.ml.artifacts import ModelArtifactStore
+from src.ml.price_base import BasePricePredictor
+
+
+logger = get_logger(__name__)
+
+
+class CompiledModel:
+    """
+    A fitted regressor flattened into plain arrays.
+
+    ``linear``
+        ``coef`` and ``intercept``.
+    ``forest``
+        All trees concatenated into per-node arrays (``left``, ``right``,
+        ``feature``, ``threshold``, ``value``, ``missing_left``) with each tree's
+        root offset in ``roots``. ``aggregate`` is ``mean`` (random forest) or
+        ``sum`` (gradient boosting, plus ``base_score``); ``strict`` selects
+        ``x < threshold`` (XGBoost) instead of ``x <= threshold`` (scikit-learn).
+    """
+
+    KINDS = ("linear", "forest")
+
+    def __init__(self, kind: str, arrays: dict[str, np.ndarray], params: Optional[dict] = None):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown compiled model kind '{kind}'")
+        self.kind = kind
+        self.arrays = arrays
+        self.params = params or {}
+        if kind == "forest":
+            self.depth = int(self.params["depth"])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if self.kind == "linear":
+            return X @ self.arrays["coef"] + self.arrays["intercept"][0]
+        return self._predict_forest(X)
+
+    def _predict_forest(self, X: np.ndarray) -> np.ndarray:
+        a = self.arrays
+        # Tree libraries evaluate splits on float32 inputs
+        X = X.astype(np.float32).astype(np.float64)
+        rows = np.arange(len(X))[:, np.newaxis]
+        nodes = np.broadcast_to(a["roots"], (len(X), len(a["roots"]))).copy()
+
+        for _ in range(self.depth):
+            leaf = a["left"][nodes] < 0
+            if leaf.all():
+                break
+            x = X[rows, a["feature"][nodes]]
+            threshold = a["threshold"][nodes]
+            go_left = x < threshold if self.params.get("strict") else x <= threshold
+            go_left = np.where(np.isnan(x), a["missing_left"][nodes], go_left)
+            nodes = np.where(leaf, nodes, np.where(go_left, a["left"][nodes], a["right"][nodes]))
+
+        values = a["value"][nodes]
+        if self.params.get("aggregate") == "sum":
+            # Accumulate tree by tree in float32, as XGBoost does, to reproduce its output exactly
+            total = np.full(len(X), self.params.get("base_score", 0.0), dtype=np.float32)
+            for tree_values in values.astype(np.float32).T:
+                total += tree_values
+            return total.astype(np.float64)
+        return values.mean(axis=1)
+
+    def save(self, path: str) -> None:
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            __kind__=np.array(self.kind),
+            __params__=np.array(json.dumps(self.params)),
+            **self.arrays,
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledModel":
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {key: data[key] for key in data.files if not key.startswith("__")}
+            return cls(str(data["__kind__"]), arrays, json.loads(str(data["__params__"])))
+
+
+class CompiledPricePredictor(BasePricePredictor):
+    """
+    Price predictor backed by a compiled artifact; same serving interface as
+    :class:`src.ml.optimalprice.PricePredictor` but cannot be trained or refit.
+    With ``features=False`` only the model is loaded, for inference workers.
+    """
+
+    def __init__(
+        self,
+        csv_path: str,
+        artifact_store: ModelArtifactStore,
+        version: Optional[str] = None,
+        features: bool = True,
+    ):
+        super().__init__(csv_path)
+        metadata = artifact_store.load_metadata(self.ARTIFACT_NAME, version)
+        compiled_path = artifact_store.path(self.ARTIFACT_NAME, metadata["version"]) / artifact_store.COMPILED_FILE
+        if not compiled_path.exists():
+            raise FileNotFoundError(f"Price artifact {metadata['version']} has no compiled model")
+
+        self.model = CompiledModel.load(str(compiled_path))
+        self.best_model_name = metadata["model"]
+        self.r2_score = metadata["r2_score"]
+        self.baseline_r2_score = metadata.get("baseline_r2_score")
+        self.X_columns = list(metadata["X_columns"])
+        self.version = metadata["version"]
+        self.high_water_mark = metadata.get("high_water_mark")
+        if features:
+            self._init_feature_store()
+        logger.info(f"Loaded compiled price model {self.version} ({self.best_model_name})")
+
+    def predict_matrix(self, X: np.ndarray) -> list[float]:
+        if len(X) == 0:
+            return []
+        return [float(value) for value in self.model.predict(X)]
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+import numpy as np
+
+from src.core.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class InferenceQueueFull(Exception):
+    """Raised when the executor already holds its maximum number of pending tasks."""
+
+
+def summarize_timings(samples: Iterable[float]) -> dict[str, Optional[float]]:
+    values = np.fromiter(samples, dtype=np.float64)
+    if not len(values):
+        return {"mean": None, "p50": None, "p99": None, "max": None}
+    p50, p99 = np.percentile(values, [50, 99])
+    return {
+        "mean": round(float(values.mean()), 3),
+        "p50": round(float(p50), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(values.max()), 3),
+    }
+
+
+def _timed_call(fn: Callable, args: tuple, kwargs: dict) -> tuple[float, Any, float]:
+    # Runs inside the worker; time.monotonic is system-wide, so it is comparable
+    # with the submitting process even for process pools
+    started = time.monotonic()
+    result = fn(*args, **kwargs)
+    return started, result, time.monotonic()
+
+
+class InferenceExecutor:
+    """
+    Runs blocking model calls on a thread or process pool so they never stall the
+    event loop, rejecting work once ``max_queue`` tasks are queued or running.
+
+    With ``kind="process"`` the callable and its arguments are pickled for every
+    task: send module-level functions and arrays, not objects holding locks or
+    state that changes, and load that state once per worker with ``initializer``.
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: Optional[int] = None,
+        max_queue: int = 64,
+        timing_window: int = 1000,
+        initializer: Optional[Callable[[], None]] = None,
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind '{kind}', expected 'thread' or 'process'")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.initializer = initializer
+        self._pool: Optional[Executor] = None
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._queue_ms: deque[float] = deque(maxlen=timing_window)
+        self._run_ms: deque[float] = deque(maxlen=timing_window)
+
+    @property
+    def pool(self) -> Executor:
+        # Created lazily so importing the dependency module does not fork workers
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=self.initializer)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        return self._pool
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run ``fn(*args, **kwargs)`` on the pool and await its result.
+        """
+        if self._pending >= self.max_queue:
+            self._rejected += 1
+            raise InferenceQueueFull(f"Inference queue is full ({self.max_queue} pending tasks)")
+
+        self._pending += 1
+        submitted = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            started, result, finished = await loop.run_in_executor(self.pool, _timed_call, fn, args, kwargs)
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        self._completed += 1
+        queue_ms = (started - submitted) * 1000
+        run_ms = (finished - started) * 1000
+        self._queue_ms.append(queue_ms)
+        self._run_ms.append(run_ms)
+        logger.debug(f"{getattr(fn, '__qualname__', fn)} waited {queue_ms:.2f} ms, ran {run_ms:.2f} ms")
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "queue_ms": summarize_timings(self._queue_ms),
+            "run_ms": summarize_timings(self._run_ms),
+        }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
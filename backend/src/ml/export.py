@@ -0,0 +1,144 @@
+"""
+Compile a saved price model into the NumPy-only serving format.
+
+Usage (from the backend directory)::
+
+    python -m src.ml.export [--version VERSION] [--artifacts-dir DIR]
+"""
+import argparse
+import json
+from typing import Optional
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from xgboost import XGBRegressor
+
+from src.core.config import get_backend_config
+from src.core.logger import get_logger
+from src.ml.artifacts import ModelArtifactStore
+from src.ml.compiled import CompiledModel
+
+
+logger = get_logger(__name__)
+
+
+def _concat_trees(trees: list[dict[str, np.ndarray]]) -> tuple[dict[str, np.ndarray], int]:
+    arrays = {key: [] for key in ("left", "right", "feature", "threshold", "value", "missing_left")}
+    roots = []
+    offset = 0
+    depth = 0
+    for tree in trees:
+        roots.append(offset)
+        leaf = tree["left"] < 0
+        arrays["left"].append(np.where(leaf, -1, tree["left"] + offset))
+        arrays["right"].append(np.where(leaf, -1, tree["right"] + offset))
+        # Leaves never branch; point them at a valid column so indexing stays in range
+        arrays["feature"].append(np.where(leaf, 0, tree["feature"]))
+        arrays["threshold"].append(tree["threshold"])
+        arrays["value"].append(tree["value"])
+        arrays["missing_left"].append(tree["missing_left"])
+        depth = max(depth, _tree_depth(tree["left"], tree["right"]))
+        offset += len(tree["left"])
+
+    result = {
+        "left": np.concatenate(arrays["left"]).astype(np.int64),
+        "right": np.concatenate(arrays["right"]).astype(np.int64),
+        "feature": np.concatenate(arrays["feature"]).astype(np.int64),
+        "threshold": np.concatenate(arrays["threshold"]).astype(np.float64),
+        "value": np.concatenate(arrays["value"]).astype(np.float64),
+        "missing_left": np.concatenate(arrays["missing_left"]).astype(bool),
+        "roots": np.array(roots, dtype=np.int64),
+    }
+    return result, depth
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    depth = 0
+    level = [0]
+    while level:
+        level = [child for node in level if left[node] >= 0 for child in (left[node], right[node])]
+        depth += bool(level)
+    return depth
+
+
+def _compile_sklearn_forest(model: RandomForestRegressor) -> CompiledModel:
+    trees = []
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        missing = getattr(tree, "missing_go_to_left", None)
+        trees.append({
+            "left": tree.children_left,
+            "right": tree.children_right,
+            "feature": tree.feature,
+            "threshold": tree.threshold,
+            "value": tree.value[:, 0, 0],
+            "missing_left": missing if missing is not None else np.zeros(tree.node_count, dtype=bool),
+        })
+    arrays, depth = _concat_trees(trees)
+    return CompiledModel("forest", arrays, {"aggregate": "mean", "strict": False, "depth": depth})
+
+
+def _compile_xgboost(model: XGBRegressor) -> CompiledModel:
+    dump = json.loads(model.get_booster().save_raw("json"))
+    learner = dump["learner"]
+    if learner["gradient_booster"]["name"] != "gbtree":
+        raise TypeError(f"Unsupported XGBoost booster '{learner['gradient_booster']['name']}'")
+    if learner["objective"]["name"] != "reg:squarederror":
+        raise TypeError(f"Unsupported XGBoost objective '{learner['objective']['name']}'")
+
+    trees = []
+    for tree in learner["gradient_booster"]["model"]["trees"]:
+        left = np.array(tree["left_children"])
+        trees.append({
+            "left": left,
+            "right": np.array(tree["right_children"]),
+            "feature": np.array(tree["split_indices"]),
+            # Splits and leaf values are float32 in XGBoost; leaf values sit in split_conditions
+            "threshold": np.array(tree["split_conditions"], dtype=np.float32),
+            "value": np.array(tree["split_conditions"], dtype=np.float32),
+            "missing_left": np.array(tree["default_left"], dtype=bool),
+        })
+    arrays, depth = _concat_trees(trees)
+    base_score = float(learner["learner_model_param"]["base_score"].strip("[]"))
+    return CompiledModel("forest", arrays, {"aggregate": "sum", "strict": True, "depth": depth, "base_score": base_score})
+
+
+def compile_model(model) -> CompiledModel:
+    """
+    Flatten a fitted LinearRegression, RandomForestRegressor or XGBRegressor.
+    """
+    if isinstance(model, LinearRegression):
+        return CompiledModel("linear", {
+            "coef": np.asarray(model.coef_, dtype=np.float64).ravel(),
+            "intercept": np.atleast_1d(np.asarray(model.intercept_, dtype=np.float64)),
+        })
+    if isinstance(model, RandomForestRegressor):
+        return _compile_sklearn_forest(model)
+    if isinstance(model, XGBRegressor):
+        return _compile_xgboost(model)
+    raise TypeError(f"Cannot compile {type(model).__name__}")
+
+
+def export_artifact(artifact_store: ModelArtifactStore, version: Optional[str] = None, name: str = "price") -> str:
+    """
+    Compile the model of a saved artifact and store it next to the original.
+    """
+    payload, metadata = artifact_store.load(name, version)
+    compiled = compile_model(payload["model"])
+    compiled.save(str(artifact_store.path(name, metadata["version"]) / artifact_store.COMPILED_FILE))
+    logger.info(f"Compiled {name} artifact {metadata['version']} ({compiled.kind})")
+    return metadata["version"]
+
+
+def main(argv: list[str] | None = None) -> str:
+    config = get_backend_config()
+    parser = argparse.ArgumentParser(description="Compile a price model artifact for NumPy-only serving.")
+    parser.add_argument("--version", default=None, help="Artifact version (default: latest)")
+    parser.add_argument("--artifacts-dir", default=config.ML_ARTIFACTS_DIR, help="Artifact store root")
+    args = parser.parse_args(argv)
+    return export_artifact(ModelArtifactStore(args.artifacts_dir), args.version)
+
+
+if __name__ == "__main__":
+    main()
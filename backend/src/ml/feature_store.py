@@ -0,0 +1,70 @@
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+from src.ml.features import build_feature_matrix
+
+
+# Raw fields that are never model inputs and too large to keep per product
+EXCLUDED_FIELDS = ("image_url",)
+
+
+class FeatureStore:
+    """
+    Id-indexed store of engineered feature rows for the product catalog.
+
+    Rows are built once when the store is loaded and then kept up to date per
+    product, so lookups are a dict access instead of a scan over the source data.
+    """
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+        self._rows: dict[int, np.ndarray] = {}
+        self._records: dict[int, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, product_id: int) -> bool:
+        return product_id in self._rows
+
+    @staticmethod
+    def _slim(record: dict[str, Any]) -> dict[str, Any]:
+        return {key: value for key, value in record.items() if key not in EXCLUDED_FIELDS}
+
+    def load(self, records: Iterable[dict[str, Any]]) -> None:
+        """
+        Replace the store contents. The new index is swapped in as a whole, so
+        concurrent readers see either the old or the new catalog.
+        """
+        records = [self._slim(record) for record in records]
+        matrix = build_feature_matrix(records, self.columns)
+        ids = [int(record["id"]) for record in records]
+        self._rows = dict(zip(ids, matrix))
+        self._records = dict(zip(ids, records))
+
+    def upsert(self, record: dict[str, Any]) -> None:
+        record = self._slim(record)
+        product_id = int(record["id"])
+        self._rows[product_id] = build_feature_matrix([record], self.columns)[0]
+        self._records[product_id] = record
+
+    def remove(self, product_id: int) -> None:
+        self._rows.pop(product_id, None)
+        self._records.pop(product_id, None)
+
+    def get_record(self, product_id: int) -> dict[str, Any]:
+        return dict(self._records[product_id])
+
+    def get_features(self, product_id: int) -> np.ndarray:
+        return self._rows[product_id]
+
+    def take(self, product_ids: Iterable[int]) -> tuple[np.ndarray, list[int]]:
+        """
+        Stack the feature rows of the known ids; returns the matrix and the ids it covers.
+        """
+        rows = self._rows
+        found = [product_id for product_id in product_ids if product_id in rows]
+        if not found:
+            return np.empty((0, len(self.columns))), found
+        return np.vstack([rows[product_id] for product_id in found]), found
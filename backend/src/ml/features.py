@@ -0,0 +1,39 @@
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+
+# Features derived from raw product fields rather than read directly
+ENGINEERED_FEATURES = {
+    "description_length": lambda sample: len(sample.get("description") or ""),
+}
+
+
+def _feature_value(sample: dict[str, Any], column: str) -> float:
+    if column in ENGINEERED_FEATURES:
+        return float(ENGINEERED_FEATURES[column](sample))
+    if column in sample:
+        value = sample[column]
+        return float(value) if value is not None else 0.0
+
+    # One-hot column produced by pd.get_dummies: "<field>_<value>"
+    for split in range(len(column) - 1, 0, -1):
+        if column[split] == "_" and column[:split] in sample:
+            return float(str(sample[column[:split]]) == column[split + 1:])
+    return 0.0
+
+
+def build_feature_matrix(samples: Iterable[dict[str, Any]], columns: Sequence[str]) -> np.ndarray:
+    """
+    Build the model input matrix for many raw product dicts at once.
+
+    Produces the same values as the training transform (description_length,
+    integer is_active, one-hot columns reindexed to ``columns`` with 0 for
+    anything missing) without building a DataFrame per sample.
+    """
+    samples = list(samples)
+    matrix = np.zeros((len(samples), len(columns)), dtype=np.float64)
+    for row, sample in enumerate(samples):
+        for col, column in enumerate(columns):
+            matrix[row, col] = _feature_value(sample, column)
+    return matrix
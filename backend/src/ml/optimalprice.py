@@ -1,23 +1,76 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Optional
+
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
+import sklearn
+import xgboost
+from sklearn.base import clone
+from sklearn.model_selection import KFold
 from sklearn.linear_model import LinearRegression
 from sklearn.ensemble import RandomForestRegressor
 from xgboost import XGBRegressor
 from sklearn.metrics import r2_score
 
+from src.core.logger import get_logger
+from src.ml.artifacts import ModelArtifactStore
+from src.ml.export import compile_model
+from src.ml.features import build_feature_matrix
+from src.ml.price_base import BasePricePredictor
+
+
+logger = get_logger(__name__)
+
 
-class PricePredictor:
-    def __init__(self, csv_path: str):
-        self.csv_path = csv_path
+def _evaluate_fold(model, X: pd.DataFrame, y: pd.Series, train_idx: np.ndarray, test_idx: np.ndarray) -> dict:
+    started = time.perf_counter()
+    model.fit(X.iloc[train_idx], y.iloc[train_idx])
+    fitted = time.perf_counter()
+    preds = model.predict(X.iloc[test_idx])
+    predicted = time.perf_counter()
+    return {
+        "r2": float(r2_score(y.iloc[test_idx], preds)),
+        "fit_s": fitted - started,
+        "predict_s": predicted - fitted,
+    }
+
+
+class PricePredictor(BasePricePredictor):
+    def __init__(
+        self,
+        csv_path: str,
+        artifact_store: Optional[ModelArtifactStore] = None,
+        version: Optional[str] = None,
+        cv_folds: int = 5,
+        time_budget: Optional[float] = None,
+        n_jobs: Optional[int] = None,
+        features: bool = True,
+    ):
+        super().__init__(csv_path)
+        self.cv_folds = cv_folds
+        self.time_budget = time_budget
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        # Candidates run one job each during selection; parallelism comes from
+        # evaluating (model, fold) pairs concurrently
         self.models = {
             "LinearRegression": LinearRegression(),
-            "RandomForest": RandomForestRegressor(n_estimators=100, random_state=42),
-            "XGBoost": XGBRegressor(n_estimators=100, random_state=42),
+            "RandomForest": RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=1),
+            "XGBoost": XGBRegressor(n_estimators=100, random_state=42, n_jobs=1),
         }
         self.best_model = None
-        self.X_columns = None
-        self._train()
+        self.selection_report = None
+        self.linear_stats = None
+
+        # Only pay for in-process training when there is nothing on disk to load
+        if artifact_store is not None and (version or artifact_store.exists(self.ARTIFACT_NAME)):
+            self._load_artifact(artifact_store, version)
+        else:
+            self._train()
+        # Inference workers only need the model
+        if features:
+            self._init_feature_store()
 
     def _load_data(self):
         df = pd.read_csv(self.csv_path)
@@ -28,34 +81,224 @@ class PricePredictor:
         X = pd.get_dummies(X, drop_first=True)
         return X, y, df
 
+    @staticmethod
+    def _high_water_mark(df: pd.DataFrame) -> dict:
+        created_at = pd.to_datetime(df['created_at'], utc=True).dt.tz_localize(None)
+        last = pd.DataFrame({'created_at': created_at, 'id': df['id']}).sort_values(['created_at', 'id']).iloc[-1]
+        return {"created_at": last['created_at'].isoformat(), "id": int(last['id'])}
+
+    @staticmethod
+    def _linear_statistics(X, y) -> dict:
+        # Sufficient statistics for OLS with an intercept column, so new rows can be
+        # folded in without revisiting the old ones
+        Xa = np.column_stack([np.asarray(X, dtype=np.float64), np.ones(len(X))])
+        return {"xtx": Xa.T @ Xa, "xty": Xa.T @ np.asarray(y, dtype=np.float64), "rows": len(X)}
+
+    def _select_model(self, X: pd.DataFrame, y: pd.Series) -> dict:
+        """
+        Score every candidate with k-fold cross-validation, running all (model, fold)
+        fits concurrently. Models are judged on the folds that finished within
+        ``time_budget`` seconds.
+
+        The budget is a soft cutoff: fits not yet started are cancelled, but a fit
+        already running cannot be interrupted in its thread. It keeps its worker busy
+        in the background until it ends, and its result is discarded, so the CPU may
+        stay busy for up to one fit per worker after selection returns.
+        """
+        splits = list(KFold(n_splits=self.cv_folds, shuffle=True, random_state=42).split(X))
+        pool = ThreadPoolExecutor(max_workers=self.n_jobs, thread_name_prefix="model-selection")
+        futures = {
+            pool.submit(_evaluate_fold, clone(model), X, y, train_idx, test_idx): name
+            for name, model in self.models.items()
+            for train_idx, test_idx in splits
+        }
+        try:
+            done, pending = wait(futures, timeout=self.time_budget)
+            if not done:
+                # Nothing finished inside the budget; settle for the first result
+                done, pending = wait(futures, return_when=FIRST_COMPLETED)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        results = {name: [] for name in self.models}
+        for future in done:
+            results[futures[future]].append(future.result())
+
+        report = {}
+        for name, folds in results.items():
+            report[name] = {
+                "folds": len(folds),
+                "timed_out": len(folds) < len(splits),
+                "r2_mean": float(np.mean([fold["r2"] for fold in folds])) if folds else None,
+                "r2_std": float(np.std([fold["r2"] for fold in folds])) if folds else None,
+                "fit_s": float(np.mean([fold["fit_s"] for fold in folds])) if folds else None,
+                "predict_s": float(np.mean([fold["predict_s"] for fold in folds])) if folds else None,
+            }
+        return report
+
     def _train(self):
-        X, y, _ = self._load_data()
+        X, y, df = self._load_data()
         self.X_columns = X.columns
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-        best_score = -np.inf
-        for name, model in self.models.items():
-            model.fit(X_train, y_train)
-            preds = model.predict(X_test)
+        started = time.perf_counter()
+        report = self._select_model(X, y)
+        scored = {name: entry["r2_mean"] for name, entry in report.items() if entry["r2_mean"] is not None}
+        self.best_model_name = max(scored, key=scored.get)
+        self.r2_score = scored[self.best_model_name]
 
-            r2 = r2_score(y_test, preds)
-            if r2 > best_score:
-                best_score = r2
-                self.best_model = model
+        # Refit the winner on all rows, now free to use every core
+        self.best_model = clone(self.models[self.best_model_name])
+        if "n_jobs" in self.best_model.get_params():
+            self.best_model.set_params(n_jobs=self.n_jobs)
+        self.best_model.fit(X, y)
+        self.models[self.best_model_name] = self.best_model
 
-    def get_product_by_id(self, product_id: int) -> dict:
-        df = pd.read_csv(self.csv_path)
-        product_row = df[df['id'] == product_id]
-        if product_row.empty:
-            raise ValueError(f"Product with ID {product_id} not found")
-        return product_row.iloc[0].to_dict()
-
-    def recommend_price(self, sample: dict) -> float:
-        sample_df = pd.DataFrame([sample])
-        sample_df['description_length'] = sample_df['description'].apply(len)
-        sample_df['is_active'] = sample_df['is_active'].astype(int)
-        sample_df = sample_df.drop(columns=['name', 'description', 'image_url', 'price'], errors='ignore')
-        sample_df = pd.get_dummies(sample_df)
-        sample_df = sample_df.reindex(columns=self.X_columns, fill_value=0)
-
-        return float(self.best_model.predict(sample_df)[0])
+        self.selection_report = {
+            "cv_folds": self.cv_folds,
+            "time_budget_s": self.time_budget,
+            "duration_s": round(time.perf_counter() - started, 3),
+            "models": report,
+        }
+        self.high_water_mark = self._high_water_mark(df)
+        if isinstance(self.best_model, LinearRegression):
+            self.linear_stats = self._linear_statistics(X, y)
+        for name, entry in report.items():
+            logger.info(
+                f"{name}: r2={entry['r2_mean']} over {entry['folds']} folds, "
+                f"fit {entry['fit_s']}s, predict {entry['predict_s']}s"
+            )
+        logger.info(f"Trained price model: {self.best_model_name} (cv r2={self.r2_score:.4f})")
+
+    def _load_artifact(self, artifact_store: ModelArtifactStore, version: Optional[str] = None):
+        payload, metadata = artifact_store.load(self.ARTIFACT_NAME, version)
+        for library, module in (("scikit-learn", sklearn), ("xgboost", xgboost)):
+            trained_with = metadata.get("libraries", {}).get(library)
+            if trained_with and trained_with != module.__version__:
+                logger.warning(
+                    f"Price artifact {metadata['version']} was trained with {library} {trained_with}, "
+                    f"running {module.__version__}"
+                )
+
+        self.best_model = payload["model"]
+        self.linear_stats = payload.get("linear_stats")
+        self.high_water_mark = metadata.get("high_water_mark")
+        self.best_model_name = metadata["model"]
+        self.r2_score = metadata["r2_score"]
+        self.baseline_r2_score = metadata.get("baseline_r2_score")
+        self.selection_report = metadata.get("selection")
+        self.X_columns = pd.Index(metadata["X_columns"])
+        self.version = metadata["version"]
+        logger.info(f"Loaded price model artifact {self.version} ({self.best_model_name})")
+
+    def save(self, artifact_store: ModelArtifactStore, set_latest: bool = True) -> str:
+        """
+        Persist the selected model and its feature layout as a new artifact version.
+        """
+        metadata = {
+            "model": self.best_model_name,
+            "r2_score": self.r2_score,
+            "baseline_r2_score": self.baseline_r2_score,
+            "selection": self.selection_report,
+            "X_columns": list(self.X_columns),
+            "train_data": self.csv_path,
+            "high_water_mark": self.high_water_mark,
+            "libraries": {
+                "scikit-learn": sklearn.__version__,
+                "xgboost": xgboost.__version__,
+                "numpy": np.__version__,
+                "pandas": pd.__version__,
+            },
+        }
+        payload = {"model": self.best_model, "linear_stats": self.linear_stats}
+        files = {}
+        try:
+            files[artifact_store.COMPILED_FILE] = compile_model(self.best_model).save
+        except TypeError as e:
+            logger.warning(f"Saving price model without a compiled form: {e}")
+        self.version = artifact_store.save(
+            self.ARTIFACT_NAME, payload, metadata, set_latest=set_latest, files=files
+        )
+        return self.version
+
+    def partial_fit(
+        self, records: list[dict], boost_rounds: int = 10, extra_trees: int = 10, holdout_every: int = 0
+    ) -> tuple[int, list[dict]]:
+        """
+        Fold new product rows into the selected model without refitting on old data.
+
+        - LinearRegression: exact refit from accumulated X'X / X'y statistics.
+        - XGBoost: ``boost_rounds`` more boosting rounds on the new rows.
+        - RandomForest: ``extra_trees`` more trees grown on the new rows (warm start).
+
+        With ``holdout_every``, every Nth priced row is left out of the fit and
+        returned, to score the update with :meth:`score_update`. All of them go
+        into the feature store. ``records`` must be ordered by (created_at, id);
+        the last one becomes the new high-water mark. Returns the number of rows
+        fitted and the held-out rows.
+        """
+        records = [record for record in records if record.get("price") is not None]
+        if not records:
+            return 0, []
+        holdout = records[::holdout_every] if holdout_every else []
+        fit = [record for position, record in enumerate(records) if not holdout_every or position % holdout_every]
+
+        if fit:
+            self._fit_increment(fit, boost_rounds, extra_trees)
+        for record in records:
+            self.feature_store.upsert(record)
+        last = records[-1]
+        created_at = last["created_at"]
+        self.high_water_mark = {
+            "created_at": created_at.isoformat() if hasattr(created_at, "isoformat") else str(created_at),
+            "id": int(last["id"]),
+        }
+        return len(fit), holdout
+
+    def _fit_increment(self, records: list[dict], boost_rounds: int, extra_trees: int) -> None:
+        X = build_feature_matrix(records, self.X_columns)
+        y = np.array([float(record["price"]) for record in records])
+        model = self.best_model
+
+        if isinstance(model, LinearRegression):
+            if self.linear_stats is None:
+                X_all, y_all, _ = self._load_data()
+                self.linear_stats = self._linear_statistics(X_all.reindex(columns=self.X_columns, fill_value=0), y_all)
+            update = self._linear_statistics(X, y)
+            self.linear_stats = {key: self.linear_stats[key] + update[key] for key in update}
+            coef = np.linalg.lstsq(self.linear_stats["xtx"], self.linear_stats["xty"], rcond=None)[0]
+            model.coef_ = coef[:-1]
+            model.intercept_ = float(coef[-1])
+        elif isinstance(model, XGBRegressor):
+            continued = XGBRegressor(**{**model.get_params(), "n_estimators": boost_rounds})
+            continued.fit(pd.DataFrame(X, columns=self.X_columns), y, xgb_model=model.get_booster())
+            self.best_model = continued
+        elif isinstance(model, RandomForestRegressor):
+            model.set_params(warm_start=True, n_estimators=model.n_estimators + extra_trees)
+            model.fit(pd.DataFrame(X, columns=self.X_columns), y)
+        else:
+            raise TypeError(f"Incremental update is not supported for {type(model).__name__}")
+
+    def score_update(self, holdout: list[dict], previous_model) -> None:
+        """
+        Replace the cross-validated ``r2_score`` with the updated model's R² on
+        ``holdout``, and record ``previous_model``'s R² on the same rows as
+        ``baseline_r2_score``, so the registry compares like with like.
+        """
+        if len(holdout) < 2:
+            logger.warning(f"Too few held-out products ({len(holdout)}) to score the update, keeping r2={self.r2_score}")
+            self.baseline_r2_score = self.r2_score
+            return
+        X = pd.DataFrame(build_feature_matrix(holdout, self.X_columns), columns=self.X_columns)
+        y = np.array([float(record["price"]) for record in holdout])
+        self.r2_score = float(r2_score(y, self.best_model.predict(X)))
+        self.baseline_r2_score = float(r2_score(y, previous_model.predict(X)))
+        logger.info(
+            f"Updated price model scores r2={self.r2_score:.4f} on {len(holdout)} held-out products, "
+            f"previous version {self.baseline_r2_score:.4f}"
+        )
+
+    def predict_matrix(self, X: np.ndarray) -> list[float]:
+        if len(X) == 0:
+            return []
+        preds = self.best_model.predict(pd.DataFrame(X, columns=self.X_columns))
+        return [float(value) for value in preds]
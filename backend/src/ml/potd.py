@@ -1,49 +1,286 @@
+import threading
+from datetime import datetime, timezone
+from typing import Optional
+
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import f1_score
+from sklearn.model_selection import train_test_split
+
+from src.ml.potd_snapshot import ProductsOfTheDaySnapshot, top_k_indices
+
+
+ENGAGEMENT_COUNTERS = ('views', 'purchases', 'rating_sum', 'rating_count')
 
 
 class ProductsOfTheDayClassifier:
-    def __init__(self, csv_path: str):
+    """
+    Scores the catalog for "products of the day" from product attributes and
+    engagement counters.
+
+    Features, scores and encoded records are kept per product. Product writes and
+    engagement flushes only mark products dirty, and :meth:`rescore_dirty`
+    re-featurizes and re-scores just those. The label thresholds (medians of views
+    and purchases) are fixed when the model is trained; once they drift by more
+    than ``threshold_tolerance`` the model is out of date and ``needs_retrain``
+    is set so the caller can train a replacement.
+
+    When the model predicts no product of the day (e.g. a fresh deploy without
+    engagement, where f1 is 0), the snapshot falls back to the ``baseline_size``
+    products with the best average percentile of views, purchases and rating,
+    under the model version ``BASELINE_VERSION``.
+    """
+
+    BASELINE_VERSION = "baseline"
+
+    def __init__(
+        self,
+        csv_path: str,
+        engagement: Optional[list[dict]] = None,
+        threshold_tolerance: float = 0.1,
+        baseline_size: int = 100,
+    ):
         self.csv_path = csv_path
+        self.threshold_tolerance = threshold_tolerance
+        self.baseline_size = baseline_size
         self.model = RandomForestClassifier(n_estimators=100, random_state=42)
         self.features = [
             'price', 'quantity', 'is_active', 'views',
-            'purchases', 'rating', 'margin', 'description_length'
+            'purchases', 'rating', 'conversion_rate', 'description_length'
         ]
+        # Indexed by product id: raw attributes, ENGAGEMENT_COUNTERS, features, P(class 1)
+        self.products = None
+        self.counters = self._counters_frame(engagement or [])
         self.df = None
+        self.scores = None
+        self._records: dict[int, bytes] = {}
+        self.thresholds: dict[str, float] = {}
+        self.needs_retrain = False
+        self.version = None
+        self.f1_score = None
+        self.snapshot: Optional[ProductsOfTheDaySnapshot] = None
+        self._pending_products: dict[int, Optional[dict]] = {}
+        self._pending_engagement: dict[int, list] = {}
+        self._pending_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
         self._train()
+        self.refresh_snapshot()
 
-    def _load_data(self):
-        df = pd.read_csv(self.csv_path)
+    def _load_products(self) -> pd.DataFrame:
+        return pd.read_csv(self.csv_path).set_index('id', drop=False)
 
-        np.random.seed(42)
-        df['views'] = np.random.randint(100, 1000, size=len(df))
-        df['purchases'] = np.random.randint(10, 200, size=len(df))
-        df['rating'] = np.round(np.random.uniform(1.0, 5.0, size=len(df)), 1)
-        df['margin'] = np.round(np.random.uniform(0.1, 0.5, size=len(df)), 2) * df['price']
-        df['description_length'] = df['description'].apply(len)
+    @staticmethod
+    def _counters_frame(engagement: list[dict]) -> pd.DataFrame:
+        counters = pd.DataFrame(engagement, columns=['product_id', *ENGAGEMENT_COUNTERS]).astype(
+            {'product_id': 'int64', **{name: 'float64' for name in ENGAGEMENT_COUNTERS}}
+        )
+        return counters.set_index('product_id')
+
+    @staticmethod
+    def _counters_frame_from_deltas(deltas: dict[int, list]) -> pd.DataFrame:
+        return pd.DataFrame.from_dict(deltas, orient='index', columns=list(ENGAGEMENT_COUNTERS)).astype('float64')
+
+    @staticmethod
+    def _featurize(products: pd.DataFrame, counters: pd.DataFrame) -> pd.DataFrame:
+        """
+        Build the feature frame for ``products`` as a new frame. Products without
+        engagement counters get zeros.
+        """
+        df = products.join(counters, how='left')
+        df[list(ENGAGEMENT_COUNTERS)] = df[list(ENGAGEMENT_COUNTERS)].fillna(0)
+        df['description_length'] = df['description'].fillna('').str.len()
         df['is_active'] = df['is_active'].astype(int)
+        df['rating'] = np.round(df['rating_sum'] / df['rating_count'].where(df['rating_count'] > 0), 2).fillna(0.0)
+        df['conversion_rate'] = (df['purchases'] / df['views'].where(df['views'] > 0)).fillna(0.0)
+        return df.drop(columns=['rating_sum', 'rating_count'])
 
-        df['product_of_the_day'] = (
-            (df['views'] > df['views'].median()) &
-            (df['purchases'] > df['purchases'].median()) &
-            (df['rating'] > 4.0) &
-            (df['margin'] > df['margin'].median())
-        ).astype(int)
+    @staticmethod
+    def _medians(df: pd.DataFrame) -> dict[str, float]:
+        return {'views': float(df['views'].median()), 'purchases': float(df['purchases'].median())}
 
-        return df
+    def _label(self, df: pd.DataFrame) -> pd.Series:
+        return (
+            (df['views'] > self.thresholds['views']) &
+            (df['purchases'] > self.thresholds['purchases']) &
+            (df['rating'] > 4.0)
+        ).astype(int)
 
     def _train(self):
-        df = self._load_data()
+        products = self._load_products()
+        df = self._featurize(products, self.counters)
+        self.thresholds = self._medians(df)
+        df['product_of_the_day'] = self._label(df)
         X = df[self.features]
         y = df['product_of_the_day']
 
-        self.model.fit(X, y)
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        self.model.fit(X_train, y_train)
+        self.f1_score = float(f1_score(y_test, self.model.predict(X_test), zero_division=0))
+        self.products = products
         self.df = df
+        self.version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+
+    def _score(self, df: pd.DataFrame) -> pd.Series:
+        classes = list(self.model.classes_)
+        if len(df) == 0 or 1 not in classes:
+            return pd.Series(0.0, index=df.index)
+        return pd.Series(self.model.predict_proba(df[self.features])[:, classes.index(1)], index=df.index)
+
+    @staticmethod
+    def _encode_records(df: pd.DataFrame, scores: pd.Series, prediction: int) -> dict[int, bytes]:
+        # assign() works on a copy, so the feature frame is never mutated
+        products = df.assign(prediction=prediction, score=scores)
+        lines = (line for line in products.to_json(orient="records", lines=True).splitlines() if line)
+        return {int(product_id): line.encode("utf-8") for product_id, line in zip(products.index, lines)}
+
+    @classmethod
+    def _encode(cls, df: pd.DataFrame, scores: pd.Series) -> dict[int, bytes]:
+        """
+        Pre-encode the JSON records of the products scored as products of the day.
+        """
+        # Same decision as predict(): class 1 wins only with a strict majority
+        candidates = scores > 0.5
+        return cls._encode_records(df[candidates], scores[candidates], prediction=1)
+
+    def _build_snapshot(self) -> ProductsOfTheDaySnapshot:
+        candidates = self.scores[self.scores > 0.5]
+        if len(candidates) == 0:
+            return self._build_baseline_snapshot()
+        ids = candidates.index.to_numpy()
+        return ProductsOfTheDaySnapshot(
+            datetime.now(timezone.utc).date(),
+            self.version,
+            candidates.to_numpy(),
+            ids,
+            [self._records[int(product_id)] for product_id in ids],
+        )
+
+    def _build_baseline_snapshot(self) -> ProductsOfTheDaySnapshot:
+        """
+        Rank the catalog without the model, by the mean percentile rank of the
+        signals the label is built from.
+        """
+        scores = self.df[['views', 'purchases', 'rating']].rank(pct=True).mean(axis=1)
+        ids = scores.index.to_numpy()
+        selected = top_k_indices(scores.to_numpy(), ids, self.baseline_size)
+        top = scores.iloc[selected]
+        records = self._encode_records(self.df.loc[top.index], top, prediction=0)
+        return ProductsOfTheDaySnapshot(
+            datetime.now(timezone.utc).date(),
+            self.BASELINE_VERSION,
+            top.to_numpy(),
+            ids[selected],
+            [records[int(product_id)] for product_id in ids[selected]],
+        )
+
+    def mark_product_saved(self, product: dict) -> None:
+        with self._pending_lock:
+            self._pending_products[product['id']] = product
+
+    def mark_product_deleted(self, product_id: int) -> None:
+        with self._pending_lock:
+            self._pending_products[product_id] = None
+
+    def apply_engagement(self, deltas: dict[int, list]) -> None:
+        """
+        Queue counter deltas, in ``ENGAGEMENT_COUNTERS`` order, for the next rescore.
+        """
+        with self._pending_lock:
+            for product_id, delta in deltas.items():
+                pending = self._pending_engagement.get(product_id)
+                if pending is None:
+                    self._pending_engagement[product_id] = list(delta)
+                else:
+                    for slot, value in enumerate(delta):
+                        pending[slot] += value
+
+    @property
+    def has_pending_changes(self) -> bool:
+        return bool(self._pending_products or self._pending_engagement)
+
+    def take_pending_engagement(self) -> dict[int, list]:
+        """
+        Remove and return the queued counter deltas, e.g. before reading counters that include them.
+        """
+        with self._pending_lock:
+            engagement, self._pending_engagement = self._pending_engagement, {}
+        return engagement
+
+    def _take_pending(self) -> tuple[dict[int, Optional[dict]], dict[int, list]]:
+        with self._pending_lock:
+            products, self._pending_products = self._pending_products, {}
+            engagement, self._pending_engagement = self._pending_engagement, {}
+        return products, engagement
+
+    def _apply_products(self, products: pd.DataFrame, changes: dict[int, Optional[dict]]) -> pd.DataFrame:
+        products = products.drop(index=list(changes), errors='ignore')
+        saved = [product for product in changes.values() if product is not None]
+        if saved:
+            rows = pd.DataFrame(saved).set_index('id', drop=False).reindex(columns=products.columns)
+            products = pd.concat([products, rows])
+        return products
+
+    def refresh_snapshot(self, engagement: Optional[list[dict]] = None) -> ProductsOfTheDaySnapshot:
+        """
+        Re-featurize and re-score the whole catalog, replacing the engagement
+        counters with ``engagement`` if given, and rebuild the snapshot.
+
+        Queued deltas are added on top of ``engagement``, so the caller must take
+        the ones it already includes with ``take_pending_engagement`` before reading it.
+        """
+        with self._refresh_lock:
+            changes, deltas = self._take_pending()
+            self.products = self._apply_products(self.products, changes)
+            if engagement is not None:
+                self.counters = self._counters_frame(engagement)
+            if deltas:
+                self.counters = self.counters.add(self._counters_frame_from_deltas(deltas), fill_value=0)
+
+            df = self._featurize(self.products, self.counters)
+            df['product_of_the_day'] = self._label(df)
+            self.df = df
+            self.scores = self._score(df)
+            self._records = self._encode(df, self.scores)
+            self.needs_retrain = self._thresholds_shifted(self._medians(df))
+            self.snapshot = self._build_snapshot()
+            return self.snapshot
+
+    def _thresholds_shifted(self, medians: dict[str, float]) -> bool:
+        return any(
+            abs(medians[name] - threshold) > self.threshold_tolerance * max(abs(threshold), 1.0)
+            for name, threshold in self.thresholds.items()
+        )
+
+    def rescore_dirty(self) -> Optional[ProductsOfTheDaySnapshot]:
+        """
+        Re-featurize and re-score only the products written or engaged with since
+        the last refresh, and rebuild the snapshot. Returns ``None`` if nothing changed.
+        """
+        with self._refresh_lock:
+            changes, deltas = self._take_pending()
+            dirty = set(changes) | set(deltas)
+            if not dirty:
+                return None
+
+            products = self._apply_products(self.products, changes)
+            counters = self.counters
+            if deltas:
+                counters = counters.add(self._counters_frame_from_deltas(deltas), fill_value=0)
+
+            changed = [product_id for product_id in dirty if product_id in products.index]
+            features = self._featurize(products.loc[changed], counters)
+            features['product_of_the_day'] = self._label(features)
+            scores = self._score(features)
+
+            records = {product_id: record for product_id, record in self._records.items() if product_id not in dirty}
+            records.update(self._encode(features, scores))
 
-    def get_products_of_the_day(self):
-        X_all = self.df[self.features]
-        self.df['prediction'] = self.model.predict(X_all)
-        top_products = self.df[self.df['prediction'] == 1]
-        return top_products.to_dict(orient="records")
+            self.products = products
+            self.counters = counters
+            self.df = pd.concat([self.df.drop(index=list(dirty), errors='ignore'), features])
+            self.scores = pd.concat([self.scores.drop(index=list(dirty), errors='ignore'), scores])
+            self._records = records
+            self.needs_retrain = self._thresholds_shifted(self._medians(self.df))
+            self.snapshot = self._build_snapshot()
+            return self.snapshot
@@ -0,0 +1,85 @@
+"""
+Pre-scored products of the day pages.
+
+Only needs NumPy, so routes serving snapshots can be imported without the
+pandas/scikit-learn stack the classifier in ``src.ml.potd`` trains with.
+"""
+from datetime import date, datetime, timezone
+from typing import Optional
+
+import numpy as np
+
+from src.utils.cursor import decode_cursor, encode_cursor
+
+
+def top_k_indices(scores: np.ndarray, ids: np.ndarray, k: int) -> np.ndarray:
+    """
+    Return the positions of the ``k`` highest scores, ordered by score descending
+    then id ascending, using a partial selection instead of sorting everything.
+    """
+    if k <= 0 or len(scores) == 0:
+        return np.empty(0, dtype=np.intp)
+    if len(scores) <= k:
+        selected = np.arange(len(scores))
+    else:
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > kth)
+        # Resolve ties on the boundary score by id so pages never overlap or skip
+        ties = np.flatnonzero(scores == kth)
+        ties = ties[np.argsort(ids[ties], kind="stable")][:k - len(above)]
+        selected = np.concatenate([above, ties])
+    return selected[np.lexsort((ids[selected], -scores[selected]))]
+
+
+class ProductsOfTheDaySnapshot:
+    """
+    One day's products of the day, scored and encoded once.
+
+    Holds the ``predict_proba`` score, id and pre-encoded JSON record of every
+    product predicted as a product of the day, so a page is a partial selection
+    over two arrays plus a byte join. Snapshots are never modified after
+    construction; a refresh builds a new one and replaces the classifier's
+    reference to it.
+    """
+
+    __slots__ = ("day", "model_version", "generated_at", "count", "scores", "ids", "records")
+
+    def __init__(
+        self,
+        day: date,
+        model_version: Optional[str],
+        scores: np.ndarray,
+        ids: np.ndarray,
+        records: list[bytes],
+    ):
+        self.day = day
+        self.model_version = model_version
+        self.generated_at = datetime.now(timezone.utc)
+        self.count = len(records)
+        self.scores = scores
+        self.ids = ids
+        self.records = records
+
+    def page(self, k: int, cursor: Optional[str] = None) -> bytes:
+        """
+        Return the JSON body for the ``k`` best products after ``cursor``.
+
+        The cursor is the (score, id) of the last product on the previous page,
+        so paging stays consistent even if the snapshot is refreshed in between.
+        """
+        positions = np.arange(self.count)
+        if cursor is not None:
+            score, product_id = decode_cursor(cursor, 2)
+            if not all(isinstance(value, (int, float)) for value in (score, product_id)):
+                raise ValueError("Invalid cursor")
+            positions = np.flatnonzero(
+                (self.scores < score) | ((self.scores == score) & (self.ids > product_id))
+            )
+        selected = positions[top_k_indices(self.scores[positions], self.ids[positions], k)]
+
+        next_cursor = b"null"
+        if len(selected) and len(positions) > len(selected):
+            last = selected[-1]
+            next_cursor = b'"%s"' % encode_cursor([float(self.scores[last]), int(self.ids[last])]).encode("ascii")
+        products = b",".join(self.records[position] for position in selected)
+        return b'{"count":%d,"next_cursor":%s,"products":[%s]}' % (self.count, next_cursor, products)
@@ -0,0 +1,180 @@
+import csv
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Iterator, Optional
+
+import numpy as np
+
+from src.core.logger import get_logger
+from src.ml.cache import PredictionCache
+from src.ml.feature_store import EXCLUDED_FIELDS, FeatureStore
+from src.ml.features import build_feature_matrix
+
+
+logger = get_logger(__name__)
+
+
+# Typed columns of the product CSV; everything else stays a string
+CSV_FIELD_TYPES = {
+    "id": int,
+    "price": float,
+    "quantity": int,
+    "is_active": lambda value: value.strip().lower() == "true",
+}
+
+
+def read_product_csv(csv_path: str) -> Iterator[dict[str, Any]]:
+    """
+    Yield product rows from the training CSV without the heavy columns.
+    """
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            yield {
+                key: CSV_FIELD_TYPES[key](value) if key in CSV_FIELD_TYPES and value != "" else value
+                for key, value in row.items() if key not in EXCLUDED_FIELDS
+            }
+
+
+class BasePricePredictor(ABC):
+    """
+    Serving side of the price model: feature store, prediction cache and the
+    single/batch prediction paths. Only depends on NumPy; subclasses provide
+    :meth:`predict_matrix` and set ``X_columns`` and ``version``.
+    """
+
+    ARTIFACT_NAME = "price"
+
+    def __init__(self, csv_path: str):
+        self.csv_path = csv_path
+        self.best_model_name = None
+        self.r2_score = None
+        # Score of the version this one was updated from, on the same holdout
+        self.baseline_r2_score = None
+        self.X_columns = None
+        self.version = None
+        self.high_water_mark = None
+        self.feature_store = None
+        self.cache: Optional[PredictionCache] = None
+        self._source_mtime = None
+
+    def _init_feature_store(self) -> None:
+        self.feature_store = FeatureStore(self.X_columns)
+        self.refresh_features()
+
+    @abstractmethod
+    def predict_matrix(self, X: np.ndarray) -> list[float]:
+        """
+        Predict the price of every row of the feature matrix ``X``.
+        """
+
+    def refresh_features(self, products: Optional[Iterable[dict[str, Any]]] = None) -> None:
+        """
+        Rebuild the feature store from ``products``, rows of the product table, or
+        without them from the training CSV. Only a CSV-backed store is reloaded
+        when the file changes; one built from the table is kept up to date by
+        :meth:`upsert_product` and :meth:`remove_product`.
+        """
+        if products is None:
+            mtime = os.stat(self.csv_path).st_mtime
+            self.feature_store.load(read_product_csv(self.csv_path))
+            source = self.csv_path
+        else:
+            mtime = None
+            self.feature_store.load(products)
+            source = "the product table"
+        self._source_mtime = mtime
+        logger.info(f"Loaded {len(self.feature_store)} products from {source} into the price feature store")
+
+    def _ensure_fresh_features(self) -> None:
+        if self._source_mtime is not None and os.stat(self.csv_path).st_mtime != self._source_mtime:
+            self.refresh_features()
+
+    def get_product_by_id(self, product_id: int) -> dict:
+        self._ensure_fresh_features()
+        if product_id not in self.feature_store:
+            raise ValueError(f"Product with ID {product_id} not found")
+        return self.feature_store.get_record(product_id)
+
+    def upsert_product(self, product: dict) -> None:
+        """
+        Apply a created or updated product to the feature store and drop its cached prices.
+        """
+        self.feature_store.upsert(product)
+        if self.cache is not None:
+            self.cache.invalidate_product(int(product["id"]))
+
+    def remove_product(self, product_id: int) -> None:
+        self.feature_store.remove(product_id)
+        if self.cache is not None:
+            self.cache.invalidate_product(product_id)
+
+    def cached_predictions(self, X: np.ndarray) -> tuple[list[Optional[float]], list[int]]:
+        """
+        Look up every row of ``X`` in the prediction cache. Returns the cached
+        prices, with ``None`` for misses, and the indices of the missed rows.
+        """
+        if self.cache is None:
+            return [None] * len(X), list(range(len(X)))
+        preds = [self.cache.get(PredictionCache.key(self.version, row)) for row in X]
+        return preds, [row for row, value in enumerate(preds) if value is None]
+
+    def fill_predictions(
+        self,
+        X: np.ndarray,
+        preds: list[Optional[float]],
+        misses: list[int],
+        values: list[float],
+        product_ids: list[Optional[int]],
+    ) -> list[float]:
+        """
+        Put the model outputs ``values`` of the ``misses`` rows into ``preds`` and the cache.
+        """
+        for row, value in zip(misses, values):
+            preds[row] = value
+            if self.cache is not None:
+                self.cache.put(PredictionCache.key(self.version, X[row]), value, product_id=product_ids[row])
+        return preds
+
+    def _predict_cached(self, X: np.ndarray, product_ids: list[Optional[int]]) -> list[float]:
+        """
+        Predict every row of ``X``, serving rows seen before from the cache and
+        sending only the misses to the model in one call.
+        """
+        preds, misses = self.cached_predictions(X)
+        values = self.predict_matrix(X[misses]) if misses else []
+        return self.fill_predictions(X, preds, misses, values, product_ids)
+
+    def recommend_price_by_id(self, product_id: int) -> float:
+        self._ensure_fresh_features()
+        if product_id not in self.feature_store:
+            raise ValueError(f"Product with ID {product_id} not found")
+        return self._predict_cached(self.feature_store.get_features(product_id)[np.newaxis, :], [product_id])[0]
+
+    def recommend_price(self, sample: dict) -> float:
+        return self.recommend_prices([sample])[0]
+
+    def recommend_prices(self, samples: list[dict]) -> list[float]:
+        """
+        Predict prices for many products with one feature build and one model call.
+        """
+        return self._predict_cached(build_feature_matrix(samples, self.X_columns), [None] * len(samples))
+
+    def recommend_prices_mixed(self, product_ids: list[int], samples: list[dict]) -> tuple[dict[int, float], list[float]]:
+        """
+        Price stored products by ID and raw samples together in a single model call.
+
+        Returns a mapping for the IDs that were found and the prices of the samples
+        in order.
+        """
+        found, X = self.features_mixed(product_ids, samples)
+        preds = self._predict_cached(X, found + [None] * len(samples))
+        return dict(zip(found, preds[:len(found)])), preds[len(found):]
+
+    def features_mixed(self, product_ids: list[int], samples: list[dict]) -> tuple[list[int], np.ndarray]:
+        """
+        Feature rows of the stored products among ``product_ids`` followed by those
+        of ``samples``, and the IDs that were found.
+        """
+        self._ensure_fresh_features()
+        stored, found = self.feature_store.take(product_ids)
+        return found, np.vstack([stored, build_feature_matrix(samples, self.X_columns)])
@@ -0,0 +1,96 @@
+"""
+Price model inference in process-pool workers.
+
+Predictors hold locks, the feature store and the prediction cache, none of
+which can be pickled or kept in sync across processes. Workers therefore never
+receive one: each loads the latest model version once when it starts (later
+versions on first use) and is sent feature matrices only, while the serving
+process keeps the feature store and the cache.
+"""
+import asyncio
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from src.core.config import get_backend_config
+from src.core.logger import get_logger
+from src.ml.artifacts import ModelArtifactStore
+from src.ml.executor import InferenceExecutor
+from src.ml.price_base import BasePricePredictor
+
+
+logger = get_logger(__name__)
+
+# Per worker process: model versions loaded so far, oldest first
+_models: "OrderedDict[str, BasePricePredictor]" = OrderedDict()
+
+
+def _load_model(version: str) -> BasePricePredictor:
+    config = get_backend_config()
+    artifact_store = ModelArtifactStore(config.ML_ARTIFACTS_DIR)
+    if config.ML_PRICE_SERVING_FORMAT == "compiled":
+        from src.ml.compiled import CompiledPricePredictor
+        return CompiledPricePredictor(config.ML_TRAIN_DATA, artifact_store, version, features=False)
+
+    # Imported lazily: pulls in pandas, scikit-learn and xgboost
+    from src.ml.optimalprice import PricePredictor
+    return PricePredictor(config.ML_TRAIN_DATA, artifact_store, version, features=False)
+
+
+def _model(version: str) -> BasePricePredictor:
+    model = _models.get(version)
+    if model is None:
+        model = _models[version] = _load_model(version)
+        while len(_models) > get_backend_config().ML_REGISTRY_KEEP_VERSIONS:
+            _models.popitem(last=False)
+    return model
+
+
+def init_worker() -> None:
+    """
+    Process pool initializer: load the latest price model once, before the first task.
+    """
+    config = get_backend_config()
+    version = ModelArtifactStore(config.ML_ARTIFACTS_DIR).latest_version(BasePricePredictor.ARTIFACT_NAME)
+    if version is None:
+        return
+    try:
+        _model(version)
+    except Exception as e:
+        # A failing initializer breaks the whole pool; the first task retries the load
+        logger.error(f"Inference worker could not load price model {version}: {e}")
+
+
+def predict_matrix(version: str, X: np.ndarray) -> list[float]:
+    """
+    Predict every row of ``X`` with model ``version``; versions newer than the
+    worker are loaded on first use.
+    """
+    return _model(version).predict_matrix(X)
+
+
+async def recommend_prices_mixed(
+    executor: InferenceExecutor,
+    predictor: BasePricePredictor,
+    product_ids: list[int],
+    samples: list[dict],
+) -> tuple[dict[int, float], list[Optional[float]]]:
+    """
+    Run ``predictor.recommend_prices_mixed`` on ``executor``.
+
+    On a process pool only the model call leaves this process: features and
+    cached prices are looked up in a thread here, and the workers get the rows
+    that missed the cache.
+    """
+    if executor.kind != "process":
+        return await executor.run(predictor.recommend_prices_mixed, product_ids, samples)
+
+    def lookup() -> tuple[list[int], np.ndarray, list[Optional[float]], list[int]]:
+        found, X = predictor.features_mixed(product_ids, samples)
+        return (found, X, *predictor.cached_predictions(X))
+
+    found, X, preds, misses = await asyncio.to_thread(lookup)
+    values = await executor.run(predict_matrix, predictor.version, X[misses]) if misses else []
+    preds = predictor.fill_predictions(X, preds, misses, values, found + [None] * len(samples))
+    return dict(zip(found, preds[:len(found)])), preds[len(found):]
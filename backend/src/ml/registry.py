@@ -0,0 +1,153 @@
+import asyncio
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from src.core.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class ModelRegistry:
+    """
+    Holds the live version of a model and a few previous ones for rollback.
+
+    Requests read :meth:`current` once and keep that reference, so swapping in a
+    new version is a single attribute assignment and in-flight requests finish on
+    the model they started with. Training runs as a background task and a
+    candidate only goes live if its score is not worse than the current one, or
+    than the ``baseline`` the candidate reports for it when both were scored on
+    the same data; ``trainer`` returns ``None`` when there is nothing new to train on.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        trainer: Callable[[], Awaitable[Optional[Any]]],
+        score: Callable[[Any], float],
+        loader: Optional[Callable[[Optional[str]], Awaitable[Any]]] = None,
+        keep_versions: int = 3,
+        tolerance: float = 0.0,
+        baseline: Optional[Callable[[Any], Optional[float]]] = None,
+    ):
+        self.name = name
+        self.trainer = trainer
+        self.loader = loader
+        self.score = score
+        self.keep_versions = keep_versions
+        self.tolerance = tolerance
+        self.baseline = baseline
+        self._current = None
+        self._versions: OrderedDict[str, Any] = OrderedDict()
+        self._swap_listeners: list[Callable[[Any], None]] = []
+        self._training_task: Optional[asyncio.Task] = None
+        self.last_training: dict[str, Any] = {}
+
+    def current(self) -> Any:
+        return self._current
+
+    def models(self) -> list[Any]:
+        """
+        Return every retained version, live one included.
+        """
+        return list(self._versions.values())
+
+    def on_swap(self, listener: Callable[[Any], None]) -> Callable[[Any], None]:
+        """
+        Register a callback invoked with the new model whenever the live version changes.
+        """
+        self._swap_listeners.append(listener)
+        return listener
+
+    def _activate(self, model: Any) -> None:
+        self._versions[model.version] = model
+        self._versions.move_to_end(model.version)
+        while len(self._versions) > self.keep_versions:
+            self._versions.popitem(last=False)
+        self._current = model
+        for listener in self._swap_listeners:
+            listener(model)
+        logger.info(f"{self.name} model version {model.version} is live")
+
+    def promote(self, candidate: Any, validate: bool = True) -> bool:
+        """
+        Make ``candidate`` the live version unless it scores worse than the current one.
+        """
+        if validate and self._current is not None:
+            baseline = self.baseline(candidate) if self.baseline is not None else None
+            current_score = baseline if baseline is not None else self.score(self._current)
+            candidate_score = self.score(candidate)
+            if candidate_score < current_score - self.tolerance:
+                logger.warning(
+                    f"Rejected {self.name} version {candidate.version}: "
+                    f"score {candidate_score:.4f} < current {current_score:.4f}"
+                )
+                return False
+        self._activate(candidate)
+        return True
+
+    async def load(self, version: Optional[str] = None) -> Any:
+        """
+        Load a stored version (the latest by default) and make it live without validation.
+        """
+        if self.loader is None:
+            raise ValueError(f"{self.name} models cannot be loaded from storage")
+        model = await self.loader(version)
+        self._activate(model)
+        return model
+
+    async def rollback(self, version: str) -> Any:
+        """
+        Switch back to a previous version, kept in memory or loaded from storage.
+        """
+        if version in self._versions:
+            self._activate(self._versions[version])
+            return self._current
+        return await self.load(version)
+
+    @property
+    def is_training(self) -> bool:
+        return self._training_task is not None and not self._training_task.done()
+
+    def retrain_in_background(self) -> bool:
+        """
+        Start training a new version unless one is already in progress.
+        """
+        if self.is_training:
+            return False
+        self._training_task = asyncio.create_task(self._retrain())
+        return True
+
+    async def _retrain(self) -> None:
+        started = datetime.now(timezone.utc)
+        self.last_training = {"started_at": started.isoformat(), "status": "running"}
+        try:
+            candidate = await self.trainer()
+            if candidate is None:
+                self.last_training.update(status="unchanged")
+                return
+            promoted = self.promote(candidate)
+            self.last_training.update(
+                status="promoted" if promoted else "rejected",
+                version=candidate.version,
+                score=self.score(candidate),
+            )
+        except Exception as e:
+            logger.error(f"Background training of {self.name} model failed: {e}")
+            self.last_training.update(status="failed", error=str(e))
+        finally:
+            self.last_training["duration_s"] = round((datetime.now(timezone.utc) - started).total_seconds(), 3)
+
+    def info(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "current_version": self._current.version if self._current is not None else None,
+            "current_score": self.score(self._current) if self._current is not None else None,
+            "versions": [
+                {"version": version, "score": self.score(model)}
+                for version, model in self._versions.items()
+            ],
+            "is_training": self.is_training,
+            "last_training": self.last_training,
+        }
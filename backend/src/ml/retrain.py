@@ -0,0 +1,99 @@
+"""
+Incrementally update the price model with products added since the last run.
+
+Usage (from the backend directory)::
+
+    python -m src.ml.retrain [--chunk-size N] [--artifacts-dir DIR]
+"""
+import argparse
+import asyncio
+import copy
+from datetime import datetime
+from typing import Optional
+
+from src.core.config import get_backend_config
+from src.core.db.database import SessionLocal
+from src.core.logger import get_logger
+from src.ml.artifacts import ModelArtifactStore
+from src.ml.feature_store import EXCLUDED_FIELDS
+from src.ml.optimalprice import PricePredictor
+from src.repositories import ProductRepository
+
+
+logger = get_logger(__name__)
+config = get_backend_config()
+
+
+async def update_from_database(
+    predictor: PricePredictor,
+    chunk_size: int = config.ML_RETRAIN_CHUNK_SIZE,
+    boost_rounds: int = config.ML_INCREMENTAL_BOOST_ROUNDS,
+    extra_trees: int = config.ML_INCREMENTAL_TREES,
+    holdout_every: int = config.ML_RETRAIN_HOLDOUT_EVERY,
+) -> int:
+    """
+    Stream products past the predictor's high-water mark from Postgres and fold
+    them into the model chunk by chunk, holding every ``holdout_every``-th one
+    back to score the updated model against the one it started from. Returns
+    the number of new products.
+    """
+    repository = ProductRepository()
+    columns = [column.name for column in repository.model.__table__.columns if column.name not in EXCLUDED_FIELDS]
+    high_water_mark = predictor.high_water_mark or {}
+    created_at = high_water_mark.get("created_at")
+
+    previous_model = copy.deepcopy(predictor.best_model)
+    holdout: list[dict] = []
+    rows = 0
+    async with SessionLocal() as db:
+        async for chunk in repository.stream_after(
+            db,
+            created_at=datetime.fromisoformat(created_at) if created_at else None,
+            id=high_water_mark.get("id"),
+            chunk_size=chunk_size,
+            columns=columns,
+        ):
+            fitted, held = await asyncio.to_thread(
+                predictor.partial_fit,
+                chunk,
+                boost_rounds=boost_rounds,
+                extra_trees=extra_trees,
+                holdout_every=holdout_every,
+            )
+            rows += fitted + len(held)
+            holdout += held
+            logger.info(f"Applied {rows} new products, high-water mark {predictor.high_water_mark}")
+    if rows:
+        await asyncio.to_thread(predictor.score_update, holdout, previous_model)
+    return rows
+
+
+async def retrain(
+    artifacts_dir: str, data: str, chunk_size: int, set_latest: bool = True
+) -> Optional[PricePredictor]:
+    """
+    Load the latest artifact, fold in the products added past its high-water mark
+    and save the result as a new version. Returns ``None`` if nothing was added.
+    """
+    store = ModelArtifactStore(artifacts_dir)
+    predictor = await asyncio.to_thread(PricePredictor, data, artifact_store=store)
+    rows = await update_from_database(predictor, chunk_size=chunk_size)
+    if not rows:
+        logger.info("No new products since the last training run")
+        return None
+    await asyncio.to_thread(predictor.save, store, set_latest)
+    return predictor
+
+
+def main(argv: list[str] | None = None) -> Optional[str]:
+    parser = argparse.ArgumentParser(description="Incrementally retrain the price model from the product table.")
+    parser.add_argument("--data", default=config.ML_TRAIN_DATA, help="Training CSV path used as the feature source")
+    parser.add_argument("--artifacts-dir", default=config.ML_ARTIFACTS_DIR, help="Artifact store root")
+    parser.add_argument("--chunk-size", type=int, default=config.ML_RETRAIN_CHUNK_SIZE, help="Rows per fetched chunk")
+    args = parser.parse_args(argv)
+    predictor = asyncio.run(retrain(args.artifacts_dir, args.data, args.chunk_size))
+    return predictor.version if predictor is not None else None
+
+
+if __name__ == "__main__":
+    main()
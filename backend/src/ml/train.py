@@ -0,0 +1,37 @@
+"""
+Train the price model and write it to the artifact store.
+
+Usage (from the backend directory)::
+
+    python -m src.ml.train [--data PATH] [--artifacts-dir DIR]
+"""
+import argparse
+
+from src.core.config import get_backend_config
+from src.core.logger import get_logger
+from src.ml.artifacts import ModelArtifactStore
+from src.ml.optimalprice import PricePredictor
+
+
+logger = get_logger(__name__)
+
+
+def main(argv: list[str] | None = None) -> str:
+    config = get_backend_config()
+    parser = argparse.ArgumentParser(description="Train and persist the price model.")
+    parser.add_argument("--data", default=config.ML_TRAIN_DATA, help="Training CSV path")
+    parser.add_argument("--artifacts-dir", default=config.ML_ARTIFACTS_DIR, help="Artifact store root")
+    parser.add_argument("--folds", type=int, default=config.ML_CV_FOLDS, help="Cross-validation folds")
+    parser.add_argument("--time-budget", type=float, default=config.ML_TRAIN_TIME_BUDGET,
+                        help="Seconds after which model selection stops waiting for fits (soft)")
+    parser.add_argument("--jobs", type=int, default=config.ML_TRAIN_JOBS, help="Parallel fits (default: all cores)")
+    args = parser.parse_args(argv)
+
+    predictor = PricePredictor(args.data, cv_folds=args.folds, time_budget=args.time_budget, n_jobs=args.jobs)
+    version = predictor.save(ModelArtifactStore(args.artifacts_dir))
+    logger.info(f"Price model {predictor.best_model_name} saved as version {version}")
+    return version
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,4 @@
 from .user import UserRepository  # noqa: F401
 from .product import ProductRepository  # noqa: F401
+from .engagement import EngagementRepository  # noqa: F401
+from .analytics import PriceAnalyticsRepository  # noqa: F401
@@ -0,0 +1,117 @@
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import Float, Integer, case, cast, func, literal, select, text, true
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import ARRAY, array
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.db.models import ProductTable
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+PERCENTILES = (0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+SUMMARY_VIEW = "product_price_summary"
+HISTOGRAM_VIEW = "product_price_histogram"
+
+
+class PriceAnalyticsRepository:
+    """
+    Price statistics of the catalog computed in SQL, live or from materialized views.
+
+    The views hold the result of the same queries as the live path, one row per
+    segment and one per (active, bucket), and carry unique indexes so they can be
+    refreshed concurrently without blocking readers.
+    """
+
+    def __init__(self):
+        self.table = ProductTable.__table__
+
+    def summary_query(self):
+        """
+        Count, mean, spread and percentiles of the price per segment: ``active``,
+        ``inactive`` and ``all`` (the ROLLUP total). Products without an
+        ``is_active`` flag count as active, like the column default.
+        """
+        price = self.table.c.price
+        active = self.table.c.is_active.is_not(False)
+        return select(
+            case((func.grouping(active) == 1, "all"), (active, "active"), else_="inactive").label("segment"),
+            func.count().label("count"),
+            func.avg(price).label("mean"),
+            func.stddev_samp(price).label("stddev"),
+            func.min(price).label("min"),
+            func.max(price).label("max"),
+            func.percentile_cont(cast(array(PERCENTILES), ARRAY(Float))).within_group(price).label("percentiles"),
+            func.now().label("computed_at"),
+        ).group_by(func.rollup(active))
+
+    def histogram_query(self, buckets: int):
+        """
+        Number of priced products per active flag in each of ``buckets`` equal-width
+        buckets (numbered from 1) between the lowest and the highest price.
+        """
+        price = self.table.c.price
+        bounds = select(func.min(price).label("low"), func.max(price).label("high")).cte("bounds")
+        # The highest price is the upper edge, which width_bucket puts past the last bucket
+        width_bucket = func.least(func.width_bucket(price, bounds.c.low, bounds.c.high, buckets), buckets)
+        priced = (
+            select(
+                self.table.c.is_active.is_not(False).label("active"),
+                case((bounds.c.high > bounds.c.low, width_bucket), else_=literal(1)).label("bucket"),
+            )
+            .select_from(self.table.join(bounds, true()))
+            .where(price.is_not(None))
+            .subquery("priced")
+        )
+        # Grouped outside so the bound bucket count does not make GROUP BY differ from the select list
+        return select(
+            priced.c.active, cast(priced.c.bucket, Integer).label("bucket"), func.count().label("count")
+        ).group_by(priced.c.active, priced.c.bucket)
+
+    async def get_stats(self, db: AsyncSession, buckets: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Compute the summary and histogram rows from the product table. They only
+        agree on the price range when ``db`` reads both from one snapshot
+        (REPEATABLE READ).
+        """
+        logger.debug(f"Computing price statistics with {buckets} buckets")
+        summary = await db.execute(self.summary_query())
+        histogram = await db.execute(self.histogram_query(buckets))
+        return [dict(row) for row in summary.mappings()], [dict(row) for row in histogram.mappings()]
+
+    async def get_materialized_stats(self, db: AsyncSession) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Read the summary and histogram rows of the last refresh of the views; like
+        ``get_stats``, both come from the same refresh only under REPEATABLE READ.
+        """
+        summary = await db.execute(text(f"SELECT * FROM {SUMMARY_VIEW}"))
+        histogram = await db.execute(text(f"SELECT * FROM {HISTOGRAM_VIEW}"))
+        return [dict(row) for row in summary.mappings()], [dict(row) for row in histogram.mappings()]
+
+    @staticmethod
+    def _view_sql(query) -> str:
+        return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+    async def create_views(self, db: AsyncSession, buckets: int) -> None:
+        """
+        (Re)create and populate the views, so they always match the current queries and bucket count.
+        """
+        logger.debug(f"Creating price statistics views with {buckets} buckets")
+        for name, query, key in (
+            (SUMMARY_VIEW, self.summary_query(), "segment"),
+            (HISTOGRAM_VIEW, self.histogram_query(buckets), "active, bucket"),
+        ):
+            await db.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS {name}"))
+            await db.execute(text(f"CREATE MATERIALIZED VIEW {name} AS {self._view_sql(query)}"))
+            # REFRESH ... CONCURRENTLY requires a unique index
+            await db.execute(text(f"CREATE UNIQUE INDEX ix_{name} ON {name} ({key})"))
+
+    async def refresh_views(self, db: AsyncSession) -> None:
+        """
+        Refresh both views without locking out readers. Both are committed
+        together, so a reader holding one snapshot sees them from the same refresh.
+        """
+        for name in (SUMMARY_VIEW, HISTOGRAM_VIEW):
+            await db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {name}"))
@@ -1,12 +1,16 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 
 from fastapi import HTTPException
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import DateTime, Integer, any_, bindparam, column, delete, insert, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from src.core.db.database import Base
 from src.core.logger import get_logger
+from src.utils.cursor import decode_cursor, encode_cursor
 
 logger = get_logger(__name__)
 
@@ -16,12 +20,63 @@ UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
 class RepositoryBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    # Unique sort key used for keyset pagination; needs a matching index
+    cursor_columns: Sequence[str] = ("id",)
+    # Columns pages can also be sorted by, with ``id`` as the tiebreaker; each
+    # needs an index on (column, id)
+    sort_fields: Sequence[str] = ()
+    # Large columns left out of list reads unless explicitly requested
+    heavy_fields: Sequence[str] = ()
+    # Timestamp column bumped on every write, used to validate clients' cached copies
+    version_column: Optional[str] = None
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
-    async def get(self, db: AsyncSession, id: int) -> Optional[ModelType]:
+    def resolve_fields(self, fields: Optional[Sequence[str]] = None, include_heavy: bool = True) -> List[str]:
+        """
+        Validate requested column names and return them in table order, always with ``id``.
+
+        Without ``fields`` every column is returned, minus ``heavy_fields`` unless
+        ``include_heavy`` is set.
+        """
+        columns = self.model.__table__.columns.keys()
+        if fields is None:
+            requested = {name for name in columns if include_heavy or name not in self.heavy_fields}
+        else:
+            unknown = sorted(set(fields) - set(columns))
+            if unknown:
+                raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+            requested = set(fields)
+        requested.add("id")
+        return [name for name in columns if name in requested]
+
+    def _load_only(self, query, fields: Optional[Sequence[str]], sort: Optional[str] = None):
+        if fields is None:
+            return query
+        # Sort columns are needed to encode the next page cursor
+        names = dict.fromkeys([*fields, *self._sort_keys(sort)[0]])
+        return query.options(load_only(*[getattr(self.model, name) for name in names]))
+
+    def _sort_keys(self, sort: Optional[str]) -> Tuple[List[str], bool]:
+        """
+        Column names and direction (descending if prefixed with ``-``) of a page
+        sorted by ``sort``, or by ``cursor_columns`` when it is ``None``.
+        """
+        if sort is None:
+            return list(self.cursor_columns), False
+        descending = sort.startswith("-")
+        name = sort.removeprefix("-")
+        if name not in self.sort_fields:
+            raise HTTPException(status_code=400, detail=f"Cannot sort by {name}")
+        return [name, "id"], descending
+
+    async def get(self, db: AsyncSession, id: int, fields: Optional[Sequence[str]] = None) -> Optional[ModelType]:
+        """
+        Get a row by id, loading only ``fields`` (from ``resolve_fields``) when given.
+        """
         logger.debug(f"Getting {self.model} with id: {id}")
-        query = select(self.model).filter(self.model.id == id)
+        query = self._load_only(select(self.model).filter(self.model.id == id), fields)
         result = await db.execute(query)
         obj = result.scalars().first()
         if obj is None:
@@ -30,10 +85,135 @@ class RepositoryBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
     async def get_multi(self, db: AsyncSession, skip: int = 0, limit: int = 100) -> List[ModelType]:
         logger.debug(f"Getting {self.model} with skip: {skip} and limit: {limit}")
-        query = select(self.model).offset(skip).limit(limit)
+        query = select(self.model).order_by(*self._cursor_columns()).offset(skip).limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
 
+    def _cursor_columns(self, names: Optional[Sequence[str]] = None) -> list:
+        return [self.model.__table__.columns[name] for name in names or self.cursor_columns]
+
+    def encode_cursor(self, obj: ModelType, names: Optional[Sequence[str]] = None) -> str:
+        values = [getattr(obj, name) for name in names or self.cursor_columns]
+        return encode_cursor([value.isoformat() if isinstance(value, datetime) else value for value in values])
+
+    def decode_cursor(self, cursor: str, names: Optional[Sequence[str]] = None) -> List[Any]:
+        columns = self._cursor_columns(names)
+        try:
+            values = decode_cursor(cursor, len(columns))
+            return [
+                datetime.fromisoformat(value) if isinstance(column.type, DateTime) else column.type.python_type(value)
+                for column, value in zip(columns, values)
+            ]
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    def _page_query(
+        self,
+        query,
+        limit: int,
+        cursor: Optional[str],
+        skip: int,
+        sort: Optional[str] = None,
+        where: Sequence[Any] = (),
+    ):
+        names, descending = self._sort_keys(sort)
+        columns = self._cursor_columns(names)
+        if sort is not None:
+            # A row comparison never matches NULL, so rows without a value in a
+            # nullable sort column could not be paged to; sorted pages leave them out
+            where = [*where, *(column.is_not(None) for column in columns if column.nullable)]
+        # One row past the page tells whether there is a next page
+        query = query.where(*where).order_by(*(column.desc() if descending else column for column in columns))
+        query = query.limit(limit + 1)
+        if cursor is not None:
+            key, after = tuple_(*columns), tuple_(*self.decode_cursor(cursor, names))
+            query = query.where(key < after if descending else key > after)
+        elif skip:
+            query = query.offset(skip)
+        return query
+
+    async def get_version(self, db: AsyncSession, id: int) -> datetime:
+        """
+        Return the ``version_column`` value of a row without loading it.
+        """
+        column = self.model.__table__.columns[self.version_column]
+        version = await db.scalar(select(column).where(self.model.id == id))
+        if version is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        return version
+
+    async def get_page_versions(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        sort: Optional[str] = None,
+        where: Sequence[Any] = (),
+    ) -> List[Tuple[int, datetime]]:
+        """
+        Return ``(id, version)`` of the rows ``get_page`` would read, including the
+        lookahead row, so a page can be validated without selecting its columns.
+        """
+        column = self.model.__table__.columns[self.version_column]
+        query = self._page_query(select(self.model.id, column), limit, cursor, skip, sort, where)
+        result = await db.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def get_page(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        fields: Optional[Sequence[str]] = None,
+        sort: Optional[str] = None,
+        where: Sequence[Any] = (),
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Return up to ``limit`` rows matching the ``where`` clauses and the cursor of the next page.
+
+        Rows are in ``cursor_columns`` order, or by one of ``sort_fields`` then
+        ``id`` (``-name`` for descending). With a ``cursor`` the page starts right
+        after the row it encodes, using an index range scan whose cost does not
+        depend on how deep the page is. A cursor is only valid with the sort it
+        came from. Rows with a NULL ``sort`` column are not listed. ``skip``
+        (OFFSET) is only honoured for the first page. The next cursor is ``None``
+        on the last page. With ``fields`` only those columns (plus the sort
+        columns) are selected; the other attributes stay unloaded.
+        """
+        logger.debug(f"Getting {self.model} page after cursor {cursor} (skip: {skip}) with limit: {limit}")
+        query = self._page_query(self._load_only(select(self.model), fields, sort), limit, cursor, skip, sort, where)
+        result = await db.execute(query)
+        rows = result.scalars().all()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, self.encode_cursor(rows[-1], self._sort_keys(sort)[0])
+
+    async def stream_after(
+        self,
+        db: AsyncSession,
+        created_at: Optional[datetime] = None,
+        id: Optional[int] = None,
+        chunk_size: int = 1000,
+        columns: Optional[Sequence[str]] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream rows created after the (created_at, id) high-water mark, oldest first,
+        in chunks of ``chunk_size`` dicts using a server-side cursor.
+        """
+        logger.debug(f"Streaming {self.model} after ({created_at}, {id}) in chunks of {chunk_size}")
+        table_columns = self.model.__table__.columns
+        selected = [table_columns[name] for name in columns] if columns else list(table_columns)
+        query = select(*selected).order_by(self.model.created_at, self.model.id)
+        if created_at is not None:
+            query = query.where(tuple_(self.model.created_at, self.model.id) > tuple_(created_at, id or 0))
+
+        result = await db.stream(query.execution_options(yield_per=chunk_size))
+        async for rows in result.mappings().partitions(chunk_size):
+            yield [dict(row) for row in rows]
+
     async def create(
             self,
             db: AsyncSession,
@@ -73,6 +253,74 @@ class RepositoryBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         await db.flush()
         return obj
 
+    async def bulk_create(
+        self,
+        db: AsyncSession,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+    ) -> List[ModelType]:
+        """
+        Insert all rows with multi-row ``INSERT ... RETURNING`` statements and return
+        them in input order.
+        """
+        logger.debug(f"Bulk creating {len(objs_in)} {self.model}")
+        if not objs_in:
+            return []
+        rows = [jsonable_encoder(obj_in) for obj_in in objs_in]
+        query = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        result = await db.scalars(query, rows)
+        return result.all()
+
+    async def bulk_update(self, db: AsyncSession, objs_in: Sequence[Dict[str, Any]]) -> List[ModelType]:
+        """
+        Apply partial updates, each a dict with ``id`` and the fields to change, with
+        ``UPDATE ... FROM (VALUES ...)``: one statement per distinct set of fields.
+        Returns the updated rows; ids that do not exist are missing from the result.
+        Ids must be distinct.
+        """
+        logger.debug(f"Bulk updating {len(objs_in)} {self.model}")
+        table_columns = self.model.__table__.columns
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for obj_in in objs_in:
+            fields = tuple(sorted(name for name in obj_in if name != "id"))
+            groups.setdefault(fields, []).append(obj_in)
+
+        updated = []
+        for fields, group in groups.items():
+            if not fields:
+                result = await db.scalars(select(self.model).where(self.model.id.in_([obj["id"] for obj in group])))
+                updated.extend(result.all())
+                continue
+            batch = values(
+                *(column(name, table_columns[name].type) for name in ("id", *fields)),
+                name="batch",
+            ).data([tuple(obj[name] for name in ("id", *fields)) for obj in group])
+            query = (
+                update(self.model)
+                .where(self.model.id == batch.c.id)
+                .values({name: batch.c[name] for name in fields})
+                .returning(self.model)
+                .execution_options(synchronize_session=False)
+            )
+            result = await db.scalars(query)
+            updated.extend(result.all())
+        return updated
+
+    async def bulk_remove(self, db: AsyncSession, ids: Sequence[int]) -> List[int]:
+        """
+        Delete rows with ``DELETE ... WHERE id = ANY(...)`` and return the ids that existed.
+        """
+        logger.debug(f"Bulk removing {len(ids)} {self.model}")
+        if not ids:
+            return []
+        query = (
+            delete(self.model)
+            .where(self.model.id == any_(bindparam("ids", list(ids), type_=ARRAY(Integer))))
+            .returning(self.model.id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.scalars(query)
+        return result.all()
+
     # CPU bound task, so not thread blocking
     def model_to_dict(self) -> Dict[str, Any]:
         # Exclude any private fields or relationships by filtering out attributes starting with '_'
@@ -0,0 +1,59 @@
+from typing import Any, Dict, List
+
+from sqlalchemy import BigInteger, Float, Integer, bindparam, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.db.models import ProductEngagementTable, ProductTable
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+COUNTER_COLUMNS = ("views", "purchases", "rating_sum", "rating_count")
+
+
+class EngagementRepository:
+    def __init__(self):
+        self.model = ProductEngagementTable
+
+    async def increment(self, db: AsyncSession, deltas: Dict[int, List[float]]) -> int:
+        """
+        Add per-product counter deltas (in ``COUNTER_COLUMNS`` order) with a single upsert.
+
+        The batch is passed as one array per column and expanded with ``unnest``, so
+        the statement size does not grow with the number of products. Ids that no
+        longer exist in ``product`` are dropped by the join. Returns the number of
+        rows written.
+        """
+        if not deltas:
+            return 0
+        logger.debug(f"Incrementing engagement counters for {len(deltas)} products")
+        product_ids = list(deltas)
+        columns = list(zip(*deltas.values()))
+        batch = func.unnest(
+            bindparam("product_ids", product_ids, type_=ARRAY(Integer)),
+            bindparam("views", [int(v) for v in columns[0]], type_=ARRAY(BigInteger)),
+            bindparam("purchases", [int(v) for v in columns[1]], type_=ARRAY(BigInteger)),
+            bindparam("rating_sum", list(columns[2]), type_=ARRAY(Float)),
+            bindparam("rating_count", [int(v) for v in columns[3]], type_=ARRAY(BigInteger)),
+        ).table_valued("product_id", *COUNTER_COLUMNS).render_derived(name="batch")
+
+        query = insert(self.model).from_select(
+            ["product_id", *COUNTER_COLUMNS],
+            select(batch.c.product_id, *(batch.c[name] for name in COUNTER_COLUMNS))
+            .join(ProductTable, ProductTable.id == batch.c.product_id),
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[self.model.product_id],
+            set_={
+                **{name: self.model.__table__.c[name] + query.excluded[name] for name in COUNTER_COLUMNS},
+                "updated_at": func.now(),
+            },
+        )
+        result = await db.execute(query)
+        return result.rowcount
+
+    async def get_all(self, db: AsyncSession) -> List[Dict[str, Any]]:
+        query = select(self.model.product_id, *(self.model.__table__.c[name] for name in COUNTER_COLUMNS))
+        result = await db.execute(query)
+        return [dict(row) for row in result.mappings().all()]
@@ -1,9 +1,200 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import asyncpg
+from fastapi import HTTPException
+from sqlalchemy import (
+    TEXT,
+    Boolean,
+    Column,
+    Float,
+    Integer,
+    MetaData,
+    Table,
+    and_,
+    cast,
+    func,
+    literal_column,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import REGCLASS, TSVECTOR, insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.schema import CreateTable
 from src.core.db.models import ProductTable
-from src.schemas import ProductCreate, ProductUpdate
+from src.core.logger import get_logger
+from src.schemas import ProductCreate, ProductFilter, ProductUpdate
+from src.utils.cursor import decode_cursor, encode_cursor
 
 from .base import RepositoryBase
 
+logger = get_logger(__name__)
+
+# Per-connection staging table for COPY imports, emptied at every commit
+product_import = Table(
+    "product_import",
+    MetaData(),
+    Column("line", Integer, nullable=False),
+    Column("id", Integer),
+    Column("name", TEXT),
+    Column("description", TEXT),
+    Column("price", Float),
+    Column("quantity", Integer),
+    Column("is_active", Boolean),
+    Column("image_url", TEXT),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DELETE ROWS",
+)
+
+IMPORT_COLUMNS = tuple(column.name for column in product_import.columns)
+
+# Generated by DDL in the product model and deliberately not mapped
+search_vector = literal_column("product.search_vector", TSVECTOR)
+
 
 class ProductRepository(RepositoryBase[ProductTable, ProductCreate, ProductUpdate]):
+    cursor_columns = ("created_at", "id")
+    # Base64 data URIs, much larger than the rest of the row
+    heavy_fields = ("image_url",)
+    version_column = "updated_at"
+    # Each backed by an index on (column, id), and (is_active, price, id) for active-only price views
+    sort_fields = ("created_at", "price", "quantity")
+
     def __init__(self):
         super().__init__(ProductTable)
+
+    def filter_conditions(self, filters: Optional[ProductFilter]) -> List[Any]:
+        """
+        SQL predicates of ``filters``, to pass as ``where`` to ``get_page``.
+        """
+        if filters is None:
+            return []
+        conditions = []
+        if filters.is_active is not None:
+            conditions.append(self.model.is_active == filters.is_active)
+        if filters.min_price is not None:
+            conditions.append(self.model.price >= filters.min_price)
+        if filters.max_price is not None:
+            conditions.append(self.model.price <= filters.max_price)
+        if filters.min_quantity is not None:
+            conditions.append(self.model.quantity >= filters.min_quantity)
+        if filters.max_quantity is not None:
+            conditions.append(self.model.quantity <= filters.max_quantity)
+        return conditions
+
+    async def search(
+        self,
+        db: AsyncSession,
+        q: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[ProductTable], Optional[str]]:
+        """
+        Return products matching ``q`` by full-text search on name and description
+        or by trigram similarity to the name, best match first, and the next page cursor.
+
+        Both conditions are served by GIN indexes (combined with a BitmapOr). The
+        rank is ``ts_rank`` plus the name similarity, so exact word matches lead
+        and misspellings still surface. Pages continue after the (rank, id) of the
+        previous page's last row.
+        """
+        logger.debug(f"Searching {self.model} for {q!r} after cursor {cursor} with limit: {limit}")
+        query_vector = func.websearch_to_tsquery("english", q)
+        rank = func.ts_rank(search_vector, query_vector) + func.similarity(self.model.name, q)
+        query = (
+            self._load_only(select(self.model, rank), fields)
+            .where(or_(search_vector.op("@@")(query_vector), self.model.name.op("%")(q)))
+            .order_by(rank.desc(), self.model.id)
+            .limit(limit + 1)
+        )
+        if cursor is not None:
+            try:
+                after_rank, after_id = decode_cursor(cursor, 2)
+                after_rank, after_id = float(after_rank), int(after_id)
+            except (TypeError, ValueError):
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            query = query.where(or_(rank < after_rank, and_(rank == after_rank, self.model.id > after_id)))
+
+        result = await db.execute(query)
+        rows = result.all()
+        products = [product for product, _ in rows[:limit]]
+        if len(rows) <= limit:
+            return products, None
+        last_product, last_rank = rows[limit - 1]
+        return products, encode_cursor([last_rank, last_product.id])
+
+    async def copy_upsert(
+        self, db: AsyncSession, records: Sequence[Tuple[Any, ...]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Load ``records`` (tuples in ``IMPORT_COLUMNS`` order) into the staging table
+        with COPY, then apply them with one INSERT ... ON CONFLICT (id) DO UPDATE for
+        rows with an ``id`` and one INSERT for rows without.
+
+        Rows whose ``id`` is not in the table are inserted with it, and the id sequence
+        is moved past the largest imported id, so an export loads into an empty table.
+        Returns the updated and the created rows as column dicts (no ORM objects are
+        built). When an id appears more than once, the last line wins.
+        """
+        logger.debug(f"Importing {len(records)} {self.model} through COPY")
+        if not records:
+            return [], []
+        await db.execute(CreateTable(product_import, if_not_exists=True))
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        try:
+            await raw_connection.driver_connection.copy_records_to_table(
+                product_import.name, records=records, columns=IMPORT_COLUMNS
+            )
+        except (asyncpg.PostgresError, asyncpg.InterfaceError, ArithmeticError, TypeError, ValueError) as e:
+            # Raw driver calls (and their client-side encoding) bypass SQLAlchemy,
+            # so wrap for callers handling SQLAlchemyError
+            raise DBAPIError(f"COPY {product_import.name}", None, e) from e
+
+        table = self.model.__table__
+        fields = IMPORT_COLUMNS[2:]
+        latest = (
+            select(product_import.c.id, *(product_import.c[name] for name in fields))
+            .where(product_import.c.id.is_not(None))
+            .distinct(product_import.c.id)
+            .order_by(product_import.c.id, product_import.c.line.desc())
+        )
+        upsert = insert(table).from_select(["id", *fields], latest)
+        upserted = await db.execute(
+            upsert.on_conflict_do_update(
+                index_elements=[table.c.id],
+                # ON CONFLICT skips Python-side onupdate defaults
+                set_={**{name: upsert.excluded[name] for name in fields}, "updated_at": func.now()},
+            )
+            # xmax is 0 only on rows this statement inserted
+            .returning(*table.columns, literal_column("xmax = 0").label("inserted"))
+        )
+        updated, created = [], []
+        for row in upserted.mappings():
+            row = dict(row)
+            (created if row.pop("inserted") else updated).append(row)
+
+        # Only ever move the sequence forward: lowering it could hand out ids that
+        # concurrent transactions have already taken
+        sequence = func.pg_get_serial_sequence(table.name, "id")
+        await db.execute(
+            select(func.setval(sequence, func.max(product_import.c.id)))
+            .select_from(product_import)
+            .having(
+                func.max(product_import.c.id)
+                > func.coalesce(func.pg_sequence_last_value(cast(sequence, REGCLASS)), 0)
+            )
+        )
+
+        inserted = await db.execute(
+            insert(table)
+            .from_select(
+                fields,
+                select(*(product_import.c[name] for name in fields))
+                .where(product_import.c.id.is_(None))
+                .order_by(product_import.c.line),
+            )
+            .returning(*table.columns)
+        )
+        return updated, created + [dict(row) for row in inserted.mappings()]
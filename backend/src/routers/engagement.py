@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from src.core.config import get_backend_config
+from src.dependencies import auth
+from src.dependencies.engagement import get_engagement_aggregator
+from src.schemas import EngagementEventBatch, EngagementIngestResponse, user
+from src.services import EngagementAggregator, EngagementBacklogFull
+
+config = get_backend_config()
+
+router = APIRouter(prefix="/engagement", tags=["engagement"])
+
+
+@router.post("/events", response_model=EngagementIngestResponse, status_code=status.HTTP_202_ACCEPTED)
+async def ingest_events(
+    batch: EngagementEventBatch,
+    aggregator: EngagementAggregator = Depends(get_engagement_aggregator),
+    auth: user.UserInDB = Depends(auth.get_current_user),
+):
+    """
+    Record product view, purchase and rating events.
+
+    Events are aggregated in memory and persisted by the next write-behind flush,
+    so they show up in ``product_engagement`` within ``ENGAGEMENT_FLUSH_INTERVAL``.
+    """
+    if len(batch.events) > config.ENGAGEMENT_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {config.ENGAGEMENT_MAX_BATCH_SIZE} events can be sent per request",
+        )
+    try:
+        accepted = aggregator.record(batch.events)
+    except EngagementBacklogFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return EngagementIngestResponse(accepted=accepted)
+
+
+@router.get("/stats")
+async def get_engagement_stats(
+    aggregator: EngagementAggregator = Depends(get_engagement_aggregator),
+    admin: user.UserInDB = Depends(auth.admin_required),
+):
+    """
+    Return the ingest rate, flush lag and write-behind flush history.
+    """
+    return aggregator.stats()
@@ -1,11 +1,30 @@
-from src.services import ProductService
-from src.core.db.database import get_db
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime
+from typing import Optional
+
+from src.services import PriceAnalyticsService, ProductCache, ProductService
+from src.services.product import ExportFormat, ImportFormat
+from src.core.db.database import SessionLocal, get_db
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Response, UploadFile
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
-from src.schemas import product, user
-from src.dependencies import auth, product as product_dep, price
-from src.ml import optimalprice, potd
+from src.schemas import analytics, product, user, price as price_schemas
+from src.dependencies import analytics as analytics_dep, auth, product as product_dep, price
+from src.ml.potd_snapshot import ProductsOfTheDaySnapshot
+from src.ml.price_base import BasePricePredictor
+from src.ml import price_worker
+from src.ml.executor import InferenceExecutor, InferenceQueueFull
 from src.dependencies import potd as potd_dep
+from src.dependencies.executor import get_inference_executor
+from src.dependencies.registry import get_model_registry
+from src.ml.registry import ModelRegistry
+from src.ml.cache import PredictionCache
+from src.ml.batching import MicroBatcher
+from src.core.config import get_backend_config
+from src.utils import etag_matches, format_http_date, json_response, not_modified_since
+
+config = get_backend_config()
 
 router = APIRouter(prefix="/products", tags=["products"])
 
@@ -20,39 +39,311 @@ async def create_product(
     """
     Create a new product.
     """
-    product = await product_service.create_product(db, product_in)
-    return product
+    product_in_db = await product_service.create_product(db, product_in)
+    return json_response(product.ProductInDB, product_in_db)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[list[str]]:
+    if fields is None:
+        return None
+    return [name.strip() for name in fields.split(",") if name.strip()]
+
+
+FIELDS_DESCRIPTION = "Comma-separated product columns to return, e.g. `name,price`; `id` is always included"
+
+
+def _validators(etag: str, last_modified: Optional[datetime] = None) -> dict[str, str]:
+    # no-cache: clients may store the response but must revalidate it on every use
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_http_date(last_modified)
+    return headers
+
 
+def _is_not_modified(
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> bool:
+    # If-Modified-Since only applies when no If-None-Match was sent (RFC 9110 13.2.2)
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    return last_modified is not None and not_modified_since(if_modified_since, last_modified)
 
-@router.get("/", response_model=list[product.ProductInDB])
+
+def _product_filter(
+    is_active: Optional[bool] = None,
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    min_quantity: Optional[int] = None,
+    max_quantity: Optional[int] = None,
+) -> product.ProductFilter:
+    try:
+        return product.ProductFilter(
+            is_active=is_active,
+            min_price=min_price,
+            max_price=max_price,
+            min_quantity=min_quantity,
+            max_quantity=max_quantity,
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False))
+
+
+@router.get("/", response_model=list[product.ProductPartial], response_model_exclude_unset=True)
 async def get_products(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=config.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    sort: Optional[product.ProductSort] = Query(None, description="Sort column, descending with a leading `-`"),
+    filters: product.ProductFilter = Depends(_product_filter),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
     product_service: ProductService = Depends(product_dep.get_product_service),
     auth: user.UserInDB = Depends(auth.get_current_user),
 ):
     """
-    Get all products.
+    Get products ordered by creation time, or by ``sort`` then id. Products
+    without a value in the ``sort`` column (e.g. no price) are left out.
+
+    ``is_active``, ``min_price``/``max_price`` and ``min_quantity``/``max_quantity``
+    (inclusive) narrow the list in the database, e.g.
+    ``?is_active=true&min_price=100&max_price=500&max_quantity=10&sort=price``.
+
+    Pass the ``X-Next-Cursor`` response header back as ``cursor``, with the same
+    filters and sort, to fetch the next page; the header is absent on the last
+    page. ``skip`` is still honoured without a cursor, but deep offsets get
+    slower as the catalog grows.
+
+    Only the ``fields`` columns are selected. By default every column except
+    ``image_url`` is returned; request it explicitly to get the images.
+
+    The ``ETag`` covers the ids and ``updated_at`` of the page rows; send it as
+    ``If-None-Match`` to get ``304 Not Modified`` without the rows being read.
+    Lists carry no ``Last-Modified`` since deleting a row does not advance it.
+    """
+    fields = _parse_fields(fields)
+    etag = await product_service.get_products_page_etag(
+        db, limit=limit, cursor=cursor, skip=skip, fields=fields, filters=filters, sort=sort
+    )
+    if _is_not_modified(if_none_match, None, etag):
+        return Response(status_code=304, headers=_validators(etag))
+
+    products, next_cursor = await product_service.get_products_page(
+        db, limit=limit, cursor=cursor, skip=skip, fields=fields, etag=etag, filters=filters, sort=sort
+    )
+    headers = _validators(etag)
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = next_cursor
+    return json_response(list[product.ProductPartial], products, exclude_unset=True, headers=headers)
+
+
+@router.get("/search", response_model=list[product.ProductPartial], response_model_exclude_unset=True)
+async def search_products(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=config.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(product_dep.get_product_service),
+    auth: user.UserInDB = Depends(auth.get_current_user),
+):
+    """
+    Search products by name and description, best match first.
+
+    ``q`` accepts web search syntax (``"quoted phrase"``, ``or``, ``-excluded``)
+    and tolerates typos in product names. Pass the ``X-Next-Cursor`` response
+    header back as ``cursor`` for the next page. ``image_url`` is left out
+    unless requested in ``fields``.
+    """
+    products, next_cursor = await product_service.search_products(
+        db, q, limit=limit, cursor=cursor, fields=_parse_fields(fields)
+    )
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor is not None else None
+    return json_response(list[product.ProductPartial], products, exclude_unset=True, headers=headers)
+
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get("/export")
+async def export_products(
+    format: ExportFormat = "ndjson",
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    product_service: ProductService = Depends(product_dep.get_product_service),
+    auth: user.UserInDB = Depends(auth.get_current_user),
+):
     """
-    products = await product_service.get_all_products(db)
-    return products
+    Stream the whole catalog as NDJSON (one product per line) or CSV, oldest first.
 
+    Rows are read through a server-side cursor and encoded as they arrive, so the
+    export runs in constant memory. All columns are included unless ``fields``
+    narrows them.
+    """
+    fields = _parse_fields(fields)
+    # Fail fast on unknown fields, before the 200 status line is sent
+    product_service.product_repository.resolve_fields(fields)
+
+    async def stream():
+        # The request session is closed before the body is streamed, so the export uses its own
+        async with SessionLocal() as db:
+            async for chunk in product_service.export_products(
+                db, format=format, fields=fields, chunk_size=config.EXPORT_CHUNK_SIZE
+            ):
+                yield chunk
+
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="products.{format}"'},
+    )
+
+
+@router.get("/cache/stats")
+async def get_product_cache_stats(
+    cache: Optional[ProductCache] = Depends(product_dep.get_product_cache),
+    admin: user.UserInDB = Depends(auth.admin_required),
+):
+    """
+    Return product cache size, memory use, hit ratio and invalidation counters.
+    """
+    if cache is None:
+        raise HTTPException(status_code=404, detail="Product cache is disabled")
+    return cache.stats()
+
+
+@router.get("/analytics/prices", response_model=analytics.PriceAnalytics)
+async def get_price_analytics(
+    buckets: Optional[int] = Query(None, ge=1, le=1000, description="Histogram buckets"),
+    fresh: bool = Query(False, description="Aggregate the product table instead of reading the views"),
+    price_analytics: PriceAnalyticsService = Depends(analytics_dep.get_price_analytics),
+    auth: user.UserInDB = Depends(auth.get_current_user),
+):
+    """
+    Price count, mean, spread and percentiles for all, active and inactive
+    products, and an equal-width price histogram split by active flag.
+
+    Everything is aggregated in the database. With the default bucket count the
+    result comes from materialized views refreshed in the background after
+    writes (``source`` is ``materialized``, ``computed_at`` is the refresh
+    time); pass ``fresh=true`` or another ``buckets`` to aggregate live.
+    """
+    stats = await price_analytics.get_price_stats(buckets=buckets, fresh=fresh)
+    return json_response(analytics.PriceAnalytics, stats)
+
+
+def _check_bulk_size(count: int) -> None:
+    if count > config.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {config.BULK_MAX_ITEMS} products can be sent per request")
+
+
+@router.post("/bulk", response_model=product.BulkResult)
+async def bulk_create_products(
+    bulk_in: product.ProductBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(product_dep.get_product_service),
+    auth: user.UserInDB = Depends(auth.get_current_user),
+):
+    """
+    Create many products, committed in chunks of ``BULK_CHUNK_SIZE``.
+
+    ``results`` holds one entry per input item, in order, with the new id or the
+    error that prevented that item from being created.
+    """
+    _check_bulk_size(len(bulk_in.items))
+    result = await product_service.bulk_create_products(db, bulk_in.items, chunk_size=config.BULK_CHUNK_SIZE)
+    return json_response(product.BulkResult, result)
+
+
+@router.put("/bulk", response_model=product.BulkResult)
+async def bulk_update_products(
+    bulk_in: product.ProductBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(product_dep.get_product_service),
+    auth: user.UserInDB = Depends(auth.get_current_user),
+):
+    """
+    Partially update many products by id; only the fields sent for an item change.
+    Each id may appear once: later items with the same id fail with an error.
+    """
+    _check_bulk_size(len(bulk_in.items))
+    result = await product_service.bulk_update_products(db, bulk_in.items, chunk_size=config.BULK_CHUNK_SIZE)
+    return json_response(product.BulkResult, result)
 
-@router.get("/{product_id}", response_model=product.ProductInDB)
+
+@router.post("/bulk/delete", response_model=product.BulkResult)
+async def bulk_delete_products(
+    bulk_in: product.ProductBulkDelete,
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(product_dep.get_product_service),
+    auth: user.UserInDB = Depends(auth.get_current_user),
+):
+    """
+    Delete many products by id.
+    """
+    _check_bulk_size(len(bulk_in.ids))
+    result = await product_service.bulk_delete_products(db, bulk_in.ids, chunk_size=config.BULK_CHUNK_SIZE)
+    return json_response(product.BulkResult, result)
+
+
+@router.post("/import", response_model=product.ImportResult)
+async def import_products(
+    file: UploadFile = File(...),
+    format: Optional[ImportFormat] = Query(None, description="Defaults to the file extension, else csv"),
+    db: AsyncSession = Depends(get_db),
+    product_service: ProductService = Depends(product_dep.get_product_service),
+    auth: user.UserInDB = Depends(auth.get_current_user),
+):
+    """
+    Import products from a CSV (with a header row) or NDJSON upload.
+
+    Rows with an ``id`` replace that product or create it with that id, and rows
+    without one are created with a new id.
+    Valid rows are loaded with COPY and committed every ``IMPORT_CHUNK_SIZE``
+    rows; invalid ones are skipped and listed in ``errors`` by line number.
+    Both formats reject unknown columns and ignore ``created_at``/``updated_at``,
+    so the output of ``/products/export`` can be imported again.
+    """
+    if format is None:
+        format = "ndjson" if (file.filename or "").lower().endswith((".ndjson", ".jsonl")) else "csv"
+    try:
+        result = await product_service.import_products(
+            db, file.file, format=format, chunk_size=config.IMPORT_CHUNK_SIZE, max_errors=config.IMPORT_MAX_ERRORS
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return json_response(product.ImportResult, result)
+
+
+@router.get("/{product_id}", response_model=product.ProductPartial, response_model_exclude_unset=True)
 async def get_product(
     product_id: int,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: Optional[str] = Header(None),
+    if_modified_since: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
     product_service: ProductService = Depends(product_dep.get_product_service),
     auth: user.UserInDB = Depends(auth.get_current_user),
 ):
     """
-    Get a product by ID.
+    Get a product by ID, with all fields unless ``fields`` narrows them.
+
+    ``If-None-Match`` / ``If-Modified-Since`` are checked against ``updated_at``
+    alone and answered with ``304 Not Modified`` when the product is unchanged.
     """
-    product = await product_service.get_product_by_id(db, product_id)
-    if not product:
+    fields = _parse_fields(fields)
+    etag, updated_at = await product_service.get_product_version(db, product_id, fields=fields)
+    if _is_not_modified(if_none_match, if_modified_since, etag, updated_at):
+        return Response(status_code=304, headers=_validators(etag, updated_at))
+
+    product_partial = await product_service.get_product_by_id(db, product_id, fields=fields, updated_at=updated_at)
+    if not product_partial:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    return json_response(
+        product.ProductPartial, product_partial, exclude_unset=True, headers=_validators(etag, updated_at)
+    )
 
 
 @router.put("/{product_id}", response_model=product.ProductInDB)
@@ -66,10 +357,10 @@ async def update_product(
     """
     Update a product by ID.
     """
-    product = await product_service.update_product(db, product_id, product_in)
-    if not product:
+    product_in_db = await product_service.update_product(db, product_id, product_in)
+    if not product_in_db:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    return json_response(product.ProductInDB, product_in_db)
 
 
 @router.delete("/{product_id}", response_model=product.ProductInDB)
@@ -82,41 +373,175 @@ async def delete_product(
     """
     Delete a product by ID.
     """
-    product = await product_service.delete_product(db, product_id)
-    if not product:
+    product_in_db = await product_service.delete_product(db, product_id)
+    if not product_in_db:
         raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    return json_response(product.ProductInDB, product_in_db)
 
 
 @router.get("/ml/recommend_price/{product_id}")
 async def recommend_price_by_id(
     product_id: int,
-    predictor: optimalprice.PricePredictor = Depends(price.get_price_predictor),
+    predictor: BasePricePredictor = Depends(price.get_price_predictor),
+    batcher: MicroBatcher = Depends(price.get_price_batcher),
     auth: user.UserInDB = Depends(auth.get_current_user),
 ):
     """
     Recommend an optimal price for a product by ID from mock data.
     """
     try:
-        product_data = predictor.get_product_by_id(product_id)
-        price_value = predictor.recommend_price(product_data)
+        price_value = await batcher.predict(predictor, product_id)
         return {"recommended_price": round(price_value, 2)}
+    except InferenceQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Prediction error: {str(e)}")
 
 
+@router.post("/ml/recommend_price:batch", response_model=price_schemas.PriceRecommendationBatchResponse)
+async def recommend_price_batch(
+    request: price_schemas.PriceRecommendationBatchRequest,
+    predictor: BasePricePredictor = Depends(price.get_price_predictor),
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    auth: user.UserInDB = Depends(auth.get_current_user),
+):
+    """
+    Recommend prices for many products (by ID and/or raw payload) with a single model call.
+    """
+    batch_size = len(request.product_ids) + len(request.products)
+    if batch_size > config.ML_MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {batch_size} exceeds the limit of {config.ML_MAX_BATCH_SIZE}",
+        )
+
+    try:
+        found, sample_prices = await price_worker.recommend_prices_mixed(
+            executor,
+            predictor,
+            request.product_ids,
+            [sample.model_dump() for sample in request.products],
+        )
+    except InferenceQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Prediction error: {str(e)}")
+
+    results = []
+    for product_id in request.product_ids:
+        if product_id in found:
+            results.append(price_schemas.PriceRecommendation(
+                product_id=product_id,
+                recommended_price=round(found[product_id], 2),
+            ))
+        else:
+            results.append(price_schemas.PriceRecommendation(
+                product_id=product_id,
+                error=f"Product with ID {product_id} not found",
+            ))
+    results += [
+        price_schemas.PriceRecommendation(recommended_price=round(value, 2))
+        for value in sample_prices
+    ]
+    return price_schemas.PriceRecommendationBatchResponse(count=len(results), results=results)
+
+
 @router.get("/ml/products_of_the_day")
 async def get_products_of_the_day(
-    classifier: potd.ProductsOfTheDayClassifier = Depends(potd_dep.get_products_of_the_day_classifier),
+    k: int = Query(config.ML_POTD_PAGE_SIZE, ge=1, le=config.ML_POTD_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    snapshot: ProductsOfTheDaySnapshot = Depends(potd_dep.get_products_of_the_day_snapshot),
     auth: user.UserInDB = Depends(auth.get_current_user),
 ):
     """
-    Return products classified as "products of the day".
+    Return the ``k`` highest-ranked "products of the day", best first.
+
+    Pass the returned ``next_cursor`` to fetch the following page. Served from
+    the daily snapshot's pre-encoded records; no model or pandas work happens
+    per request.
+    While the model predicts no product of the day, a baseline ranking by
+    engagement is served and ``X-Model-Version`` is ``baseline``.
+    """
+    try:
+        body = snapshot.page(k, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"X-Snapshot-Date": snapshot.day.isoformat(), "X-Model-Version": snapshot.model_version or ""},
+    )
+
+
+@router.get("/ml/executor")
+async def get_inference_executor_stats(
+    executor: InferenceExecutor = Depends(get_inference_executor),
+    admin: user.UserInDB = Depends(auth.admin_required),
+):
+    """
+    Return inference pool configuration, queue depth and per-task timings.
+    """
+    return executor.stats()
+
+
+@router.get("/ml/batcher")
+async def get_price_batcher_stats(
+    batcher: MicroBatcher = Depends(price.get_price_batcher),
+    admin: user.UserInDB = Depends(auth.admin_required),
+):
+    """
+    Return micro-batching settings, batch sizes and p50/p99 request latency.
+    """
+    return batcher.stats()
+
+
+@router.get("/ml/cache")
+async def get_prediction_cache_stats(
+    cache: PredictionCache = Depends(price.get_prediction_cache),
+    admin: user.UserInDB = Depends(auth.admin_required),
+):
+    """
+    Return price prediction cache size, hit/miss counters and evictions.
+    """
+    return cache.stats()
+
+
+@router.get("/ml/models")
+async def list_models(
+    admin: user.UserInDB = Depends(auth.admin_required),
+):
+    """
+    Return the live and retained versions of every model.
+    """
+    return [get_model_registry(name).info() for name in ("price", "potd")]
+
+
+@router.post("/ml/models/{name}/retrain", status_code=202)
+async def retrain_model(
+    registry: ModelRegistry = Depends(get_model_registry),
+    admin: user.UserInDB = Depends(auth.admin_required),
+):
+    """
+    Train a new model version in the background; it goes live only if it scores at least as well.
+    The price model is updated from the live version with the products added since it was trained.
+    """
+    started = registry.retrain_in_background()
+    return {"started": started, "model": registry.info()}
+
+
+@router.post("/ml/models/{name}/rollback/{version}")
+async def rollback_model(
+    version: str,
+    registry: ModelRegistry = Depends(get_model_registry),
+    admin: user.UserInDB = Depends(auth.admin_required),
+):
+    """
+    Switch the live model back to a previous version.
     """
     try:
-        products = classifier.get_products_of_the_day()
-        return {"count": len(products), "products": products}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+        await registry.rollback(version)
+    except (FileNotFoundError, ValueError) as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return registry.info()
@@ -1,6 +1,7 @@
 from fastapi import APIRouter
 
 from .auth import router as auth_router
+from .engagement import router as engagement_router
 from .product import router as product_router
 from .user import router as user_router
 
@@ -9,3 +10,4 @@ router = APIRouter()
 router.include_router(auth_router)
 router.include_router(user_router)
 router.include_router(product_router)
+router.include_router(engagement_router)
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.db.database import get_db
 from src.dependencies.user import get_user_service
 from src.dependencies.auth import get_current_user
 from src.schemas import UserCreate, UserInDB, UserUpdate
 from src.services import UserService
+from src.core.config import get_backend_config
+from src.utils import json_response
+
+config = get_backend_config()
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -14,24 +20,29 @@ async def create_user(
     user: UserCreate,
     db: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(get_user_service),
-) -> UserInDB:
+) -> Response:
     """
     Create a new user.
     """
-    return await user_service.create_user(db=db, user=user)
+    return json_response(UserInDB, await user_service.create_user(db=db, user=user))
 
 
 @router.get("/", response_model=list[UserInDB])
 async def get_all_users(
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=config.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(get_user_service),
-) -> list[UserInDB]:
+) -> Response:
     """
     Retrieve all users with pagination.
+
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` to fetch the next page.
     """
-    return await user_service.get_all_users(db=db, skip=skip, limit=limit)
+    users, next_cursor = await user_service.get_users_page(db=db, limit=limit, cursor=cursor, skip=skip)
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor is not None else None
+    return json_response(list[UserInDB], users, headers=headers)
 
 
 @router.get("/get_me", response_model=UserInDB)
@@ -39,11 +50,11 @@ async def get_user_me(
     db: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(get_user_service),
     user: UserInDB = Depends(get_current_user)
-) -> UserInDB:
+) -> Response:
     """
     Retrieve a user by ID.
     """
-    return user
+    return json_response(UserInDB, user)
 
 
 @router.get("/{user_id}", response_model=UserInDB)
@@ -51,11 +62,11 @@ async def get_user_by_id(
     user_id: int,
     db: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(get_user_service),
-) -> UserInDB:
+) -> Response:
     """
     Retrieve a user by ID.
     """
-    return await user_service.get_user_by_id(db=db, user_id=user_id)
+    return json_response(UserInDB, await user_service.get_user_by_id(db=db, user_id=user_id))
 
 
 @router.put("/{user_id}", response_model=UserInDB)
@@ -64,11 +75,11 @@ async def update_user(
     user_update: UserUpdate,
     db: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(get_user_service),
-) -> UserInDB:
+) -> Response:
     """
     Update user information.
     """
-    return await user_service.update_user(db=db, user_id=user_id, user_update=user_update)
+    return json_response(UserInDB, await user_service.update_user(db=db, user_id=user_id, user_update=user_update))
 
 
 @router.delete("/{user_id}")
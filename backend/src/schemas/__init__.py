@@ -1,2 +1,26 @@
 from .user import UserCreate, UserUpdate, UserInDB  # noqa: F401
-from .product import ProductCreate, ProductUpdate, ProductInDB  # noqa: F401
+from .product import (  # noqa: F401
+    ProductCreate,
+    ProductUpdate,
+    ProductInDB,
+    ProductPartial,
+    ProductFilter,
+    ProductSort,
+    ProductBulkCreate,
+    ProductBulkUpdate,
+    ProductBulkUpdateItem,
+    ProductBulkDelete,
+    BulkItemResult,
+    BulkResult,
+    ProductImportRow,
+    ImportRowError,
+    ImportResult,
+)
+from .price import (  # noqa: F401
+    PriceSample,
+    PriceRecommendationBatchRequest,
+    PriceRecommendation,
+    PriceRecommendationBatchResponse,
+)
+from .engagement import EngagementEvent, EngagementEventBatch, EngagementIngestResponse  # noqa: F401
+from .analytics import PriceAnalytics, PriceHistogramBucket, PriceSummary  # noqa: F401
@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel
+
+
+class PriceSummary(BaseModel):
+    # Products in the segment, including those without a price
+    count: int
+    mean: Optional[float] = None
+    stddev: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    # Continuous percentiles keyed "p5", "p25", "p50", ...
+    percentiles: dict[str, Optional[float]]
+
+
+class PriceHistogramBucket(BaseModel):
+    lower: float
+    upper: float
+    count: int
+    active: int
+    inactive: int
+
+
+class PriceAnalytics(BaseModel):
+    all: PriceSummary
+    active: PriceSummary
+    inactive: PriceSummary
+    histogram: list[PriceHistogramBucket]
+    source: Literal["live", "materialized"]
+    computed_at: datetime
+    # True when products were written through this process since the views were refreshed
+    stale: bool = False
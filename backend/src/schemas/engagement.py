@@ -0,0 +1,24 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class EngagementEvent(BaseModel):
+    product_id: int
+    type: Literal["view", "purchase", "rating"]
+    quantity: int = Field(default=1, ge=1)
+    rating: Optional[float] = Field(default=None, ge=1, le=5)
+
+    @model_validator(mode="after")
+    def check_rating(self):
+        if (self.type == "rating") != (self.rating is not None):
+            raise ValueError("rating is required for, and only allowed on, rating events")
+        return self
+
+
+class EngagementEventBatch(BaseModel):
+    events: list[EngagementEvent] = Field(min_length=1)
+
+
+class EngagementIngestResponse(BaseModel):
+    accepted: int
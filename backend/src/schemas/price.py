@@ -0,0 +1,26 @@
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class PriceSample(BaseModel):
+    name: Optional[str] = None
+    description: str = ""
+    quantity: int
+    is_active: bool = Field(default=True)
+
+
+class PriceRecommendationBatchRequest(BaseModel):
+    product_ids: list[int] = Field(default_factory=list)
+    products: list[PriceSample] = Field(default_factory=list)
+
+
+class PriceRecommendation(BaseModel):
+    product_id: Optional[int] = None
+    recommended_price: Optional[float] = None
+    error: Optional[str] = None
+
+
+class PriceRecommendationBatchResponse(BaseModel):
+    count: int
+    results: list[PriceRecommendation]
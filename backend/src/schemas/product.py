@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 
 class ProductBase(BaseModel):
@@ -28,6 +28,111 @@ class ProductUpdate(ProductBase):
 class ProductInDB(ProductBase):
     id: int
     created_at: datetime
+    updated_at: Optional[datetime] = None
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductPartial(BaseModel):
+    """
+    A product restricted to the columns requested with ``fields``; routes
+    using it exclude unset fields so unrequested columns are left out.
+    """
+
+    id: int
+    name: Optional[str] = None
+    description: Optional[str] = None
+    quantity: Optional[int] = None
+    price: Optional[float] = None
+    is_active: Optional[bool] = None
+    image_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Sort column of a product list, descending with a leading "-"
+ProductSort = Literal["created_at", "-created_at", "price", "-price", "quantity", "-quantity"]
+
+
+class ProductFilter(BaseModel):
+    """
+    Optional predicates of a product list; bounds are inclusive.
+    """
+
+    is_active: Optional[bool] = None
+    min_price: Optional[float] = Field(default=None, ge=0)
+    max_price: Optional[float] = Field(default=None, ge=0)
+    min_quantity: Optional[int] = None
+    max_quantity: Optional[int] = None
+
+    @model_validator(mode="after")
+    def check_ranges(self):
+        for low, high in (("min_price", "max_price"), ("min_quantity", "max_quantity")):
+            minimum, maximum = getattr(self, low), getattr(self, high)
+            if minimum is not None and maximum is not None and minimum > maximum:
+                raise ValueError(f"{low} must not be greater than {high}")
+        return self
+
+
+class ProductBulkUpdateItem(ProductUpdate):
+    id: int
+
+
+class ProductBulkCreate(BaseModel):
+    items: list[ProductCreate] = Field(min_length=1)
+
+
+class ProductBulkUpdate(BaseModel):
+    items: list[ProductBulkUpdateItem] = Field(min_length=1)
+
+
+class ProductBulkDelete(BaseModel):
+    ids: list[int] = Field(min_length=1)
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    status: Literal["created", "updated", "deleted", "not_found", "error"]
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: list[BulkItemResult]
+
+
+class ProductImportRow(ProductCreate):
+    """
+    One record of a CSV/NDJSON import: rows with an ``id`` replace that product
+    or create it with that id, rows without one create a product.
+    """
+
+    # Limits of the product columns (INTEGER, VARCHAR(50)), checked here so one
+    # out-of-range value cannot fail a whole COPY chunk
+    id: Optional[int] = Field(default=None, ge=1, le=2**31 - 1)
+    name: str = Field(max_length=50)
+    quantity: int = Field(ge=-2**31, le=2**31 - 1)
+
+    # An unknown NDJSON key is a row error, like an unknown CSV column
+    model_config = ConfigDict(extra="forbid")
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportResult(BaseModel):
+    rows: int
+    created: int
+    updated: int
+    failed: int
+    duration_s: float
+    rows_per_s: float
+    errors: list[ImportRowError]
+    # True when more rows failed than ``errors`` lists
+    errors_truncated: bool = False
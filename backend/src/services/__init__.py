@@ -1,4 +1,7 @@
-from .product import ProductService  # noqa: F401
+from .cache import CacheBackend, InMemoryCacheBackend, LRUCache, ProductCache  # noqa: F401
+from .product import ProductService, ProductChangeListener  # noqa: F401
+from .analytics import PriceAnalyticsService  # noqa: F401
 from .user import UserService  # noqa: F401
 from .auth import AuthService  # noqa: F401
 from .jwt_manager import JWTManager  # noqa: F401
+from .engagement import EngagementAggregator, EngagementBacklogFull  # noqa: F401
@@ -0,0 +1,172 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.logger import get_logger
+from src.repositories.analytics import PERCENTILES, PriceAnalyticsRepository
+from src.schemas import PriceAnalytics, PriceHistogramBucket, PriceSummary
+
+from .product import ProductChangeListener
+
+logger = get_logger(__name__)
+
+
+class PriceAnalyticsService(ProductChangeListener):
+    """
+    Catalog price statistics aggregated by PostgreSQL instead of in Python.
+
+    With ``materialized`` the default histogram is served from materialized views
+    created at startup. Product writes mark them stale and wake a background task
+    that refreshes them concurrently, at most once every ``refresh_interval``
+    seconds, so a burst of writes costs one refresh and readers never wait for it.
+    """
+
+    def __init__(
+        self,
+        repository: PriceAnalyticsRepository,
+        session_factory: Callable[[], AsyncSession],
+        buckets: int = 20,
+        materialized: bool = True,
+        refresh_interval: float = 30.0,
+    ):
+        self.repository = repository
+        self.session_factory = session_factory
+        self.buckets = buckets
+        self.materialized = materialized
+        self.refresh_interval = refresh_interval
+        self._views_ready = False
+        self._stale = False
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def product_saved(self, product: dict) -> None:
+        self._mark_stale()
+
+    def product_deleted(self, product_id: int) -> None:
+        self._mark_stale()
+
+    def _mark_stale(self) -> None:
+        if self._views_ready:
+            self._stale = True
+            self._wakeup.set()
+
+    async def init(self) -> None:
+        """
+        Create the materialized views; statistics are computed live if this fails.
+        """
+        if not self.materialized:
+            return
+        try:
+            async with self.session_factory() as db:
+                await self.repository.create_views(db, self.buckets)
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Could not create the price statistics views: {e}")
+            return
+        self._views_ready = True
+
+    async def refresh(self) -> bool:
+        """
+        Refresh the materialized views now; returns whether they were refreshed.
+        """
+        if not self._views_ready:
+            return False
+        # Writes landing during the refresh mark the views stale again
+        self._stale = False
+        try:
+            async with self.session_factory() as db:
+                await self.repository.refresh_views(db)
+                await db.commit()
+        except Exception as e:
+            self._stale = True
+            logger.error(f"Price statistics refresh failed: {e}")
+            return False
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if not await self.refresh():
+                # Retry with the next write or after the interval
+                self._wakeup.set()
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self) -> None:
+        if self._views_ready and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def get_price_stats(self, buckets: Optional[int] = None, fresh: bool = False) -> PriceAnalytics:
+        """
+        Price summary per segment and a ``buckets``-bucket histogram.
+
+        The views answer requests for the default bucket count unless ``fresh``
+        is set; anything else is aggregated from the product table. Summary and
+        histogram are read in one REPEATABLE READ transaction, so the histogram
+        buckets always split the summary's price range.
+        """
+        buckets = buckets or self.buckets
+        async with self.session_factory() as db:
+            await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            if self._views_ready and buckets == self.buckets and not fresh:
+                summary, histogram = await self.repository.get_materialized_stats(db)
+                return self._result(summary, histogram, buckets, "materialized", self._stale)
+            summary, histogram = await self.repository.get_stats(db, buckets)
+        return self._result(summary, histogram, buckets, "live", False)
+
+    @staticmethod
+    def _summary(row: Dict[str, Any]) -> PriceSummary:
+        values = row["percentiles"] or [None] * len(PERCENTILES)
+        return PriceSummary(
+            count=row["count"],
+            mean=row["mean"],
+            stddev=row["stddev"],
+            min=row["min"],
+            max=row["max"],
+            percentiles={f"p{quantile * 100:g}": value for quantile, value in zip(PERCENTILES, values)},
+        )
+
+    def _result(
+        self,
+        summary: List[Dict[str, Any]],
+        histogram: List[Dict[str, Any]],
+        buckets: int,
+        source: str,
+        stale: bool,
+    ) -> PriceAnalytics:
+        segments = {row["segment"]: row for row in summary}
+        overall = segments["all"]
+        empty = {**overall, "count": 0, "mean": None, "stddev": None, "min": None, "max": None, "percentiles": None}
+
+        low, high = overall["min"], overall["max"]
+        bucket_counts = [[0, 0] for _ in range(buckets if low is not None and high > low else 1)]
+        for row in histogram:
+            bucket_counts[row["bucket"] - 1][0 if row["active"] else 1] += row["count"]
+        width = (high - low) / len(bucket_counts) if low is not None else 0.0
+        return PriceAnalytics(
+            all=self._summary(overall),
+            active=self._summary(segments.get("active", empty)),
+            inactive=self._summary(segments.get("inactive", empty)),
+            histogram=[
+                PriceHistogramBucket(
+                    lower=low + index * width,
+                    upper=low + (index + 1) * width,
+                    count=active + inactive,
+                    active=active,
+                    inactive=inactive,
+                )
+                for index, (active, inactive) in enumerate(bucket_counts)
+            ] if low is not None else [],
+            source=source,
+            computed_at=overall["computed_at"],
+            stale=stale,
+        )
@@ -0,0 +1,274 @@
+import json
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from src.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class CacheBackend(ABC):
+    """
+    Shared key/value store behind the in-process cache, e.g. Redis or memcached.
+
+    Values are JSON-encoded bytes. A backend that fails is skipped for the call,
+    so an outage degrades to local caching and database reads.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """
+        Return the value of ``key``, or ``None`` if it is missing or expired.
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """
+        Store ``value`` under ``key``, expiring after ``ttl`` seconds if given.
+        """
+
+    @abstractmethod
+    async def delete(self, keys: Iterable[str]) -> None:
+        """
+        Remove ``keys``; missing keys are ignored.
+        """
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        """
+        Atomically increment the integer at ``key`` (0 if missing) and return the new value.
+        """
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": type(self).__name__}
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """
+    Process-local stand-in for a shared backend, for development and single-worker deployments.
+    """
+
+    def __init__(self):
+        self._values: dict[str, tuple[bytes, float]] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._values[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._values[key] = (value, time.monotonic() + ttl if ttl else float("inf"))
+
+    async def delete(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._values.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        value = int((await self.get(key)) or 0) + 1
+        await self.set(key, str(value).encode())
+        return value
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": type(self).__name__,
+            "size": len(self._values),
+            "memory_bytes": sum(len(key) + len(value) for key, (value, _) in self._values.items()),
+        }
+
+
+class LRUCache:
+    """
+    In-process LRU of encoded values with a per-entry TTL, bounded by entry count
+    and by the total size of the stored bytes.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_bytes: int = 64 * 1024 * 1024, ttl: Optional[float] = 60):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self.memory_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _size(key: str, value: bytes) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(value)
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            self._pop(key)
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        self._pop(key)
+        size = self._size(key, value)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, time.monotonic() + self.ttl if self.ttl else float("inf"))
+        self.memory_bytes += size
+        while len(self._entries) > self.max_entries or self.memory_bytes > self.max_bytes:
+            self._pop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def delete(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._pop(key)
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.memory_bytes -= self._size(key, entry[0])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ProductCache:
+    """
+    Read-through cache of product rows and list pages.
+
+    Lookups try the local LRU, then the optional shared backend, then load from
+    the database and fill both tiers. Writes drop the rows they touched and bump
+    a generation number that is part of every list key, so all cached pages go
+    stale at once without having to be enumerated. With a shared backend the
+    generation lives there and is read once per list lookup; local entries of
+    other workers can lag a write by at most the local TTL.
+    """
+
+    GENERATION_KEY = "products:generation"
+
+    def __init__(
+        self,
+        local: LRUCache,
+        shared: Optional[CacheBackend] = None,
+        shared_ttl: Optional[float] = 300,
+    ):
+        self.local = local
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+        self._generation = 0
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.shared_errors = 0
+
+    @staticmethod
+    def item_key(product_id: int) -> str:
+        return f"products:item:{product_id}"
+
+    async def list_key(self, *params: Any) -> Optional[str]:
+        """
+        Key of a list page under the current generation, or ``None`` (bypass the
+        cache) when the shared generation cannot be read.
+        """
+        generation = self._generation
+        if self.shared is not None:
+            try:
+                generation = int((await self.shared.get(self.GENERATION_KEY)) or 0)
+            except Exception as e:
+                self._shared_failed("read the generation", e)
+                return None
+        return f"products:list:{generation}:" + ":".join("" if param is None else str(param) for param in params)
+
+    def _shared_failed(self, action: str, error: Exception) -> None:
+        self.shared_errors += 1
+        logger.warning(f"Product cache backend failed to {action}: {error}")
+
+    async def get_or_load(
+        self,
+        key: Optional[str],
+        load: Callable[[], Awaitable[Any]],
+        valid: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """
+        Return the cached value of ``key``, calling ``load`` and caching its
+        JSON-serializable result on a miss. ``None`` results are not cached.
+        Cached values that ``valid`` rejects count as misses.
+        """
+        if key is None:
+            return await load()
+        value = self.local.get(key)
+        if value is not None:
+            result = json.loads(value)
+            if valid is None or valid(result):
+                self.hits += 1
+                return result
+
+        if self.shared is not None:
+            value = None
+            try:
+                value = await self.shared.get(key)
+            except Exception as e:
+                self._shared_failed("read", e)
+            if value is not None:
+                result = json.loads(value)
+                if valid is None or valid(result):
+                    self.shared_hits += 1
+                    self.local.set(key, value)
+                    return result
+
+        self.misses += 1
+        result = await load()
+        if result is None:
+            return None
+        value = json.dumps(result).encode()
+        self.local.set(key, value)
+        if self.shared is not None:
+            try:
+                await self.shared.set(key, value, self.shared_ttl)
+            except Exception as e:
+                self._shared_failed("write", e)
+        return result
+
+    async def invalidate(self, product_ids: Iterable[int] = ()) -> None:
+        """
+        Drop the cached rows of ``product_ids`` and every cached list page.
+        """
+        keys = [self.item_key(product_id) for product_id in product_ids]
+        self.local.delete(keys)
+        self._generation += 1
+        self.invalidations += 1
+        if self.shared is not None:
+            try:
+                if keys:
+                    await self.shared.delete(keys)
+                self._generation = await self.shared.incr(self.GENERATION_KEY)
+            except Exception as e:
+                self._shared_failed("invalidate", e)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            "size": len(self.local),
+            "max_entries": self.local.max_entries,
+            "memory_bytes": self.local.memory_bytes,
+            "max_bytes": self.local.max_bytes,
+            "ttl_s": self.local.ttl,
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.shared_hits) / lookups, 4) if lookups else None,
+            "evictions": self.local.evictions,
+            "expirations": self.local.expirations,
+            "invalidations": self.invalidations,
+            "generation": self._generation,
+            "shared": self.shared.stats() if self.shared is not None else None,
+            "shared_errors": self.shared_errors,
+        }
@@ -0,0 +1,237 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.logger import get_logger
+from src.repositories.engagement import EngagementRepository
+from src.schemas import EngagementEvent
+
+logger = get_logger(__name__)
+
+
+class EngagementBacklogFull(Exception):
+    """
+    Raised when unflushed events exceed the configured limit, e.g. while the database is down.
+    """
+
+
+class EngagementAggregator:
+    """
+    Buffers product engagement events as per-product counter deltas and writes
+    them to ``product_engagement`` in write-behind batches.
+
+    Recording an event is a dict update on the event loop. A background task
+    flushes every ``flush_interval`` seconds, or sooner once ``flush_events``
+    events are waiting, with one upsert per flush. A failed flush puts its deltas
+    back so nothing is lost; new events are refused once ``max_pending_events``
+    are waiting.
+    """
+
+    # Counter slots, in EngagementRepository.COUNTER_COLUMNS order
+    VIEWS, PURCHASES, RATING_SUM, RATING_COUNT = range(4)
+
+    def __init__(
+        self,
+        repository: EngagementRepository,
+        session_factory: Callable[[], AsyncSession],
+        flush_interval: float = 5.0,
+        flush_events: int = 50000,
+        max_pending_events: int = 1000000,
+        rate_window: int = 60,
+    ):
+        self.repository = repository
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.flush_events = flush_events
+        self.max_pending_events = max_pending_events
+        self.rate_window = rate_window
+        self._pending: dict[int, list] = {}
+        self._pending_events = 0
+        self._oldest_pending: Optional[float] = None
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._flush_listeners: list[Callable[[dict[int, list]], None]] = []
+        # (second, events received in that second) for the ingest rate
+        self._rate_buckets: deque[list[int]] = deque()
+        self.total_events = 0
+        self.flushed_events = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.last_flush: dict[str, Any] = {}
+
+    def record(self, events: Iterable[EngagementEvent]) -> int:
+        events = list(events)
+        if self._pending_events + len(events) > self.max_pending_events:
+            raise EngagementBacklogFull(
+                f"Engagement backlog is full ({self._pending_events} events waiting to be flushed)"
+            )
+
+        pending = self._pending
+        for event in events:
+            counters = pending.get(event.product_id)
+            if counters is None:
+                counters = pending[event.product_id] = [0, 0, 0.0, 0]
+            if event.type == "view":
+                counters[self.VIEWS] += event.quantity
+            elif event.type == "purchase":
+                counters[self.PURCHASES] += event.quantity
+            else:
+                counters[self.RATING_SUM] += event.rating
+                counters[self.RATING_COUNT] += 1
+
+        now = time.monotonic()
+        if self._oldest_pending is None:
+            self._oldest_pending = now
+        self._pending_events += len(events)
+        self.total_events += len(events)
+        self._count_rate(int(now), len(events))
+        if self._pending_events >= self.flush_events:
+            self._wakeup.set()
+        return len(events)
+
+    def _count_rate(self, second: int, count: int) -> None:
+        if self._rate_buckets and self._rate_buckets[-1][0] == second:
+            self._rate_buckets[-1][1] += count
+        else:
+            self._rate_buckets.append([second, count])
+        while self._rate_buckets and self._rate_buckets[0][0] <= second - self.rate_window:
+            self._rate_buckets.popleft()
+
+    def ingest_rate(self) -> float:
+        """
+        Events per second averaged over the last ``rate_window`` seconds.
+        """
+        self._count_rate(int(time.monotonic()), 0)
+        return sum(count for _, count in self._rate_buckets) / self.rate_window
+
+    def on_flush(self, listener: Callable[[dict[int, list]], None]) -> Callable[[dict[int, list]], None]:
+        """
+        Register a callback invoked with the per-product deltas of every successful flush.
+        """
+        self._flush_listeners.append(listener)
+        return listener
+
+    def pending_counters(self) -> dict[int, list]:
+        """
+        Return a copy of the counter deltas not yet written to the database.
+        """
+        return {product_id: list(counters) for product_id, counters in self._pending.items()}
+
+    async def flush(self) -> int:
+        """
+        Write all pending deltas with one upsert and return the number of events flushed.
+        """
+        async with self._flush_lock:
+            batch, self._pending = self._pending, {}
+            events, self._pending_events = self._pending_events, 0
+            oldest, self._oldest_pending = self._oldest_pending, None
+            if not batch:
+                return 0
+
+            started = time.monotonic()
+            try:
+                async with self.session_factory() as db:
+                    rows = await self.repository.increment(db, batch)
+                    await db.commit()
+            except Exception as e:
+                self._restore(batch, events, oldest)
+                self.failed_flushes += 1
+                self.last_flush = {"status": "failed", "error": str(e), "at": datetime.now(timezone.utc).isoformat()}
+                logger.error(f"Engagement flush of {events} events failed: {e}")
+                return 0
+            except BaseException:
+                # Cancelled mid-write: keep the batch for the next flush
+                self._restore(batch, events, oldest)
+                raise
+
+            finished = time.monotonic()
+            for listener in self._flush_listeners:
+                try:
+                    listener(batch)
+                except Exception as e:
+                    logger.error(f"Engagement flush listener {listener.__name__} failed: {e}")
+            self.flushes += 1
+            self.flushed_events += events
+            self.last_flush = {
+                "status": "ok",
+                "at": datetime.now(timezone.utc).isoformat(),
+                "events": events,
+                "products": len(batch),
+                "rows": rows,
+                "duration_ms": round((finished - started) * 1000, 3),
+                # How long the oldest event in the batch waited to be persisted
+                "lag_s": round(finished - oldest, 3),
+            }
+            return events
+
+    @asynccontextmanager
+    async def flushed(self) -> AsyncIterator[None]:
+        """
+        Flush, then hold off further flushes until the block exits, so counters read
+        inside it hold exactly the deltas passed to the flush listeners so far.
+        """
+        await self.flush()
+        async with self._flush_lock:
+            yield
+
+    def _restore(self, batch: dict[int, list], events: int, oldest: Optional[float]) -> None:
+        for product_id, deltas in batch.items():
+            counters = self._pending.get(product_id)
+            if counters is None:
+                self._pending[product_id] = deltas
+            else:
+                for slot, delta in enumerate(deltas):
+                    counters[slot] += delta
+        self._pending_events += events
+        if oldest is not None and (self._oldest_pending is None or oldest < self._oldest_pending):
+            self._oldest_pending = oldest
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop the background flusher and write whatever is still pending.
+        """
+        if self._task is not None:
+            # Holding the lock lets a flush in progress finish before the task is cancelled
+            async with self._flush_lock:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "ingest_rate_per_s": round(self.ingest_rate(), 2),
+            "total_events": self.total_events,
+            "flushed_events": self.flushed_events,
+            "pending_events": self._pending_events,
+            "pending_products": len(self._pending),
+            # Age of the oldest event that is not in the database yet
+            "flush_lag_s": (
+                round(time.monotonic() - self._oldest_pending, 3) if self._oldest_pending is not None else 0.0
+            ),
+            "flush_interval_s": self.flush_interval,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "last_flush": self.last_flush,
+        }
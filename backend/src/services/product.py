@@ -1,20 +1,194 @@
-from typing import List
+import asyncio
+import csv
+import io
+import json
+import time
+from datetime import datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
+from pydantic import ValidationError
+
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
+from src.core.logger import get_logger
 from src.repositories import ProductRepository
-from src.schemas import ProductCreate, ProductInDB, ProductUpdate
+from src.repositories.product import IMPORT_COLUMNS
+from src.schemas import (
+    BulkItemResult,
+    BulkResult,
+    ImportResult,
+    ImportRowError,
+    ProductBulkUpdateItem,
+    ProductCreate,
+    ProductFilter,
+    ProductImportRow,
+    ProductInDB,
+    ProductPartial,
+    ProductSort,
+    ProductUpdate,
+)
+from src.utils import make_etag
+
+from .cache import ProductCache
+
+
+logger = get_logger(__name__)
+
+# Per-item results, saved product dicts and deleted ids of one committed chunk
+BulkChunk = Tuple[List[BulkItemResult], List[dict], List[int]]
+
+ExportFormat = Literal["ndjson", "csv"]
+
+
+ImportFormat = Literal["csv", "ndjson"]
+
+# Exported but set by the database; skipped on import so an export can be re-imported
+IMPORT_IGNORED_COLUMNS = frozenset({"created_at", "updated_at"})
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _read_import_rows(file: BinaryIO, format: ImportFormat) -> Iterator[Tuple[int, Any]]:
+    """
+    Parse an uploaded file line by line and yield ``(line, dict)`` for every record,
+    or ``(line, error message)`` for one that cannot be parsed. Empty CSV cells are
+    treated as missing and ``IMPORT_IGNORED_COLUMNS`` are dropped in both formats.
+    Raises ``ValueError`` for a CSV header with unknown columns.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    if format == "csv":
+        reader = csv.DictReader(text)
+        unknown = sorted(set(reader.fieldnames or ()) - set(ProductImportRow.model_fields) - IMPORT_IGNORED_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(unknown)}")
+        for row in reader:
+            if None in row:
+                yield reader.line_num, f"Expected {len(reader.fieldnames)} columns, got more"
+                continue
+            yield reader.line_num, {
+                name: value for name, value in row.items() if value != "" and name not in IMPORT_IGNORED_COLUMNS
+            }
+        return
+
+    for line, raw in enumerate(text, start=1):
+        if not raw.strip():
+            continue
+        try:
+            record = json.loads(raw)
+        except ValueError as e:
+            yield line, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line, "Expected a JSON object"
+            continue
+        yield line, {name: value for name, value in record.items() if name not in IMPORT_IGNORED_COLUMNS}
+
+
+def _import_chunks(file: BinaryIO, format: ImportFormat, size: int) -> Iterator[List[Tuple[int, Any]]]:
+    """
+    Parse and validate an upload until ``size`` records are valid, then yield them
+    with the rejected ones: ``(line, ProductImportRow)`` or ``(line, error message)``.
+    Raises ``ValueError`` for a CSV header with unknown columns.
+    """
+    chunk: List[Tuple[int, Any]] = []
+    valid = line = 0
+    try:
+        for line, row in _read_import_rows(file, format):
+            if not isinstance(row, str):
+                try:
+                    row = ProductImportRow.model_validate(row)
+                    valid += 1
+                except ValidationError as e:
+                    row = _validation_message(e)
+            chunk.append((line, row))
+            if valid >= size:
+                yield chunk
+                chunk, valid = [], 0
+    except UnicodeDecodeError as e:
+        # Nothing past an undecodable byte can be trusted; keep what was read so far
+        chunk.append((line + 1, f"Invalid UTF-8: {e}"))
+    except csv.Error as e:
+        chunk.append((line + 1, f"Invalid CSV: {e}"))
+    if chunk:
+        yield chunk
+
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, item['loc'])) or 'row'}: {item['msg']}" for item in error.errors())
+
+
+class ProductChangeListener:
+    """
+    Receives the products written through ProductService, e.g. to keep
+    in-memory model state and caches in step with the catalog.
+    """
+
+    def product_saved(self, product: dict) -> None:
+        pass
+
+    def product_deleted(self, product_id: int) -> None:
+        pass
 
 
 class ProductService:
-    def __init__(self, product_repository: ProductRepository):
+    def __init__(
+        self,
+        product_repository: ProductRepository,
+        listeners: Optional[Sequence[ProductChangeListener]] = None,
+        cache: Optional[ProductCache] = None,
+    ):
         self.product_repository = product_repository
+        self.listeners = list(listeners or [])
+        self.cache = cache
+
+    def _notify_saved_data(self, data: dict) -> None:
+        for listener in self.listeners:
+            try:
+                listener.product_saved(data)
+            except Exception as e:
+                logger.error(f"{type(listener).__name__} failed on product {data['id']}: {e}")
+
+    def _notify_deleted(self, product_id: int) -> None:
+        for listener in self.listeners:
+            try:
+                listener.product_deleted(product_id)
+            except Exception as e:
+                logger.error(f"{type(listener).__name__} failed on deleted product {product_id}: {e}")
+
+    async def _commit_and_invalidate(self, db: AsyncSession, product_ids: Sequence[int]) -> None:
+        # Committing first keeps a concurrent read from caching the old rows again
+        await db.commit()
+        if self.cache is not None:
+            await self.cache.invalidate(product_ids)
 
     async def create_product(self, db: AsyncSession, product: ProductCreate) -> ProductInDB:
         """
         Create a new product in the database.
         """
         product_in_db = await self.product_repository.create(db=db, obj_in=product)
-        return product_in_db
+        # Serialized before commit, which expires the loaded row
+        data = product_in_db.as_dict()
+        await self._commit_and_invalidate(db, [data["id"]])
+        # Only after the commit, so listeners never keep a row that was rolled back
+        self._notify_saved_data(data)
+        return ProductInDB(**data)
 
     async def update_product(self, db: AsyncSession, product_id: int, product_update: ProductUpdate) -> ProductInDB:
         """
@@ -22,24 +196,374 @@ class ProductService:
         """
         product = await self.product_repository.get(db=db, id=product_id)
         updated_product = await self.product_repository.update(db=db, db_obj=product, obj_in=product_update)
-        return updated_product
+        data = updated_product.as_dict()
+        await self._commit_and_invalidate(db, [product_id])
+        self._notify_saved_data(data)
+        return ProductInDB(**data)
 
-    async def delete_product(self, db: AsyncSession, product_id: int) -> None:
+    async def delete_product(self, db: AsyncSession, product_id: int) -> ProductInDB:
         """
         Delete a product from the database.
         """
-        return await self.product_repository.remove(db=db, id=product_id)
+        product = await self.product_repository.remove(db=db, id=product_id)
+        data = product.as_dict()
+        await self._commit_and_invalidate(db, [product_id])
+        self._notify_deleted(product_id)
+        return ProductInDB(**data)
 
-    async def get_all_products(self, db: AsyncSession, skip: int = 0, limit: int = 100) -> List[ProductInDB]:
+    async def _apply_in_chunks(
+        self,
+        db: AsyncSession,
+        items: List[Tuple[int, Any]],
+        chunk_size: int,
+        apply: Callable[[AsyncSession, List[Tuple[int, Any]]], Awaitable[BulkChunk]],
+    ) -> List[BulkItemResult]:
         """
-        Retrieve all products from the database with pagination.
+        Run ``apply`` over ``(index, item)`` pairs ``chunk_size`` at a time, committing
+        after each chunk. A chunk the database rejects is rolled back and retried one
+        item at a time, so only the offending items are reported as errors.
         """
-        products = await self.product_repository.get_multi(db=db, skip=skip, limit=limit)
-        return products
+        results = []
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            try:
+                chunk_results, saved, deleted = await apply(db, chunk)
+                await db.commit()
+            except SQLAlchemyError as e:
+                await db.rollback()
+                # The driver's own exception carries the message without the statement and parameters
+                error = getattr(e, "orig", None) or e
+                error = str(error.__cause__ or error).splitlines()[0]
+                if len(chunk) > 1:
+                    logger.warning(f"Bulk chunk of {len(chunk)} products failed, retrying item by item: {error}")
+                    results.extend(await self._apply_in_chunks(db, chunk, 1, apply))
+                else:
+                    results.append(BulkItemResult(index=chunk[0][0], status="error", error=error))
+                continue
+
+            results.extend(chunk_results)
+            for data in saved:
+                self._notify_saved_data(data)
+            for product_id in deleted:
+                self._notify_deleted(product_id)
+            if self.cache is not None and (saved or deleted):
+                await self.cache.invalidate([data["id"] for data in saved] + list(deleted))
+        return results
+
+    @staticmethod
+    def _bulk_result(results: List[BulkItemResult]) -> BulkResult:
+        failed = sum(1 for result in results if result.status in ("not_found", "error"))
+        return BulkResult(succeeded=len(results) - failed, failed=failed, results=results)
 
-    async def get_product_by_id(self, db: AsyncSession, product_id: int) -> ProductInDB:
+    async def bulk_create_products(
+        self, db: AsyncSession, products: Sequence[ProductCreate], chunk_size: int = 1000
+    ) -> BulkResult:
         """
-        Retrieve a product by ID.
+        Create products in chunks of multi-row inserts.
         """
-        product = await self.product_repository.get(db=db, id=product_id)
-        return product
+        async def apply(db: AsyncSession, chunk: List[Tuple[int, ProductCreate]]) -> BulkChunk:
+            created = await self.product_repository.bulk_create(db=db, objs_in=[item for _, item in chunk])
+            # Serialized before commit, which expires the loaded rows
+            saved = [product.as_dict() for product in created]
+            results = [
+                BulkItemResult(index=index, id=data["id"], status="created")
+                for (index, _), data in zip(chunk, saved)
+            ]
+            return results, saved, []
+
+        return self._bulk_result(await self._apply_in_chunks(db, list(enumerate(products)), chunk_size, apply))
+
+    async def bulk_update_products(
+        self, db: AsyncSession, products: Sequence[ProductBulkUpdateItem], chunk_size: int = 1000
+    ) -> BulkResult:
+        """
+        Partially update products in chunks of ``UPDATE ... FROM (VALUES ...)`` statements.
+
+        An id may appear once per request: Postgres applies an arbitrary one of several
+        joined VALUES rows, so repeats are reported as errors and not sent.
+        """
+        async def apply(db: AsyncSession, chunk: List[Tuple[int, ProductBulkUpdateItem]]) -> BulkChunk:
+            updated = await self.product_repository.bulk_update(
+                db=db, objs_in=[item.model_dump(exclude_unset=True) | {"id": item.id} for _, item in chunk]
+            )
+            saved = {product.id: product.as_dict() for product in updated}
+            results = [
+                BulkItemResult(index=index, id=item.id, status="updated" if item.id in saved else "not_found")
+                for index, item in chunk
+            ]
+            return results, list(saved.values()), []
+
+        first_index: Dict[int, int] = {}
+        items: List[Tuple[int, ProductBulkUpdateItem]] = []
+        duplicates: List[BulkItemResult] = []
+        for index, item in enumerate(products):
+            if item.id in first_index:
+                error = f"Duplicate id {item.id}, first sent at index {first_index[item.id]}"
+                duplicates.append(BulkItemResult(index=index, id=item.id, status="error", error=error))
+            else:
+                first_index[item.id] = index
+                items.append((index, item))
+        results = await self._apply_in_chunks(db, items, chunk_size, apply)
+        return self._bulk_result(sorted(results + duplicates, key=lambda result: result.index))
+
+    async def bulk_delete_products(self, db: AsyncSession, ids: Sequence[int], chunk_size: int = 1000) -> BulkResult:
+        """
+        Delete products in chunks of ``DELETE ... WHERE id = ANY(...)`` statements.
+        """
+        async def apply(db: AsyncSession, chunk: List[Tuple[int, int]]) -> BulkChunk:
+            deleted = await self.product_repository.bulk_remove(db=db, ids=[product_id for _, product_id in chunk])
+            found = set(deleted)
+            results = [
+                BulkItemResult(index=index, id=product_id, status="deleted" if product_id in found else "not_found")
+                for index, product_id in chunk
+            ]
+            return results, [], deleted
+
+        return self._bulk_result(await self._apply_in_chunks(db, list(enumerate(ids)), chunk_size, apply))
+
+    async def import_products(
+        self,
+        db: AsyncSession,
+        file: BinaryIO,
+        format: ImportFormat = "csv",
+        chunk_size: int = 5000,
+        max_errors: int = 1000,
+    ) -> ImportResult:
+        """
+        Import products from a CSV or NDJSON file, reading it as a stream.
+
+        Records are parsed and validated in a worker thread, off the event loop,
+        and every ``chunk_size`` valid ones are copied into a staging table and upserted, then committed. A
+        chunk the database rejects is retried record by record. Rows that fail
+        parsing, validation or the database are reported by line, up to ``max_errors``.
+        """
+        started = time.monotonic()
+        rows = created = updated = failed = 0
+        errors: List[ImportRowError] = []
+
+        def fail(line: int, error: str) -> None:
+            nonlocal failed
+            failed += 1
+            if len(errors) < max_errors:
+                errors.append(ImportRowError(line=line, error=error))
+
+        async def apply(db: AsyncSession, chunk: List[Tuple[int, tuple]]) -> BulkChunk:
+            updated_rows, created_rows = await self.product_repository.copy_upsert(
+                db=db, records=[record for _, record in chunk]
+            )
+            updated_ids = {row["id"] for row in updated_rows}
+            results = [
+                BulkItemResult(index=line, id=record[1], status="updated" if record[1] in updated_ids else "created")
+                for line, record in chunk
+            ]
+            # Same shape as TableBase.as_dict, without building ORM objects
+            saved = [
+                {name: value.isoformat() if isinstance(value, datetime) else value for name, value in row.items()}
+                for row in updated_rows + created_rows
+            ]
+            return results, saved, []
+
+        async def flush(chunk: List[Tuple[int, tuple]]) -> None:
+            nonlocal created, updated
+            for result in await self._apply_in_chunks(db, chunk, len(chunk), apply):
+                if result.status == "created":
+                    created += 1
+                elif result.status == "updated":
+                    updated += 1
+                else:
+                    fail(result.index, result.error)
+
+        # Reading, parsing and validating are blocking, so each chunk is prepared in a worker thread
+        chunks = _import_chunks(file, format, chunk_size)
+        while True:
+            parsed = await asyncio.to_thread(next, chunks, None)
+            if parsed is None:
+                break
+            rows += len(parsed)
+            chunk: List[Tuple[int, tuple]] = []
+            for line, product in parsed:
+                if isinstance(product, str):
+                    fail(line, product)
+                else:
+                    chunk.append((line, (line, *(getattr(product, name) for name in IMPORT_COLUMNS[1:]))))
+            if chunk:
+                await flush(chunk)
+
+        errors.sort(key=lambda error: error.line)
+        duration = time.monotonic() - started
+        logger.info(f"Imported {created + updated} of {rows} products in {duration:.2f}s ({failed} failed)")
+        return ImportResult(
+            rows=rows,
+            created=created,
+            updated=updated,
+            failed=failed,
+            duration_s=round(duration, 3),
+            rows_per_s=round(rows / duration, 1) if duration else 0.0,
+            errors=errors,
+            errors_truncated=failed > len(errors),
+        )
+
+    async def _cached(self, key: Optional[str], load: Callable[[], Awaitable[Any]]) -> Any:
+        if self.cache is None:
+            return await load()
+        return await self.cache.get_or_load(key, load)
+
+    async def get_products_page(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        fields: Optional[Sequence[str]] = None,
+        etag: Optional[str] = None,
+        filters: Optional[ProductFilter] = None,
+        sort: Optional[ProductSort] = None,
+    ) -> Tuple[List[ProductPartial], Optional[str]]:
+        """
+        Retrieve a page of products matching ``filters`` in ``sort`` order, with only
+        the requested fields, and the cursor of the next page.
+
+        Without ``fields`` heavy columns such as ``image_url`` are left out. Passing
+        the page ``etag`` keys the cached page on it, so a page cached before a
+        write is never served under the new tag.
+        """
+        fields = self.product_repository.resolve_fields(fields, include_heavy=False)
+        where = self.product_repository.filter_conditions(filters)
+
+        async def load() -> dict:
+            products, next_cursor = await self.product_repository.get_page(
+                db=db, limit=limit, cursor=cursor, skip=skip, fields=fields, sort=sort, where=where
+            )
+            return {
+                "products": [
+                    self._partial(product, fields).model_dump(mode="json", exclude_unset=True) for product in products
+                ],
+                "next_cursor": next_cursor,
+            }
+
+        filter_key = filters.model_dump_json(exclude_none=True) if filters is not None else None
+        parts = ("page", limit, cursor, skip, ",".join(fields), sort, filter_key, etag)
+        key = await self.cache.list_key(*parts) if self.cache is not None else None
+        page = await self._cached(key, load)
+        return [ProductPartial(**data) for data in page["products"]], page["next_cursor"]
+
+    async def search_products(
+        self,
+        db: AsyncSession,
+        q: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> Tuple[List[ProductPartial], Optional[str]]:
+        """
+        Search products by name and description, best match first, with the cursor of the next page.
+        """
+        fields = self.product_repository.resolve_fields(fields, include_heavy=False)
+        products, next_cursor = await self.product_repository.search(
+            db=db, q=q, limit=limit, cursor=cursor, fields=fields
+        )
+        return [self._partial(product, fields) for product in products], next_cursor
+
+    async def get_products_page_etag(
+        self,
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        fields: Optional[Sequence[str]] = None,
+        filters: Optional[ProductFilter] = None,
+        sort: Optional[ProductSort] = None,
+    ) -> str:
+        """
+        Entity tag of the page ``get_products_page`` returns, computed from the ids
+        and modification times of its rows only.
+        """
+        fields = self.product_repository.resolve_fields(fields, include_heavy=False)
+        versions = await self.product_repository.get_page_versions(
+            db=db,
+            limit=limit,
+            cursor=cursor,
+            skip=skip,
+            sort=sort,
+            where=self.product_repository.filter_conditions(filters),
+        )
+        return make_etag(fields, limit, sort, versions)
+
+    async def get_product_version(
+        self, db: AsyncSession, product_id: int, fields: Optional[Sequence[str]] = None
+    ) -> Tuple[str, datetime]:
+        """
+        Entity tag and modification time of a product, without loading the row.
+        """
+        fields = self.product_repository.resolve_fields(fields)
+        updated_at = await self.product_repository.get_version(db=db, id=product_id)
+        return make_etag(fields, product_id, updated_at), updated_at
+
+    async def get_product_by_id(
+        self,
+        db: AsyncSession,
+        product_id: int,
+        fields: Optional[Sequence[str]] = None,
+        updated_at: Optional[datetime] = None,
+    ) -> ProductPartial:
+        """
+        Retrieve a product by ID with the requested fields, all of them by default.
+
+        A cached row older than ``updated_at`` is reloaded.
+        """
+        fields = self.product_repository.resolve_fields(fields)
+        if self.cache is None:
+            product = await self.product_repository.get(db=db, id=product_id, fields=fields)
+            return self._partial(product, fields)
+
+        # The whole row is cached so any field selection can be served from it
+        async def load() -> dict:
+            return (await self.product_repository.get(db=db, id=product_id)).as_dict()
+
+        def current(data: dict) -> bool:
+            return updated_at is None or data["updated_at"] == updated_at.isoformat()
+
+        data = await self.cache.get_or_load(self.cache.item_key(product_id), load, valid=current)
+        return ProductPartial(**{name: data[name] for name in fields})
+
+    async def export_products(
+        self,
+        db: AsyncSession,
+        format: ExportFormat = "ndjson",
+        fields: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[str]:
+        """
+        Stream every product, oldest first, encoded as NDJSON lines or CSV rows.
+
+        Rows come from a server-side cursor ``chunk_size`` at a time and each
+        chunk is encoded into one string, so memory stays flat whatever the
+        catalog size. All columns are exported unless ``fields`` narrows them.
+        """
+        fields = self.product_repository.resolve_fields(fields)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if format == "csv":
+            writer.writerow(fields)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        async for rows in self.product_repository.stream_after(db, chunk_size=chunk_size, columns=fields):
+            if format == "csv":
+                writer.writerows(
+                    [row[name].isoformat() if isinstance(row[name], datetime) else row[name] for name in fields]
+                    for row in rows
+                )
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(row, default=_json_default))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    @staticmethod
+    def _partial(product, fields: Sequence[str]) -> ProductPartial:
+        # Only touch loaded attributes; reading a deferred one would lazy load
+        return ProductPartial(**{name: getattr(product, name) for name in fields})
@@ -1,3 +1,5 @@
+from typing import Optional, Tuple
+
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.logger import get_logger
@@ -55,6 +57,14 @@ class UserService:
         users = await self.user_repository.get_multi(db=db, skip=skip, limit=limit)
         return users
 
+    async def get_users_page(
+        self, db: AsyncSession, limit: int = 100, cursor: Optional[str] = None, skip: int = 0
+    ) -> Tuple[list[UserInDB], Optional[str]]:
+        """
+        Retrieve a page of users and the cursor of the next page.
+        """
+        return await self.user_repository.get_page(db=db, limit=limit, cursor=cursor, skip=skip)
+
     async def get_user_by_id(self, db: AsyncSession, user_id: int) -> UserInDB:
         """
         Retrieve a user by ID.
@@ -1,2 +1,5 @@
 from .password_manager import PasswordManager  # noqa: F401
-from .totp_manager import TOTPManager  # noqa: F401
\ No newline at end of file
+from .totp_manager import TOTPManager  # noqa: F401
+from .cursor import encode_cursor, decode_cursor  # noqa: F401
+from .etag import make_etag, etag_matches, format_http_date, not_modified_since  # noqa: F401
+from .responses import json_response  # noqa: F401
@@ -0,0 +1,32 @@
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adapter(type_: Any) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+def json_response(
+    type_: Any,
+    content: Any,
+    *,
+    exclude_unset: bool = False,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """
+    Validate ``content`` as ``type_`` once and encode it straight to JSON bytes with pydantic-core.
+
+    Returning the response skips FastAPI's ``response_model`` round trip (dump to
+    dicts, validate again, ``jsonable_encoder``, stdlib ``json``); routes keep
+    ``response_model`` for the OpenAPI schema. ORM objects are read with
+    ``from_attributes``; instances of the models in ``type_`` are not revalidated.
+    Headers set on an injected ``Response`` are not applied, so pass them here.
+    """
+    adapter = _adapter(type_)
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True), exclude_unset=exclude_unset)
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
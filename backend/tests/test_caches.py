@@ -0,0 +1,106 @@
+"""
+Checks the bounds, expiry and invalidation of the in-process product page
+cache and the price prediction cache.
+"""
+import numpy as np
+import pytest
+
+from src.ml import cache as prediction_cache
+from src.ml.cache import PredictionCache
+from src.services import cache as product_cache
+from src.services.cache import LRUCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(product_cache.time, "monotonic", clock)
+    monkeypatch.setattr(prediction_cache.time, "monotonic", clock)
+    return clock
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2, ttl=None)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    assert cache.get("a") == b"1"
+    cache.set("c", b"3")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (b"1", b"3")
+    assert cache.evictions == 1
+
+
+def test_lru_cache_bounds_bytes():
+    value = b"x" * 1000
+    cache = LRUCache(max_entries=100, max_bytes=3 * LRUCache._size("k0", value), ttl=None)
+    for i in range(5):
+        cache.set(f"k{i}", value)
+    assert len(cache) == 3
+    assert cache.memory_bytes <= cache.max_bytes
+    cache.set("huge", b"x" * cache.max_bytes)
+    assert cache.get("huge") is None and len(cache) == 3
+    cache.delete([f"k{i}" for i in range(5)])
+    assert len(cache) == 0 and cache.memory_bytes == 0
+
+
+def test_lru_cache_expires(clock: Clock):
+    cache = LRUCache(ttl=10)
+    cache.set("a", b"1")
+    clock.now += 5
+    assert cache.get("a") == b"1"
+    clock.now += 6
+    assert cache.get("a") is None
+    assert cache.expirations == 1 and cache.memory_bytes == 0
+
+
+def test_prediction_cache_keys_on_version_and_features():
+    row = np.array([1.0, 2.0, 3.0])
+    assert PredictionCache.key("v1", row) == PredictionCache.key("v1", row.copy())
+    assert PredictionCache.key("v1", row) != PredictionCache.key("v2", row)
+    assert PredictionCache.key("v1", row) != PredictionCache.key("v1", row + 1e-9)
+
+
+def test_prediction_cache_invalidates_product():
+    cache = PredictionCache(max_entries=10, ttl=None)
+    cache.put(("v1", b"a"), 1.0, product_id=1)
+    cache.put(("v1", b"b"), 2.0, product_id=1)
+    cache.put(("v1", b"c"), 3.0, product_id=2)
+    cache.invalidate_product(1)
+    assert cache.get(("v1", b"a")) is None and cache.get(("v1", b"b")) is None
+    assert cache.get(("v1", b"c")) == 3.0
+    assert cache.invalidations == 2
+
+
+def test_prediction_cache_prunes_product_index_on_eviction():
+    cache = PredictionCache(max_entries=3, ttl=None)
+    for i in range(10):
+        cache.put(("v1", i), float(i), product_id=i)
+    assert cache.evictions == 7
+    assert set(cache._product_keys) == {7, 8, 9}
+
+
+def test_prediction_cache_prunes_product_index_on_expiry(clock: Clock):
+    cache = PredictionCache(ttl=10)
+    cache.put(("v1", b"a"), 1.0, product_id=1)
+    clock.now += 11
+    assert cache.get(("v1", b"a")) is None
+    assert cache.expirations == 1
+    assert cache._product_keys == {}
+
+
+def test_prediction_cache_key_moves_to_latest_product():
+    cache = PredictionCache(ttl=None)
+    # Products with identical features share a key
+    cache.put(("v1", b"a"), 1.0, product_id=1)
+    cache.put(("v1", b"a"), 1.0, product_id=2)
+    assert cache._product_keys == {2: {("v1", b"a")}}
+    cache.invalidate_product(2)
+    assert cache.stats()["size"] == 0 and cache._product_keys == {}
@@ -0,0 +1,64 @@
+"""
+Checks that compiled price models predict what the fitted estimators they were
+compiled from predict, including rows with missing features.
+"""
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from xgboost import XGBRegressor
+
+from src.ml.compiled import CompiledModel
+from src.ml.export import compile_model
+
+
+def _data(rows: int = 400, features: int = 6) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(7)
+    X = rng.normal(size=(rows, features)) * [1, 10, 100, 0.1, 5, 50]
+    y = X @ rng.normal(size=features) + np.sin(X[:, 0]) * 20 + rng.normal(size=rows)
+    return X, y
+
+
+def _with_missing(X: np.ndarray) -> np.ndarray:
+    X = X.copy()
+    X[::7, 1] = np.nan
+    X[::11, 4] = np.nan
+    return X
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        RandomForestRegressor(n_estimators=20, max_depth=8, random_state=0),
+        XGBRegressor(n_estimators=30, max_depth=5, random_state=0, n_jobs=1),
+    ],
+    ids=["random_forest", "xgboost"],
+)
+def test_compiled_tree_ensembles_match(model):
+    X, y = _data()
+    if isinstance(model, RandomForestRegressor):
+        # scikit-learn forests only route missing values when trained with them
+        model.fit(_with_missing(X), y)
+    else:
+        model.fit(X, y)
+    X_test = _with_missing(_data(100)[0])
+    np.testing.assert_allclose(compile_model(model).predict(X_test), model.predict(X_test), rtol=1e-6, atol=1e-6)
+
+
+def test_compiled_linear_matches():
+    X, y = _data()
+    model = LinearRegression().fit(X, y)
+    np.testing.assert_allclose(compile_model(model).predict(X), model.predict(X), rtol=1e-9)
+
+
+def test_compiled_model_round_trips(tmp_path):
+    X, y = _data()
+    compiled = compile_model(XGBRegressor(n_estimators=10, max_depth=3, random_state=0, n_jobs=1).fit(X, y))
+    path = str(tmp_path / "model.npz")
+    compiled.save(path)
+    np.testing.assert_array_equal(CompiledModel.load(path).predict(X), compiled.predict(X))
+
+
+def test_compile_rejects_unknown_models():
+    with pytest.raises(TypeError):
+        compile_model(object())
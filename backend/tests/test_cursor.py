@@ -0,0 +1,34 @@
+"""
+Checks that keyset cursors round-trip and that malformed ones are rejected.
+"""
+from datetime import datetime
+
+import pytest
+
+from src.utils.cursor import decode_cursor, encode_cursor
+
+
+@pytest.mark.parametrize("values", [[1], ["2026-01-01T00:00:00", 42], [0.75, 9], [None, 3], ["ünïcode", -1]])
+def test_cursor_round_trips(values):
+    token = encode_cursor(values)
+    assert "=" not in token and "+" not in token and "/" not in token
+    assert decode_cursor(token, len(values)) == values
+
+
+def test_cursor_encodes_other_values_as_strings():
+    assert decode_cursor(encode_cursor([datetime(2026, 1, 1), 1]), 2) == ["2026-01-01 00:00:00", 1]
+
+
+@pytest.mark.parametrize(
+    "token, size",
+    [
+        ("%%%", 2),  # not base64
+        ("bm90IGpzb24", 2),  # "not json"
+        (encode_cursor({"a": 1}), 1),  # not a list
+        (encode_cursor([1, 2, 3]), 2),  # wrong size
+        ("", 1),
+    ],
+)
+def test_cursor_rejects_malformed(token: str, size: int):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(token, size)
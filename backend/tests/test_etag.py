@@ -0,0 +1,52 @@
+"""
+Checks the entity tag and HTTP date helpers behind conditional GETs.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.utils.etag import etag_matches, format_http_date, make_etag, not_modified_since
+
+
+def test_make_etag_is_weak_and_stable():
+    etag = make_etag(1, "2026-01-01", None)
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert etag == make_etag(1, "2026-01-01", None)
+    assert etag != make_etag(2, "2026-01-01", None)
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ("", False),
+        ("*", True),
+        ('W/"abc"', True),
+        ('"abc"', True),  # weak comparison ignores the W/ prefix
+        ('"other", W/"abc"', True),
+        ('"other"', False),
+    ],
+)
+def test_etag_matches(header, expected: bool):
+    assert etag_matches(header, 'W/"abc"') is expected
+
+
+def test_format_http_date_treats_naive_as_utc():
+    naive = datetime(2026, 1, 2, 3, 4, 5, 678)
+    assert format_http_date(naive) == "Fri, 02 Jan 2026 03:04:05 GMT"
+    aware = datetime(2026, 1, 2, 5, 4, 5, tzinfo=timezone(timedelta(hours=2)))
+    assert format_http_date(aware) == format_http_date(naive)
+
+
+def test_not_modified_since():
+    modified = datetime(2026, 1, 2, 3, 4, 5, 678000)
+    header = format_http_date(modified)
+    # HTTP dates have one second resolution, so sub-second changes still match
+    assert not_modified_since(header, modified)
+    assert not_modified_since(format_http_date(modified + timedelta(hours=1)), modified)
+    assert not not_modified_since(header, modified + timedelta(seconds=1))
+
+
+@pytest.mark.parametrize("header", [None, "", "yesterday", "Fri, 99 Jan 2026 03:04:05 GMT"])
+def test_not_modified_since_ignores_invalid_dates(header):
+    assert not not_modified_since(header, datetime(2026, 1, 2))
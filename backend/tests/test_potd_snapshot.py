@@ -0,0 +1,60 @@
+"""
+Checks the partial top-k selection and cursor paging of products of the day
+snapshots against a full sort.
+"""
+import json
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.ml.potd_snapshot import ProductsOfTheDaySnapshot, top_k_indices
+from src.utils.cursor import encode_cursor
+
+
+def _ranked(scores: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    return np.lexsort((ids, -scores))
+
+
+@pytest.mark.parametrize("k", [0, 1, 5, 37, 200, 500])
+def test_top_k_indices_matches_full_sort(k: int):
+    rng = np.random.default_rng(k)
+    # Few distinct scores, so ties straddle the k-th position
+    scores = rng.integers(0, 10, size=300).astype(np.float64) / 10
+    ids = rng.permutation(300) + 1
+    np.testing.assert_array_equal(top_k_indices(scores, ids, k), _ranked(scores, ids)[:k])
+
+
+def test_top_k_indices_empty():
+    assert len(top_k_indices(np.empty(0), np.empty(0, dtype=np.int64), 3)) == 0
+
+
+def _snapshot(count: int) -> ProductsOfTheDaySnapshot:
+    rng = np.random.default_rng(count)
+    scores = np.round(rng.uniform(0.5, 1.0, size=count), 1)
+    ids = rng.permutation(count) + 1
+    records = [json.dumps({"id": int(product_id)}).encode() for product_id in ids]
+    return ProductsOfTheDaySnapshot(date(2026, 1, 1), "v1", scores, ids, records)
+
+
+@pytest.mark.parametrize("k", [1, 7, 50, 120])
+def test_snapshot_pages_cover_ranking_once(k: int):
+    snapshot = _snapshot(100)
+    expected = [int(product_id) for product_id in snapshot.ids[_ranked(snapshot.scores, snapshot.ids)]]
+    seen, cursor = [], None
+    while True:
+        page = json.loads(snapshot.page(k, cursor))
+        assert page["count"] == 100
+        assert len(page["products"]) <= k
+        seen.extend(product["id"] for product in page["products"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+def test_snapshot_rejects_invalid_cursor():
+    snapshot = _snapshot(10)
+    for cursor in ("not-a-cursor", encode_cursor([1.0]), encode_cursor(["a", 1])):
+        with pytest.raises(ValueError):
+            snapshot.page(5, cursor)
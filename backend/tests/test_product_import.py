@@ -0,0 +1,90 @@
+"""
+Checks how CSV and NDJSON uploads are parsed, validated and chunked for import,
+without a database.
+"""
+import io
+import json
+
+import pytest
+
+from src.schemas import ProductImportRow
+from src.services.product import _import_chunks, _read_import_rows
+
+
+def _rows(data: bytes, format: str) -> list:
+    return list(_read_import_rows(io.BytesIO(data), format))
+
+
+def test_csv_rows_skip_empty_cells_and_database_columns():
+    data = (
+        "﻿id,name,description,price,quantity,is_active,image_url,created_at,updated_at\n"
+        '1,Lamp,"warm, dimmable",12.5,3,true,,2026-01-01,2026-01-02\n'
+        ",Desk,,80,1,false,,,\n"
+    ).encode("utf-8")
+    assert _rows(data, "csv") == [
+        (2, {"id": "1", "name": "Lamp", "description": "warm, dimmable", "price": "12.5", "quantity": "3",
+             "is_active": "true"}),
+        (3, {"name": "Desk", "price": "80", "quantity": "1", "is_active": "false"}),
+    ]
+
+
+def test_csv_rows_report_extra_cells_by_line():
+    rows = _rows(b"name,price\na,1\nb,2,3\n", "csv")
+    assert rows[0] == (2, {"name": "a", "price": "1"})
+    assert rows[1][0] == 3 and "got more" in rows[1][1]
+
+
+def test_csv_rejects_unknown_columns():
+    with pytest.raises(ValueError, match="Unknown columns: bogus"):
+        _rows(b"name,bogus\na,b\n", "csv")
+
+
+def test_ndjson_rows():
+    data = b"\n".join([
+        json.dumps({"id": 5, "name": "a", "created_at": "2026-01-01"}).encode(),
+        b"",
+        b"{bad",
+        b"[1, 2]",
+        json.dumps({"name": "b"}).encode(),
+    ])
+    rows = _rows(data, "ndjson")
+    assert rows[0] == (1, {"id": 5, "name": "a"})
+    assert rows[1][0] == 3 and rows[1][1].startswith("Invalid JSON")
+    assert rows[2] == (4, "Expected a JSON object")
+    assert rows[3] == (5, {"name": "b"})
+
+
+def test_chunks_hold_size_valid_rows_plus_rejected_ones():
+    lines = ["name,description,price,quantity"]
+    lines += [f"p{i},d,{i},1" for i in range(5)]
+    lines.insert(3, "bad,d,not-a-price,1")
+    chunks = list(_import_chunks(io.BytesIO("\n".join(lines).encode()), "csv", size=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 3, 1]
+    line, error = chunks[1][0]
+    assert line == 4 and error.startswith("price:")
+    valid = [row for chunk in chunks for _, row in chunk if isinstance(row, ProductImportRow)]
+    assert [row.name for row in valid] == [f"p{i}" for i in range(5)]
+    assert valid[0].id is None and valid[0].is_active is True
+
+
+def test_chunks_validate_column_limits():
+    data = "\n".join([
+        json.dumps({"id": 0, "name": "a", "description": "d", "price": 1, "quantity": 1}),
+        json.dumps({"name": "x" * 51, "description": "d", "price": 1, "quantity": 1}),
+        json.dumps({"name": "a", "description": "d", "price": 1, "quantity": 1, "bogus": 1}),
+    ]).encode()
+    (chunk,) = _import_chunks(io.BytesIO(data), "ndjson", size=10)
+    assert [line for line, _ in chunk] == [1, 2, 3]
+    assert all(isinstance(error, str) for _, error in chunk)
+    assert chunk[0][1].startswith("id:") and chunk[1][1].startswith("name:") and chunk[2][1].startswith("bogus:")
+
+
+def test_chunks_stop_at_invalid_utf8():
+    # Past the first block the text reader decodes, so earlier rows are kept
+    data = b"name,description,price,quantity\n" + b"a,d,1,1\n" * 2000 + b"\xff\xfe,d,1,1\nb,d,1,1\n"
+    chunks = list(_import_chunks(io.BytesIO(data), "csv", size=5000))
+    rows = [row for chunk in chunks for _, row in chunk]
+    assert all(isinstance(row, ProductImportRow) for row in rows[:-1])
+    assert 0 < len(rows) - 1 <= 2000
+    assert rows[-1].startswith("Invalid UTF-8")
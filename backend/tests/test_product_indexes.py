@@ -0,0 +1,114 @@
+"""
+Checks that filtered and sorted product pages are planned on the indexes
+declared for them on ``ProductTable``.
+
+Runs ``EXPLAIN (FORMAT JSON)`` on the queries ``ProductRepository.get_page``
+builds, against a throwaway copy of the product table in its own schema,
+inside a transaction that is rolled back. Skipped when ``DATABASE_URL`` is not
+set or the database cannot be reached.
+"""
+import asyncio
+import os
+
+import pytest
+from dotenv import load_dotenv
+
+load_dotenv()
+
+if not os.getenv("DATABASE_URL"):
+    pytest.skip("DATABASE_URL is not set", allow_module_level=True)
+
+from sqlalchemy import select, text  # noqa: E402
+from sqlalchemy.dialects import postgresql  # noqa: E402
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+from sqlalchemy.schema import CreateIndex, CreateTable  # noqa: E402
+from src.core.db.models import ProductTable  # noqa: E402
+from src.repositories import ProductRepository  # noqa: E402
+from src.schemas import ProductFilter  # noqa: E402
+from src.utils import encode_cursor  # noqa: E402
+
+SCHEMA = "test_product_indexes"
+ROWS = 50000
+
+# (case, filters, sort, cursor values, expected index)
+CASES = [
+    (
+        "active price range, low stock, by price",
+        ProductFilter(is_active=True, min_price=100, max_price=500, max_quantity=10),
+        "price",
+        None,
+        "ix_product_is_active_price_id",
+    ),
+    (
+        "active price range, by price, next page",
+        ProductFilter(is_active=True, min_price=100, max_price=500),
+        "price",
+        [300.0, 5],
+        "ix_product_is_active_price_id",
+    ),
+    ("inactive, by price descending", ProductFilter(is_active=False), "-price", None, "ix_product_is_active_price_id"),
+    ("by price", None, "price", None, "ix_product_price_id"),
+    ("min price, by price descending", ProductFilter(min_price=100), "-price", None, "ix_product_price_id"),
+    ("by price, next page", None, "price", [250.0, 1000], "ix_product_price_id"),
+    ("low stock, by quantity", ProductFilter(max_quantity=5), "quantity", None, "ix_product_quantity_id"),
+    ("by quantity descending, next page", None, "-quantity", [50, 2000], "ix_product_quantity_id"),
+]
+
+
+def _plan_indexes(plan: dict) -> set[str]:
+    indexes = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", ()):
+        indexes |= _plan_indexes(child)
+    return indexes
+
+
+async def _explain_cases() -> dict[str, set[str]]:
+    repository = ProductRepository()
+    table = ProductTable.__table__
+    engine = create_async_engine(os.environ["DATABASE_URL"].replace("postgresql://", "postgresql+asyncpg://"))
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            await conn.execute(text(f"SET LOCAL search_path TO {SCHEMA}"))
+            # Only the declared columns and indexes; the search DDL hooked to create_all is not needed here
+            await conn.execute(CreateTable(table))
+            for index in table.indexes:
+                await conn.execute(CreateIndex(index))
+            await conn.execute(text(
+                "INSERT INTO product (name, description, price, quantity, is_active, created_at) "
+                "SELECT 'p' || g, 'd', (g % 1000)::float, (g * 7) % 100, g % 3 <> 0, now() - g * interval '1 second' "
+                f"FROM generate_series(1, {ROWS}) g"
+            ))
+            await conn.execute(text("ANALYZE product"))
+
+            plans = {}
+            for case, filters, sort, cursor, _ in CASES:
+                fields = repository.resolve_fields(None, include_heavy=False)
+                query = repository._page_query(
+                    repository._load_only(select(ProductTable), fields, sort),
+                    limit=100,
+                    cursor=encode_cursor(cursor) if cursor is not None else None,
+                    skip=0,
+                    sort=sort,
+                    where=repository.filter_conditions(filters),
+                )
+                sql = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+                result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+                plans[case] = _plan_indexes(result.scalar()[0]["Plan"])
+            await conn.rollback()
+            return plans
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def plans() -> dict[str, set[str]]:
+    try:
+        return asyncio.run(_explain_cases())
+    except OSError as e:
+        pytest.skip(f"Postgres is not reachable: {e}")
+
+
+@pytest.mark.parametrize("case, expected", [(case[0], case[-1]) for case in CASES])
+def test_page_uses_index(plans: dict[str, set[str]], case: str, expected: str):
+    assert expected in plans[case], f"{case}: plan uses {plans[case] or 'no index'}"
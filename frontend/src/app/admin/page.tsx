@@ -216,17 +216,25 @@ export default function AdminPage() {
     }
   }, [searchQuery, users])
 
-  // Filter products based on search query
+  // Search products on the server, debounced while typing
   useEffect(() => {
-    if (productSearchQuery) {
-      const filtered = products.filter(
-        (p) =>
-          p.name.toLowerCase().includes(productSearchQuery.toLowerCase()) ||
-          p.description.toLowerCase().includes(productSearchQuery.toLowerCase()),
-      )
-      setFilteredProducts(filtered)
-    } else {
+    const query = productSearchQuery.trim()
+    if (!query) {
       setFilteredProducts(products)
+      return
+    }
+    let cancelled = false
+    const timeout = setTimeout(async () => {
+      try {
+        const results = await ProductService.searchProducts(query)
+        if (!cancelled) setFilteredProducts(results)
+      } catch {
+        if (!cancelled) toast.error("Failed to search products")
+      }
+    }, 300)
+    return () => {
+      cancelled = true
+      clearTimeout(timeout)
     }
   }, [productSearchQuery, products])
 
@@ -77,8 +77,8 @@ export default function DashboardPage() {
     const fetchFeaturedProducts = async () => {
       try {
         setLoadingFeatured(true)
-        const result = await ProductService.getProductsOfTheDay()
-        setFeaturedProducts(result.products.slice(0, 3)) // Show only top 3 featured products
+        const result = await ProductService.getProductsOfTheDay(3) // Show only top 3 featured products
+        setFeaturedProducts(result.products)
         setTotalFeaturedProducts(result.count) // Store the total count
         setLoadingFeatured(false)
       } catch (error) {
@@ -45,13 +45,26 @@ export interface ProductsResponse {
 
 export interface ProductsOfTheDayResponse {
   count: number
+  next_cursor: string | null
   products: Product[]
 }
 
+// Product list routes leave image_url out unless it is requested in `fields`
+export const PRODUCT_FIELDS = [
+  "id",
+  "name",
+  "description",
+  "quantity",
+  "price",
+  "is_active",
+  "image_url",
+  "created_at",
+]
+
 const ProductService = {
-  async getProducts(skip = 0, limit = 100): Promise<Product[]> {
+  async getProducts(skip = 0, limit = 100, fields: string[] = PRODUCT_FIELDS): Promise<Product[]> {
     try {
-      const response = await axiosInstance.get(`/products/?skip=${skip}&limit=${limit}`)
+      const response = await axiosInstance.get(`/products/?skip=${skip}&limit=${limit}&fields=${fields.join(",")}`)
       return response.data
     } catch (error) {
       console.error("Error fetching products:", error)
@@ -98,10 +111,14 @@ const ProductService = {
     }
   },
 
-  async getProductsWithPagination(page = 1, limit = 10): Promise<{ data: Product[]; total: number }> {
+  async getProductsWithPagination(
+    page = 1,
+    limit = 10,
+    fields: string[] = PRODUCT_FIELDS,
+  ): Promise<{ data: Product[]; total: number }> {
     const skip = (page - 1) * limit
     try {
-      const response = await axiosInstance.get(`/products/?skip=${skip}&limit=${limit}`)
+      const response = await axiosInstance.get(`/products/?skip=${skip}&limit=${limit}&fields=${fields.join(",")}`)
       return {
         data: response.data,
         total: Number.parseInt(response.headers["x-total-count"] || "0", 10) || response.data.length * 2, // Fallback if header not available
@@ -112,6 +129,18 @@ const ProductService = {
     }
   },
 
+  async searchProducts(q: string, limit = 50, fields: string[] = PRODUCT_FIELDS): Promise<Product[]> {
+    try {
+      const response = await axiosInstance.get("/products/search", {
+        params: { q, limit, fields: fields.join(",") },
+      })
+      return response.data
+    } catch (error) {
+      console.error("Error searching products:", error)
+      throw error
+    }
+  },
+
   async getRecommendedPrice(productId: number): Promise<number> {
     try {
       const response = await axiosInstance.get(`/products/ml/recommend_price/${productId}`)
@@ -122,9 +151,11 @@ const ProductService = {
     }
   },
 
-  async getProductsOfTheDay(): Promise<ProductsOfTheDayResponse> {
+  async getProductsOfTheDay(k?: number, cursor?: string): Promise<ProductsOfTheDayResponse> {
     try {
-      const response = await axiosInstance.get("/products/ml/products_of_the_day")
+      const response = await axiosInstance.get("/products/ml/products_of_the_day", {
+        params: { k, cursor },
+      })
       return response.data
     } catch (error) {
       console.error("Error fetching products of the day:", error)